@@ -0,0 +1,126 @@
+import math
+import time
+import threading
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot be admitted; retry_after is in seconds"""
+
+    def __init__(self, message, retry_after=1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Allows rate calls per second on average, with bursts of up to capacity"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, self.rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, cost=1):
+        """Take cost tokens and return 0, or return the seconds until they are available"""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= cost:
+                self._tokens -= cost
+                return 0.0
+            return (cost - self._tokens) / self.rate
+
+    def acquire(self, stop=None):
+        """Block until a token is taken; returns False if stop is set first"""
+        while True:
+            wait = self.reserve()
+            if wait <= 0:
+                return True
+            if stop is None:
+                time.sleep(wait)
+            elif stop.wait(wait):
+                return False
+
+    def pause(self, seconds):
+        """Hold every caller for seconds, e.g. after the platform answered 429"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+            self._updated = self._paused_until
+
+    def idle(self):
+        """Whether the bucket has refilled completely, i.e. forgetting it changes nothing"""
+        with self._lock:
+            return self._tokens + (time.monotonic() - self._updated) * self.rate >= self.capacity
+
+
+class RateLimiter:
+    """A TokenBucket per key (user, route), created on first use.
+
+    Once more than max_keys buckets exist, full ones are dropped: a new
+    bucket starts full, so forgetting them loses nothing.
+    """
+
+    def __init__(self, rate, capacity=None, max_keys=10000):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def check(self, key, cost=1):
+        """Take cost tokens for key; returns 0 when admitted, else whole seconds to wait"""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    self._buckets = {k: b for k, b in self._buckets.items() if not b.idle()}
+                bucket = self._buckets[key] = TokenBucket(self.rate, self.capacity)
+        wait = bucket.reserve(cost)
+        return math.ceil(wait) if wait > 0 else 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._buckets)
+
+
+class ConcurrencyLimiter:
+    """Caps calls in flight at limit (0 disables the cap)"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_flight = 0
+        self._semaphore = threading.BoundedSemaphore(limit) if limit > 0 else None
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=None):
+        """Take a slot, waiting at most timeout seconds (None waits indefinitely); False if none freed up"""
+        if self._semaphore is not None and not self._semaphore.acquire(timeout=timeout):
+            return False
+        with self._lock:
+            self.in_flight += 1
+        return True
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+
+def parse_route_rates(spec):
+    """Parse "POST /api/influencers/bulk=2, GET /api/influencers/export=1" into {route: rate}"""
+    rates = {}
+    for part in spec.split(','):
+        if not part.strip():
+            continue
+        route, _, rate = part.rpartition('=')
+        if not route.strip():
+            raise ValueError(f"Invalid route rate: {part.strip()}")
+        rates[' '.join(route.split())] = float(rate)
+    return rates
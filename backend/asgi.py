@@ -0,0 +1,15 @@
+# ASGI entry point for servers such as uvicorn or hypercorn:
+#   uvicorn asgi:app --workers 1 --limit-concurrency 200 --no-access-log
+#
+# One worker because /api/realtime only sees writes served by its own
+# process, and no access log because that stream takes a token as
+# ?access_token= (gunicorn.conf.py redacts it instead).
+#
+# The Flask app stays synchronous; requests run on the ASGI server's thread
+# pool and independent upstream calls inside a request still fan out
+# through main.upstream_pool.
+from asgiref.wsgi import WsgiToAsgi
+
+from main import app as flask_app
+
+app = WsgiToAsgi(flask_app)
@@ -0,0 +1,436 @@
+"""Offline load test for the Flask API against local Supabase stand-ins.
+
+Seeds a SQLite-backed PostgREST stand-in and an in-memory auth stand-in,
+then drives every route in main.py endpoint by endpoint at a fixed
+concurrency. Reports p50/p95/p99 latency, throughput and upstream calls
+per request, and compares the run with a saved baseline.
+
+Run from backend/:
+
+    python -m bench.run --influencers 100000 --latency-ms 20 --concurrency 16
+    python -m bench.run --save-baseline
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import random
+import shutil
+import logging
+import tempfile
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_SECRET = 'bench-jwt-secret-' + 'x' * 32
+# Syntactically valid stand-in keys; nothing is sent to Supabase
+BENCH_KEY = 'bench.stand-in.key'
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--influencers', type=int, default=10000)
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--vas', type=int, default=300)
+    parser.add_argument('--db', default=':memory:', help="SQLite path for the seeded data")
+    parser.add_argument('--requests', type=int, default=100, help="Requests per endpoint")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency-ms', type=float, default=5.0, help="Simulated upstream round trip")
+    parser.add_argument('--jitter-ms', type=float, default=1.0)
+    parser.add_argument('--remote-auth', action='store_true',
+                        help="Verify tokens through the auth stand-in instead of locally")
+    parser.add_argument('--only', default='', help="Comma-separated substrings of scenario names to run")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help="Allowed relative p50 increase before a regression is reported")
+    parser.add_argument('--min-delta-ms', type=float, default=15.0,
+                        help="p50 increases smaller than this are never reported")
+    parser.add_argument('--output', help="Also write the results as JSON to this path")
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args(argv)
+
+
+def prepare_static_build():
+    """Copy the frontend build (../dist) to a temporary directory and precompress it as a deploy would"""
+    from staticfiles import precompress
+    build = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'dist')
+    if not os.path.isdir(build):
+        return None
+    target = tempfile.mkdtemp(prefix='bench-static-')
+    atexit.register(shutil.rmtree, target, True)
+    shutil.copytree(build, target, dirs_exist_ok=True)
+    precompress(target)
+    return target
+
+
+def hashed_asset_path(ctx, user):
+    """A content-hashed bundle from the static manifest, or / without a build"""
+    from main import static_manifest
+    paths = sorted(path for path, asset in static_manifest.assets.items() if asset.immutable)
+    return '/' + ctx.rng.choice(paths) if paths else '/'
+
+
+def load_app(args):
+    """Import main.py against the stand-ins instead of the hosted project"""
+    os.environ.setdefault('SUPABASE_URL', 'http://127.0.0.1:54321')
+    os.environ.setdefault('SUPABASE_ANON_KEY', BENCH_KEY)
+    os.environ.setdefault('SUPABASE_SERVICE_ROLE_KEY', BENCH_KEY)
+    os.environ['SUPABASE_JWT_SECRET'] = '' if args.remote_auth else BENCH_SECRET
+    os.environ['SUPABASE_JWKS_URL'] = ''
+    os.environ['DATA_BACKEND'] = 'sqlite'
+    os.environ['SQLITE_PATH'] = ':memory:'
+    # The search index and leaderboards are built once after seeding rather than by a background thread
+    os.environ['SEARCH_INDEX_ENABLED'] = 'false'
+    os.environ['LEADERBOARD_ENABLED'] = 'false'
+    os.environ['SEARCH_INDEX_REFRESH_SECONDS'] = '0'
+    # Keep admission control in the request path but never refuse the load generator
+    os.environ['ADMISSION_USER_RATE'] = '1000000'
+    os.environ['ADMISSION_USER_BURST'] = '1000000'
+    os.environ['ADMISSION_ROUTE_RATES'] = ''
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    static_dir = prepare_static_build()
+    if static_dir:
+        os.environ['STATIC_DIR'] = static_dir
+    import main
+    from bench.standin import Latency, CallCounter, LatencyDataStore, FakeAuth, FakeSupabaseClient
+    from metrics import InstrumentedClient
+
+    logging.getLogger().setLevel(logging.WARNING)
+    main.logger.setLevel(logging.WARNING)
+
+    calls = CallCounter()
+    latency = Latency(args.latency_ms, args.jitter_ms, seed=args.seed)
+    store = LatencyDataStore(args.db, latency=latency, calls=calls)
+    auth = FakeAuth(BENCH_SECRET, latency=latency, calls=calls)
+    # Keep main.py's call instrumentation in the measured path
+    main.db = main.public_db = InstrumentedClient(store, main.record_upstream_call)
+    main.supabase_anon = main.supabase_service = FakeSupabaseClient(auth)
+    return main, store, auth, calls
+
+
+class Context:
+    """Seeded dataset plus thread-safe pools of IDs consumed by write scenarios"""
+
+    def __init__(self, dataset, auth, seed):
+        self.dataset = dataset
+        self.auth = auth
+        self.tokens = {user.id: auth.issue_token(user) for user in dataset.admins + dataset.vas}
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.counter = 0
+        self.seed = seed
+        self.assigned = {(user_id, client_id) for user_id, ids in dataset.va_clients.items() for client_id in ids}
+
+    def begin(self, scenario_name, index):
+        """Seed this thread's choices from the request itself, so reruns issue the same requests"""
+        self.local.rng = random.Random(f'{self.seed}:{scenario_name}:{index}')
+
+    @property
+    def rng(self):
+        return self.local.rng
+
+    def next_number(self):
+        with self.lock:
+            self.counter += 1
+            return self.counter
+
+    def admin(self):
+        return self.rng.choice(self.dataset.admins)
+
+    def va(self):
+        return self.rng.choice(self.dataset.vas)
+
+    def owner_of(self, count):
+        """A VA that still has at least count unsubmitted influencers in the pool"""
+        for _ in range(100):
+            user = self.va()
+            if len(self.dataset.va_influencers[user.id]) >= count:
+                return user
+        raise RuntimeError("Influencer pool exhausted; seed more influencers or run fewer requests")
+
+    def new_assignment(self):
+        """A (VA, client ID) pair that is not assigned yet"""
+        while True:
+            user = self.va()
+            client_id = self.rng.choice(self.dataset.client_ids)
+            with self.lock:
+                if (user.id, client_id) not in self.assigned:
+                    self.assigned.add((user.id, client_id))
+                    return user, client_id
+
+    def headers(self, user):
+        return {"Authorization": f"Bearer {self.tokens[user.id]}"}
+
+    def take_influencers(self, user, count):
+        """Remove and return unsubmitted influencer IDs owned by a VA"""
+        with self.lock:
+            pool = self.dataset.va_influencers[user.id]
+            taken = pool[-count:]
+            del pool[-count:]
+        return taken
+
+    def influencer_row(self, user, index=0):
+        number = self.next_number()
+        return {
+            "client_id": self.rng.choice(self.dataset.va_clients[user.id]),
+            "name": f"Bench Influencer {number}",
+            "business_email": f"bench{number}.{index}@mail.test",
+            "instagram_followers": self.rng.randrange(1000, 500000),
+            "tiktok_followers": self.rng.randrange(1000, 500000),
+            "engagement_rate": round(self.rng.uniform(0.5, 10), 2),
+            "instagram_url": f"https://instagram.com/bench{number}_{index}"
+        }
+
+
+def scenario(name, method, path, user='va', body=None, stream=False):
+    return {"name": name, "method": method, "path": path, "user": user, "body": body, "stream": stream}
+
+
+def build_scenarios():
+    """Every route in main.py; reads first so writes do not skew their caches"""
+    va_client = lambda ctx, user: ctx.rng.choice(ctx.dataset.va_clients[user.id])
+    return [
+        scenario('GET /api/test', 'GET', lambda ctx, user: '/api/test', user=None),
+        scenario('GET /api/auth/user', 'GET', lambda ctx, user: '/api/auth/user'),
+        scenario('GET /api/clients', 'GET', lambda ctx, user: '/api/clients'),
+        scenario('GET /api/users', 'GET', lambda ctx, user: '/api/users', user='admin'),
+        scenario('GET /api/users/<id>/clients', 'GET', lambda ctx, user: f'/api/users/{user.id}/clients'),
+        scenario('GET /api/influencers (va, all)', 'GET', lambda ctx, user: '/api/influencers'),
+        scenario('GET /api/influencers (admin, page)', 'GET',
+                 lambda ctx, user: '/api/influencers?limit=100', user='admin'),
+        scenario('GET /api/influencers (filtered page)', 'GET',
+                 lambda ctx, user: f'/api/influencers?limit=50&client_id={va_client(ctx, user)}'
+                                   f'&min_instagram_followers={ctx.rng.choice([1000, 10000, 50000])}'),
+        scenario('GET /api/influencers/export (csv)', 'GET',
+                 lambda ctx, user: f'/api/influencers/export?format=csv&client_id={va_client(ctx, user)}',
+                 stream=True),
+        scenario('GET /api/influencers/search', 'GET',
+                 lambda ctx, user: f"/api/influencers/search?q={ctx.rng.choice(['ava', 'kim', 'zoe.fitness', 'luna garcia'])}"),
+        scenario('GET /api/influencers/<id>/metrics', 'GET',
+                 lambda ctx, user: f'/api/influencers/{ctx.local.snapshot[1]}/metrics',
+                 user=lambda ctx: (setattr(ctx.local, 'snapshot', ctx.rng.choice(ctx.dataset.snapshot_influencers)),
+                                   ctx.local.snapshot[0])[1]),
+        scenario('GET /api/clients/<id>/top', 'GET',
+                 lambda ctx, user: f"/api/clients/{va_client(ctx, user)}/top"
+                                   f"?metric={ctx.rng.choice(['followers', 'views', 'engagement'])}&k=10"),
+        scenario('GET /api/submissions', 'GET', lambda ctx, user: '/api/submissions'),
+        scenario('GET /api/submissions (items)', 'GET', lambda ctx, user: '/api/submissions?include=items'),
+        scenario('GET /api/submissions/<id>', 'GET',
+                 lambda ctx, user: f'/api/submissions/{ctx.rng.choice(ctx.dataset.submission_ids)}', user='admin'),
+        scenario('GET /api/submissions/export', 'GET', lambda ctx, user: '/api/submissions/export', stream=True),
+        scenario('GET /api/stats', 'GET', lambda ctx, user: '/api/stats'),
+        scenario('GET /api/stats (admin)', 'GET', lambda ctx, user: '/api/stats', user='admin'),
+        scenario('GET /api/stats/overview', 'GET', lambda ctx, user: '/api/stats/overview'),
+        scenario('GET /api/stats/clients', 'GET', lambda ctx, user: '/api/stats/clients'),
+        scenario('GET /api/stats/timeseries', 'GET', lambda ctx, user: '/api/stats/timeseries?days=30'),
+        scenario('GET /api/stats/distribution', 'GET', lambda ctx, user: '/api/stats/distribution'),
+        scenario('POST /api/batch (bootstrap)', 'POST', lambda ctx, user: '/api/batch', user='admin',
+                 body=lambda ctx, user: {"requests": [
+                     {"id": "users", "path": "/api/users"},
+                     {"id": "clients", "path": "/api/clients"},
+                     {"id": "influencers", "path": "/api/influencers?limit=100"},
+                     {"id": "submissions", "path": "/api/submissions"}
+                 ]}),
+        scenario('GET /api/realtime (connect)', 'GET', lambda ctx, user: '/api/realtime', stream=True),
+        scenario('GET / (static)', 'GET', lambda ctx, user: '/', user=None),
+        scenario('GET /assets/<hashed> (static)', 'GET', hashed_asset_path, user=None),
+        scenario('POST /api/auth/signin', 'POST', lambda ctx, user: '/api/auth/signin',
+                 body=lambda ctx, user: {"email": user.email, "password": 'bench-password'}),
+        scenario('POST /api/auth/signup', 'POST', lambda ctx, user: '/api/auth/signup', user=None,
+                 body=lambda ctx, user: {"email": f"new{ctx.next_number()}@bench.local",
+                                         "password": 'bench-password', "full_name": 'New VA'}),
+        scenario('POST /api/auth/signout', 'POST', lambda ctx, user: '/api/auth/signout'),
+        scenario('POST /api/clients', 'POST', lambda ctx, user: '/api/clients', user='admin',
+                 body=lambda ctx, user: {"name": f"Bench Client {ctx.next_number()}"}),
+        scenario('POST /api/users/<id>/clients', 'POST',
+                 lambda ctx, user: f'/api/users/{ctx.local.assignment[0].id}/clients',
+                 user=lambda ctx: (setattr(ctx.local, 'assignment', ctx.new_assignment()), ctx.admin())[1],
+                 body=lambda ctx, user: {"client_id": ctx.local.assignment[1]}),
+        scenario('POST /api/influencers', 'POST', lambda ctx, user: '/api/influencers',
+                 body=lambda ctx, user: ctx.influencer_row(user)),
+        scenario('POST /api/influencers/bulk (100)', 'POST', lambda ctx, user: '/api/influencers/bulk',
+                 body=lambda ctx, user: [ctx.influencer_row(user, index) for index in range(100)]),
+        scenario('PUT /api/influencers/<id>', 'PUT',
+                 lambda ctx, user: f'/api/influencers/{ctx.rng.choice(ctx.dataset.va_influencers[user.id])}',
+                 user=lambda ctx: ctx.owner_of(1),
+                 body=lambda ctx, user: {"notes": f"bench note {ctx.next_number()}"}),
+        scenario('PATCH /api/influencers (20)', 'PATCH', lambda ctx, user: '/api/influencers',
+                 user=lambda ctx: ctx.owner_of(20),
+                 body=lambda ctx, user: {"ids": ctx.rng.sample(ctx.dataset.va_influencers[user.id], 20),
+                                         "changes": {"notes": f"bench note {ctx.next_number()}"}}),
+        scenario('POST /api/submissions (3)', 'POST', lambda ctx, user: '/api/submissions',
+                 user=lambda ctx: ctx.owner_of(3),
+                 body=lambda ctx, user: {"influencer_ids": ctx.take_influencers(user, 3), "notes": 'bench'}),
+        scenario('DELETE /api/influencers/<id>', 'DELETE',
+                 lambda ctx, user: f'/api/influencers/{ctx.take_influencers(user, 1)[0]}',
+                 user=lambda ctx: ctx.owner_of(1)),
+        scenario('DELETE /api/influencers (10)', 'DELETE', lambda ctx, user: '/api/influencers',
+                 user=lambda ctx: ctx.owner_of(10),
+                 body=lambda ctx, user: {"ids": ctx.take_influencers(user, 10)}),
+    ]
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def run_scenario(app, ctx, calls, spec, requests, concurrency):
+    """Drive one endpoint and summarise latency, throughput and upstream calls"""
+    clients = threading.local()
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def one_request(index):
+        if not hasattr(clients, 'client'):
+            clients.client = app.test_client()
+        ctx.begin(spec['name'], index)
+        if spec['user'] == 'admin':
+            user = ctx.admin()
+        elif spec['user'] == 'va':
+            user = ctx.va()
+        elif callable(spec['user']):
+            user = spec['user'](ctx)
+        else:
+            user = None
+        path = spec['path'](ctx, user)
+        body = spec['body'](ctx, user) if spec['body'] else None
+        headers = ctx.headers(user) if user is not None else {}
+
+        started = time.perf_counter()
+        response = clients.client.open(path, method=spec['method'], json=body, headers=headers, buffered=False)
+        if spec['stream'] and response.mimetype == 'text/event-stream':
+            # Long-lived stream: time to the first event, then disconnect
+            next(iter(response.response), None)
+        else:
+            response.get_data()
+        response.close()
+        elapsed = (time.perf_counter() - started) * 1000
+
+        with lock:
+            latencies.append(elapsed)
+            if response.status_code >= 400 and not (path == '/' and response.status_code == 404):
+                errors.append(response.status_code)
+
+    before = calls.snapshot()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one_request, range(requests)))
+    wall = time.perf_counter() - started
+    after = calls.snapshot()
+
+    upstream = after - before
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": len(errors),
+        "error_statuses": sorted(set(errors)),
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "throughput_rps": round(requests / wall, 1) if wall else 0.0,
+        "upstream_calls_per_request": round(sum(upstream.values()) / requests, 2),
+        "upstream_breakdown": {kind: round(count / requests, 2) for kind, count in upstream.most_common()}
+    }
+
+
+def compare(results, baseline, tolerance, min_delta_ms):
+    """Return human-readable regressions of results against a baseline"""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get('results', {}).get(name)
+        if previous is None:
+            continue
+        # Concurrent cache misses make call counts vary slightly between runs
+        if result['upstream_calls_per_request'] > previous['upstream_calls_per_request'] * 1.1 + 0.1:
+            regressions.append(
+                f"{name}: upstream calls/request {previous['upstream_calls_per_request']} -> "
+                f"{result['upstream_calls_per_request']}"
+            )
+        # Tail percentiles of a short run are too noisy to gate on. p50 must
+        # be worse both relatively and by at least min_delta_ms
+        allowed = max(previous['p50_ms'] * (1 + tolerance), previous['p50_ms'] + min_delta_ms)
+        if result['p50_ms'] > allowed:
+            regressions.append(f"{name}: p50 {previous['p50_ms']}ms -> {result['p50_ms']}ms")
+        if result['errors'] > previous['errors']:
+            regressions.append(f"{name}: errors {previous['errors']} -> {result['errors']}")
+    return regressions
+
+
+def print_table(results):
+    header = f"{'endpoint':<40} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>8} {'calls':>6} {'err':>4}"
+    print(header)
+    print('-' * len(header))
+    for name, result in results.items():
+        print(
+            f"{name:<40} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+            f"{result['throughput_rps']:>8.1f} {result['upstream_calls_per_request']:>6.2f} {result['errors']:>4}"
+        )
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    app_module, store, auth, calls = load_app(args)
+    from bench.seed import seed_dataset
+
+    started = time.perf_counter()
+    dataset = seed_dataset(
+        store, auth, influencers=args.influencers, clients=args.clients, vas=args.vas, seed=args.seed
+    )
+    print(f"Seeded {args.influencers} influencers, {args.clients} clients, {args.vas} VAs "
+          f"in {time.perf_counter() - started:.1f}s")
+    started = time.perf_counter()
+    app_module.load_influencer_indexes()
+    print(f"Built search index and leaderboards in {time.perf_counter() - started:.1f}s")
+
+    ctx = Context(dataset, auth, args.seed)
+    filters = [part.strip().lower() for part in args.only.split(',') if part.strip()]
+    results = {}
+    for spec in build_scenarios():
+        if filters and not any(part in spec['name'].lower() for part in filters):
+            continue
+        results[spec['name']] = run_scenario(app_module.app, ctx, calls, spec, args.requests, args.concurrency)
+
+    print_table(results)
+
+    config = {
+        key: getattr(args, key)
+        for key in ('influencers', 'clients', 'vas', 'requests', 'concurrency', 'latency_ms', 'jitter_ms', 'remote_auth')
+    }
+    report = {"config": config, "results": results}
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as output:
+            json.dump(report, output, indent=2)
+            output.write('\n')
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline) as source:
+        baseline = json.load(source)
+    if baseline.get('config') != config:
+        print("Note: baseline was recorded with a different configuration; comparing anyway")
+    regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+    if regressions:
+        print("\nRegressions against baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("\nNo regressions against baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
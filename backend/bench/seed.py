@@ -0,0 +1,135 @@
+import random
+from datetime import date, datetime, timedelta
+
+FIRST_NAMES = ['Ava', 'Liam', 'Mia', 'Noah', 'Zoe', 'Ethan', 'Luna', 'Leo', 'Isla', 'Kai', 'Maya', 'Eli']
+LAST_NAMES = ['Smith', 'Garcia', 'Chen', 'Kim', 'Patel', 'Jones', 'Nguyen', 'Silva', 'Brown', 'Lopez']
+NICHES = ['fitness', 'beauty', 'travel', 'food', 'gaming', 'tech', 'fashion', 'parenting']
+
+BENCH_PASSWORD = 'bench-password'
+CHUNK_SIZE = 10000
+SUBMISSION_SIZE = 20
+# Unsubmitted influencer ids kept per VA for the write scenarios
+RESERVED_PER_VA = 2000
+# Submitted influencers given a daily metrics history, and how many days of it
+SNAPSHOT_INFLUENCERS = 200
+SNAPSHOT_DAYS = 90
+
+
+class Dataset:
+    """IDs and credentials of the seeded users, clients and influencers"""
+
+    def __init__(self):
+        self.admins = []
+        self.vas = []
+        self.client_ids = []
+        self.va_clients = {}
+        self.va_influencers = {}
+        self.submission_ids = []
+        # (owner, influencer ID) pairs with metric snapshots
+        self.snapshot_influencers = []
+
+
+def followers(rng):
+    """Log-normal follower counts, mostly micro-influencers with a long tail"""
+    return int(rng.lognormvariate(9.5, 1.4))
+
+
+def seed_dataset(store, auth, influencers=10000, clients=200, vas=300, admins=3,
+                 clients_per_va=3, submitted_ratio=0.3, seed=42):
+    """Fill an empty store with a realistic dataset and register its users with auth"""
+    rng = random.Random(seed)
+    dataset = Dataset()
+    today = datetime(2026, 10, 17)
+
+    for index in range(admins):
+        dataset.admins.append(auth.add_user(f'admin{index}@bench.local', BENCH_PASSWORD))
+    for index in range(vas):
+        dataset.vas.append(auth.add_user(f'va{index}@bench.local', BENCH_PASSWORD))
+
+    with store.connection() as connection:
+        connection.executemany(
+            'INSERT INTO profiles (user_id, full_name, role) VALUES (?, ?, ?)',
+            [(user.id, f'Admin {index}', 'admin') for index, user in enumerate(dataset.admins)] +
+            [(user.id, f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}', 'va') for user in dataset.vas]
+        )
+        connection.executemany(
+            'INSERT INTO clients (name, description) VALUES (?, ?)',
+            [(f'Client {index}', f'{rng.choice(NICHES).title()} brand') for index in range(clients)]
+        )
+        dataset.client_ids = [row[0] for row in connection.execute('SELECT id FROM clients ORDER BY id')]
+
+        assignments = []
+        for user in dataset.vas:
+            dataset.va_clients[user.id] = rng.sample(dataset.client_ids, min(clients_per_va, len(dataset.client_ids)))
+            dataset.va_influencers[user.id] = []
+            assignments.extend((user.id, client_id) for client_id in dataset.va_clients[user.id])
+        connection.executemany('INSERT INTO user_client_assignments (user_id, client_id) VALUES (?, ?)', assignments)
+
+        submitted = {user.id: [] for user in dataset.vas}
+        next_id = (connection.execute('SELECT COALESCE(MAX(id), 0) FROM influencers').fetchone()[0]) + 1
+        for start in range(0, influencers, CHUNK_SIZE):
+            rows = []
+            for offset in range(min(CHUNK_SIZE, influencers - start)):
+                user = rng.choice(dataset.vas)
+                handle = f'{rng.choice(FIRST_NAMES).lower()}.{rng.choice(NICHES)}{start + offset}'
+                added = today - timedelta(days=rng.randrange(365), seconds=rng.randrange(86400))
+                is_submitted = rng.random() < submitted_ratio
+                influencer_id = next_id + start + offset
+                if is_submitted:
+                    submitted[user.id].append(influencer_id)
+                elif len(dataset.va_influencers[user.id]) < RESERVED_PER_VA:
+                    dataset.va_influencers[user.id].append(influencer_id)
+                rows.append((
+                    influencer_id, rng.choice(dataset.va_clients[user.id]), user.id,
+                    f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}', f'{handle}@mail.test',
+                    followers(rng), followers(rng), int(rng.lognormvariate(8, 1.2)),
+                    round(rng.uniform(0.2, 14.0), 2),
+                    f'https://instagram.com/{handle}', f'https://tiktok.com/@{handle}', '',
+                    is_submitted, added.date().isoformat(), added.isoformat(sep=' ')
+                ))
+            connection.executemany(
+                'INSERT INTO influencers (id, client_id, added_by_user_id, name, business_email, '
+                'instagram_followers, tiktok_followers, average_views, engagement_rate, instagram_url, '
+                'tiktok_url, notes, submitted, date_added, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+
+        for user_id, influencer_ids in submitted.items():
+            for start in range(0, len(influencer_ids), SUBMISSION_SIZE):
+                batch = influencer_ids[start:start + SUBMISSION_SIZE]
+                cursor = connection.execute(
+                    'INSERT INTO submissions (submitted_by_user_id, influencer_count, notes) VALUES (?, ?, ?)',
+                    (user_id, len(batch), '')
+                )
+                dataset.submission_ids.append(cursor.lastrowid)
+                connection.executemany(
+                    'INSERT INTO submission_items (submission_id, influencer_id) VALUES (?, ?)',
+                    [(cursor.lastrowid, influencer_id) for influencer_id in batch]
+                )
+                connection.executemany(
+                    'UPDATE influencers SET submission_id = ? WHERE id = ?',
+                    [(cursor.lastrowid, influencer_id) for influencer_id in batch]
+                )
+
+        # Submitted influencers are never deleted by the write scenarios. Snapshots
+        # end today rather than at the fixed seed date so ?days= windows cover them.
+        owners = [(user, influencer_id) for user in dataset.vas for influencer_id in submitted[user.id]]
+        dataset.snapshot_influencers = rng.sample(owners, min(SNAPSHOT_INFLUENCERS, len(owners)))
+        snapshots = []
+        for _, influencer_id in dataset.snapshot_influencers:
+            instagram, tiktok = followers(rng), followers(rng)
+            for day in range(SNAPSHOT_DAYS, 0, -1):
+                instagram += int(instagram * rng.uniform(-0.005, 0.02))
+                tiktok += int(tiktok * rng.uniform(-0.005, 0.02))
+                snapshots.append((
+                    influencer_id, (date.today() - timedelta(days=day - 1)).isoformat(), instagram, tiktok,
+                    int(rng.lognormvariate(8, 1.2)), round(rng.uniform(0.2, 14.0), 2)
+                ))
+        connection.executemany(
+            'INSERT INTO influencer_metric_snapshots (influencer_id, captured_on, instagram_followers, '
+            'tiktok_followers, average_views, engagement_rate) VALUES (?, ?, ?, ?, ?, ?)',
+            snapshots
+        )
+
+    return dataset
@@ -0,0 +1,106 @@
+"""Serialization micro-benchmark: encode time and wire size of large API responses.
+
+Builds the bodies of GET /api/influencers and GET /api/submissions from a
+seeded SQLite store and encodes them with each available encoder (stdlib
+json as used by Flask's default provider, orjson, MessagePack), then with
+gzip and brotli at the levels the API would use.
+
+Run from backend/:
+
+    python -m bench.serialization
+    python -m bench.serialization --influencers 100000 --sizes 1000,10000,100000
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import serialization
+from serialization import FastJSONProvider, compress
+from bench.seed import seed_dataset
+from bench.standin import LatencyDataStore, FakeAuth
+
+BENCH_SECRET = 'bench-jwt-secret-' + 'x' * 32
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--influencers', type=int, default=20000)
+    parser.add_argument('--sizes', default='100,1000,10000', help="Comma-separated row counts per body")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per measurement; the fastest is reported")
+    parser.add_argument('--level', type=int, default=int(os.getenv("COMPRESS_LEVEL", "4")),
+                        help="Compression level, as COMPRESS_LEVEL")
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args(argv)
+
+
+def fastest(repeat, function):
+    """Return (best milliseconds, result) over repeat runs"""
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def encoders(app):
+    """(name, encode) pairs producing the body bytes the API would send"""
+    stdlib = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+    available = [('json (stdlib)', lambda obj: (stdlib.dumps(obj, separators=(',', ':')) + '\n').encode('utf-8'))]
+    if serialization.orjson is not None:
+        available.append(('orjson', lambda obj: fast.encode(obj)[0]))
+    if serialization.msgpack is not None:
+        available.append(('msgpack', lambda obj: fast.encode(obj, 'msgpack')[0]))
+    return available
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+
+    store = LatencyDataStore()
+    started = time.perf_counter()
+    seed_dataset(store, FakeAuth(BENCH_SECRET), influencers=max(args.influencers, max(sizes)), seed=args.seed)
+    print(f"Seeded {max(args.influencers, max(sizes))} influencers in {time.perf_counter() - started:.1f}s")
+
+    bodies = []
+    for size in sizes:
+        influencers = store.table('influencers').select('*, clients(name)').order('id', desc=True).limit(size).execute().data
+        bodies.append((f'influencers x{size}', {"influencers": influencers}))
+        submissions = store.table('submissions').select('*, profiles(full_name)').limit(size).execute().data
+        if all(name != f'submissions x{len(submissions)}' for name, _ in bodies):
+            bodies.append((f'submissions x{len(submissions)}', {"submissions": submissions}))
+
+    app = Flask(__name__)
+    encodings = ['gzip'] + (['br'] if serialization.brotli is not None else [])
+    header = f"{'body':<22} {'encoder':<14} {'encode ms':>10} {'bytes':>10}"
+    for encoding in encodings:
+        header += f" {encoding + ' ms':>9} {encoding + ' bytes':>11}"
+    print(header)
+    print('-' * len(header))
+
+    for name, obj in bodies:
+        for encoder_name, encode in encoders(app):
+            encode_ms, body = fastest(args.repeat, lambda: encode(obj))
+            line = f"{name:<22} {encoder_name:<14} {encode_ms:>10.2f} {len(body):>10}"
+            for encoding in encodings:
+                compress_ms, compressed = fastest(args.repeat, lambda: compress(body, encoding, args.level))
+                line += f" {compress_ms:>9.2f} {len(compressed):>11}"
+            print(line)
+
+    missing = [module for module in ('orjson', 'msgpack', 'brotli') if getattr(serialization, module) is None]
+    if missing:
+        print(f"\nNot installed, skipped: {', '.join(missing)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
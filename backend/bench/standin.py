@@ -0,0 +1,164 @@
+import time
+import uuid
+import random
+import threading
+from collections import Counter
+
+import jwt
+
+from datastore import SqliteDataStore
+
+
+class Latency:
+    """Simulated network round trip added to every upstream call"""
+
+    def __init__(self, mean_ms=0.0, jitter_ms=0.0, seed=None):
+        self.mean_ms = mean_ms
+        self.jitter_ms = jitter_ms
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if self.mean_ms <= 0 and self.jitter_ms <= 0:
+            return
+        with self._lock:
+            delay = self._random.uniform(self.mean_ms - self.jitter_ms, self.mean_ms + self.jitter_ms)
+        time.sleep(max(delay, 0.0) / 1000)
+
+
+class CallCounter:
+    """Thread-safe tally of upstream calls by kind, e.g. 'influencers.select'"""
+
+    def __init__(self):
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, kind):
+        with self._lock:
+            self._counts[kind] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return Counter(self._counts)
+
+
+class LatencyDataStore(SqliteDataStore):
+    """SQLite-backed stand-in for PostgREST that counts calls and adds latency.
+
+    The delay is applied before the store's lock is taken, so concurrent
+    requests overlap their simulated round trips like they would over HTTP.
+    """
+
+    def __init__(self, path=':memory:', latency=None, calls=None):
+        super().__init__(path)
+        self.latency = latency or Latency()
+        self.calls = calls or CallCounter()
+
+    def execute_query(self, query):
+        # Statements a procedure runs happen inside the database, not over the network
+        if not getattr(self._local, 'in_procedure', False):
+            self.calls.record(f'{query.table}.{query.operation}')
+            self.latency.wait()
+        return super().execute_query(query)
+
+    def call_procedure(self, name, params):
+        self.calls.record(f'rpc.{name}')
+        self.latency.wait()
+        self._local.in_procedure = True
+        try:
+            return super().call_procedure(name, params)
+        finally:
+            self._local.in_procedure = False
+
+
+class AuthUser:
+    """User object shaped like gotrue's User"""
+
+    def __init__(self, user_id, email, user_metadata=None):
+        self.id = user_id
+        self.email = email
+        self.user_metadata = user_metadata or {}
+        self.app_metadata = {}
+
+
+class AuthSession:
+    def __init__(self, access_token, refresh_token):
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+
+
+class AuthResponse:
+    def __init__(self, user=None, session=None):
+        self.user = user
+        self.session = session
+
+
+class FakeAuth:
+    """In-memory stand-in for the Supabase auth API (sign up, sign in, get_user).
+
+    Tokens are HS256 JWTs signed with the given secret, so the API can verify
+    them locally when SUPABASE_JWT_SECRET matches, or call get_user() here.
+    """
+
+    def __init__(self, secret, latency=None, calls=None, token_ttl=3600):
+        self.secret = secret
+        self.latency = latency or Latency()
+        self.calls = calls or CallCounter()
+        self.token_ttl = token_ttl
+        self._users = {}
+        self._lock = threading.Lock()
+
+    def add_user(self, email, password, user_id=None, user_metadata=None):
+        user = AuthUser(user_id or str(uuid.uuid4()), email, user_metadata)
+        with self._lock:
+            self._users[email] = (password, user)
+        return user
+
+    def issue_token(self, user):
+        now = int(time.time())
+        claims = {
+            "sub": user.id,
+            "email": user.email,
+            "aud": "authenticated",
+            "role": "authenticated",
+            "iat": now,
+            "exp": now + self.token_ttl,
+            "user_metadata": user.user_metadata
+        }
+        return jwt.encode(claims, self.secret, algorithm='HS256')
+
+    def _call(self, kind):
+        self.calls.record(f'auth.{kind}')
+        self.latency.wait()
+
+    def sign_up(self, credentials):
+        self._call('sign_up')
+        metadata = credentials.get('options', {}).get('data', {})
+        with self._lock:
+            if credentials['email'] in self._users:
+                raise ValueError("User already registered")
+        user = self.add_user(credentials['email'], credentials['password'], user_metadata=metadata)
+        return AuthResponse(user, AuthSession(self.issue_token(user), uuid.uuid4().hex))
+
+    def sign_in_with_password(self, credentials):
+        self._call('sign_in')
+        with self._lock:
+            password, user = self._users.get(credentials['email'], (None, None))
+        if user is None or password != credentials['password']:
+            raise ValueError("Invalid login credentials")
+        return AuthResponse(user, AuthSession(self.issue_token(user), uuid.uuid4().hex))
+
+    def sign_out(self):
+        self._call('sign_out')
+
+    def get_user(self, token):
+        self._call('get_user')
+        claims = jwt.decode(token, self.secret, algorithms=['HS256'], audience='authenticated')
+        return AuthResponse(AuthUser(claims['sub'], claims.get('email'), claims.get('user_metadata')))
+
+
+class FakeSupabaseClient:
+    """Stands in for supabase.Client where only .auth is used"""
+
+    def __init__(self, auth):
+        self.auth = auth
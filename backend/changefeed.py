@@ -0,0 +1,145 @@
+import json
+import time
+import queue
+import threading
+
+
+class Subscriber:
+    """One connected stream and the scope of changes it may see"""
+
+    def __init__(self, user_id, is_admin, client_ids, max_pending):
+        self.user_id = user_id
+        self.is_admin = is_admin
+        self.client_ids = {str(client_id) for client_id in client_ids}
+        self.events = queue.Queue(maxsize=max_pending)
+        self.overflowed = False
+
+    def can_see(self, event):
+        if self.is_admin:
+            return True
+        if event.get('user_id') is not None and event['user_id'] == self.user_id:
+            return True
+        if event.get('client_id') is not None:
+            return str(event['client_id']) in self.client_ids
+        return event.get('public', False)
+
+
+class ChangeHub:
+    """Fans out row changes published by the write handlers to connected streams.
+
+    Events are filtered per subscriber and coalesced: changes arriving within
+    the debounce window are delivered as one batch with one entry per
+    (table, id), later updates merged into the earlier record.
+    """
+
+    def __init__(self, debounce=0.25, heartbeat=15.0, max_pending=1000, max_subscribers=0):
+        self.debounce = debounce
+        self.heartbeat = heartbeat
+        self.max_pending = max_pending
+        # Each open stream holds a server thread; 0 means no cap
+        self.max_subscribers = max_subscribers
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id, is_admin, client_ids):
+        """Register a stream; returns None when max_subscribers streams are already open"""
+        subscriber = Subscriber(user_id, is_admin, client_ids, self.max_pending)
+        with self._lock:
+            if self.max_subscribers and len(self._subscribers) >= self.max_subscribers:
+                return None
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, table, event_type, record, old_record=None, client_id=None, user_id=None, public=False):
+        """Queue a change for every subscriber allowed to see it.
+
+        client_id scopes the change to users assigned to that client, user_id
+        to its owner; public changes go to everyone. Admins see all changes.
+        """
+        event = {
+            "table": table,
+            "type": event_type,
+            "record": record,
+            "old_record": old_record,
+            "client_id": client_id,
+            "user_id": user_id,
+            "public": public
+        }
+        with self._lock:
+            subscribers = list(self._subscribers)
+
+        for subscriber in subscribers:
+            if subscriber.overflowed or not subscriber.can_see(event):
+                continue
+            try:
+                subscriber.events.put_nowait(event)
+            except queue.Full:
+                # The client fell too far behind; tell it to refetch instead
+                subscriber.overflowed = True
+
+    def next_batch(self, subscriber):
+        """Block until changes arrive, then collect the rest of the debounce window.
+
+        Returns a list of coalesced changes, None for a heartbeat, or the
+        string 'resync' if the subscriber overflowed.
+        """
+        try:
+            first = subscriber.events.get(timeout=self.heartbeat)
+        except queue.Empty:
+            return 'resync' if subscriber.overflowed else None
+
+        changes = {}
+        deadline = time.monotonic() + self.debounce
+        event = first
+        while True:
+            record = event['record'] or event['old_record'] or {}
+            key = (event['table'], record.get('id'))
+            change = {
+                "table": event['table'],
+                "type": event['type'],
+                "record": event['record'],
+                "old_record": event['old_record']
+            }
+            previous = changes.pop(key, None)
+            if previous and previous['record'] and change['type'] == 'UPDATE':
+                # Updates may carry only the changed columns; fold them into
+                # the earlier record and keep an INSERT an INSERT
+                change['type'] = previous['type']
+                change['record'] = {**previous['record'], **change['record']}
+                change['old_record'] = previous['old_record']
+            changes[key] = change
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                event = subscriber.events.get(timeout=remaining)
+            except queue.Empty:
+                break
+
+        if subscriber.overflowed:
+            return 'resync'
+        return list(changes.values())
+
+    def stream(self, subscriber):
+        """Yield Server-Sent Events for a subscriber until the client disconnects"""
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                batch = self.next_batch(subscriber)
+                if batch is None:
+                    yield ': keepalive\n\n'
+                elif batch == 'resync':
+                    yield 'event: resync\ndata: {}\n\n'
+                    return
+                else:
+                    yield f'event: changes\ndata: {json.dumps({"changes": batch}, default=str)}\n\n'
+        finally:
+            self.unsubscribe(subscriber)
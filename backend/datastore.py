@@ -0,0 +1,664 @@
+import os
+import re
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+from postgrest.exceptions import APIError
+
+# Embedded relations used in selects like '*, clients(name)':
+# (table, embedded table) -> (local column, column on the embedded table)
+RELATIONS = {
+    ('influencers', 'clients'): ('client_id', 'id'),
+    ('user_client_assignments', 'clients'): ('client_id', 'id'),
+    ('user_client_assignments', 'profiles'): ('user_id', 'user_id'),
+    ('submissions', 'profiles'): ('submitted_by_user_id', 'user_id'),
+    ('submission_items', 'influencers'): ('influencer_id', 'id'),
+    ('submission_items', 'submissions'): ('submission_id', 'id'),
+}
+
+IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+EMBED = re.compile(r'^(\w+)\((.*)\)$')
+
+SQLITE_SCHEMA_PATH = os.path.join(os.path.dirname(__file__), 'sql', 'sqlite_schema.sql')
+
+
+class QueryResult:
+    """Result of an executed query, shaped like postgrest-py's APIResponse"""
+
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+def quote(identifier):
+    if not IDENTIFIER.match(identifier):
+        raise ValueError(f"Invalid identifier: {identifier}")
+    return f'"{identifier}"'
+
+
+def split_columns(columns):
+    """Split a select string on commas that are not inside an embedded relation"""
+    parts, depth, current = [], 0, ''
+    for char in columns:
+        if char == ',' and depth == 0:
+            parts.append(current.strip())
+            current = ''
+            continue
+        depth += char == '('
+        depth -= char == ')'
+        current += char
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+class Query:
+    """Fluent query builder covering the subset of postgrest-py used by main.py"""
+
+    def __init__(self, store, table):
+        quote(table)
+        self.store = store
+        self.table = table
+        self.operation = 'select'
+        self.columns = '*'
+        self.count = None
+        self.head = False
+        self.payload = None
+        self.on_conflict = None
+        self.filters = []
+        self.orders = []
+        self.limit_count = None
+        self.offset_count = None
+
+    def select(self, *columns, count=None, head=None):
+        self.columns = ','.join(columns) or '*'
+        self.count = count
+        self.head = bool(head)
+        return self
+
+    def insert(self, json, **kwargs):
+        self.operation = 'insert'
+        self.payload = json if isinstance(json, list) else [json]
+        return self
+
+    def upsert(self, json, on_conflict='', **kwargs):
+        self.insert(json)
+        self.on_conflict = on_conflict or 'id'
+        return self
+
+    def update(self, json, **kwargs):
+        self.operation = 'update'
+        self.payload = json
+        return self
+
+    def delete(self, **kwargs):
+        self.operation = 'delete'
+        return self
+
+    def _filter(self, column, operator, value):
+        quote(column)
+        self.filters.append((column, operator, value))
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, '=', value)
+
+    def neq(self, column, value):
+        return self._filter(column, '<>', value)
+
+    def gt(self, column, value):
+        return self._filter(column, '>', value)
+
+    def gte(self, column, value):
+        return self._filter(column, '>=', value)
+
+    def lt(self, column, value):
+        return self._filter(column, '<', value)
+
+    def lte(self, column, value):
+        return self._filter(column, '<=', value)
+
+    def like(self, column, pattern):
+        return self._filter(column, 'like', pattern)
+
+    def ilike(self, column, pattern):
+        return self._filter(column, 'ilike', pattern)
+
+    def is_(self, column, value):
+        return self._filter(column, 'is', value)
+
+    def in_(self, column, values):
+        return self._filter(column, 'in', list(values))
+
+    def order(self, column, desc=False, **kwargs):
+        quote(column)
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, size, **kwargs):
+        self.limit_count = int(size)
+        return self
+
+    def range(self, start, end, **kwargs):
+        self.offset_count = int(start)
+        self.limit_count = int(end) - int(start) + 1
+        return self
+
+    def execute(self):
+        return self.store.execute_query(self)
+
+
+class Procedure:
+    """Deferred rpc() call, executed like a query"""
+
+    def __init__(self, store, name, params):
+        self.store = store
+        self.name = name
+        self.params = params or {}
+
+    def execute(self):
+        return QueryResult(self.store.call_procedure(self.name, self.params))
+
+
+class SqlDataStore:
+    """Base for SQL-backed stores; subclasses supply connections and dialect details"""
+
+    placeholder = '%s'
+    like_operator = {'like': 'LIKE', 'ilike': 'ILIKE'}
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def table(self, name):
+        return Query(self, name)
+
+    def rpc(self, name, params=None):
+        return Procedure(self, name, params)
+
+    # Connection handling
+
+    @contextmanager
+    def transaction(self):
+        """Run every query issued by this thread inside one transaction"""
+        if getattr(self._local, 'connection', None) is not None:
+            yield
+            return
+
+        with self.connection() as connection:
+            self._local.connection = connection
+            try:
+                yield
+            finally:
+                self._local.connection = None
+
+    def run(self, sql, params):
+        """Execute a statement and return its rows as dicts"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            return self.fetch(connection, sql, params)
+        with self.connection() as connection:
+            return self.fetch(connection, sql, params)
+
+    # SQL compilation
+
+    def embed(self, table, relation, columns):
+        raise NotImplementedError
+
+    def compile_columns(self, query):
+        compiled, embedded = [], []
+        for column in split_columns(query.columns):
+            match = EMBED.match(column)
+            if column == '*':
+                compiled.append(f'{quote(query.table)}.*')
+            elif match:
+                relation, sub_columns = match.group(1), match.group(2)
+                if (query.table, relation) not in RELATIONS:
+                    raise ValueError(f"No relation between {query.table} and {relation}")
+                compiled.append(f'{self.embed(query.table, relation, sub_columns)} AS {quote(relation)}')
+                embedded.append(relation)
+            else:
+                compiled.append(f'{quote(query.table)}.{quote(column)}')
+        return ', '.join(compiled), embedded
+
+    def compile_where(self, query):
+        clauses, params = [], []
+        for column, operator, value in query.filters:
+            target = f'{quote(query.table)}.{quote(column)}'
+            if operator == 'in':
+                if not value:
+                    clauses.append('1 = 0')
+                    continue
+                clauses.append(f"{target} IN ({', '.join([self.placeholder] * len(value))})")
+                params.extend(value)
+            elif operator == 'is':
+                if value in (None, 'null'):
+                    clauses.append(f'{target} IS NULL')
+                else:
+                    clauses.append(f'{target} = {self.placeholder}')
+                    params.append(value)
+            elif operator in self.like_operator:
+                clauses.append(f'{target} {self.like_operator[operator]} {self.placeholder}')
+                params.append(value)
+            else:
+                clauses.append(f'{target} {operator} {self.placeholder}')
+                params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        return where, params
+
+    def compile_select(self, query):
+        columns, embedded = self.compile_columns(query)
+        where, params = self.compile_where(query)
+        sql = f'SELECT {columns} FROM {quote(query.table)}{where}'
+        if query.orders:
+            order = ', '.join(
+                f'{quote(query.table)}.{quote(column)} {"DESC" if desc else "ASC"}'
+                for column, desc in query.orders
+            )
+            sql += f' ORDER BY {order}'
+        if query.limit_count is not None:
+            sql += f' LIMIT {query.limit_count}'
+        if query.offset_count:
+            sql += f' OFFSET {query.offset_count}'
+        return sql, params, embedded
+
+    def compile_insert(self, query, rows):
+        columns = list(rows[0].keys())
+        values = ', '.join(
+            '(' + ', '.join([self.placeholder] * len(columns)) + ')' for _ in rows
+        )
+        sql = f"INSERT INTO {quote(query.table)} ({', '.join(quote(column) for column in columns)}) VALUES {values}"
+        if query.on_conflict:
+            conflict = [column.strip() for column in query.on_conflict.split(',')]
+            updates = ', '.join(
+                f'{quote(column)} = excluded.{quote(column)}' for column in columns if column not in conflict
+            )
+            action = f'DO UPDATE SET {updates}' if updates else 'DO NOTHING'
+            sql += f" ON CONFLICT ({', '.join(quote(column) for column in conflict)}) {action}"
+        params = [self.adapt(row[column]) for row in rows for column in columns]
+        return sql + ' RETURNING *', params
+
+    def compile_update(self, query):
+        assignments = ', '.join(f'{quote(column)} = {self.placeholder}' for column in query.payload)
+        where, params = self.compile_where(query)
+        sql = f'UPDATE {quote(query.table)} SET {assignments}{where} RETURNING *'
+        return sql, [self.adapt(value) for value in query.payload.values()] + params
+
+    def compile_delete(self, query):
+        where, params = self.compile_where(query)
+        return f'DELETE FROM {quote(query.table)}{where} RETURNING *', params
+
+    def adapt(self, value):
+        return value
+
+    def normalize(self, table, row, embedded=()):
+        return row
+
+    def execute_query(self, query):
+        if query.operation == 'insert':
+            # Rows with different key sets are inserted as separate statements
+            groups = {}
+            for row in query.payload:
+                groups.setdefault(tuple(row.keys()), []).append(row)
+            data = []
+            with self.transaction():
+                for rows in groups.values():
+                    sql, params = self.compile_insert(query, rows)
+                    data.extend(self.run(sql, params))
+            return QueryResult([self.normalize(query.table, row) for row in data])
+
+        if query.operation == 'update':
+            sql, params = self.compile_update(query)
+            return QueryResult([self.normalize(query.table, row) for row in self.run(sql, params)])
+
+        if query.operation == 'delete':
+            sql, params = self.compile_delete(query)
+            return QueryResult([self.normalize(query.table, row) for row in self.run(sql, params)])
+
+        count = None
+        if query.count:
+            where, params = self.compile_where(query)
+            count_rows = self.run(f'SELECT COUNT(*) AS count FROM {quote(query.table)}{where}', params)
+            count = count_rows[0]['count']
+        if query.head:
+            return QueryResult([], count)
+
+        sql, params, embedded = self.compile_select(query)
+        rows = self.run(sql, params)
+        return QueryResult([self.normalize(query.table, row, embedded) for row in rows], count)
+
+    # Stored procedures
+
+    def call_procedure(self, name, params):
+        raise NotImplementedError
+
+
+class PostgresDataStore(SqlDataStore):
+    """Direct Postgres access through a bounded psycopg connection pool.
+
+    Statements are sent as server-side prepared statements unless prepare is
+    disabled, which is required behind transaction-mode poolers (pgbouncer,
+    Supavisor on port 6543).
+    """
+
+    def __init__(self, dsn, min_size=1, max_size=10, timeout=10.0, prepare=True):
+        super().__init__()
+        try:
+            from psycopg import Error
+            from psycopg.rows import dict_row
+            from psycopg.types.json import Jsonb
+            from psycopg_pool import ConnectionPool
+        except ImportError:
+            raise RuntimeError("The postgres data backend requires psycopg[binary] and psycopg-pool")
+
+        self.prepare = prepare
+        self.database_error = Error
+        self.jsonb = Jsonb
+        # Function name -> names of its json/jsonb arguments
+        self._json_arguments = {}
+        self.pool = ConnectionPool(
+            dsn,
+            min_size=min_size,
+            max_size=max_size,
+            timeout=timeout,
+            kwargs={"row_factory": dict_row},
+            open=True
+        )
+
+    @contextmanager
+    def connection(self):
+        # The pool commits on clean exit and rolls back on error
+        with self.pool.connection() as connection:
+            yield connection
+
+    def fetch(self, connection, sql, params):
+        try:
+            cursor = connection.execute(sql, params, prepare=self.prepare)
+            return cursor.fetchall() if cursor.description else []
+        except self.database_error as e:
+            # Raise what the supabase client raises for the same error, so
+            # callers handle both backends alike (e.g. P0001 from RAISE EXCEPTION)
+            raise APIError({
+                "code": e.sqlstate,
+                "message": e.diag.message_primary or str(e),
+                "details": e.diag.message_detail,
+                "hint": e.diag.message_hint
+            }) from e
+
+    def embed(self, table, relation, columns):
+        local_column, foreign_column = RELATIONS[(table, relation)]
+        if columns.strip() == '*':
+            value = 'row_to_json(e)'
+        else:
+            pairs = ', '.join(f"'{column.strip()}', e.{quote(column.strip())}" for column in columns.split(','))
+            value = f'json_build_object({pairs})'
+        return (
+            f'(SELECT {value} FROM {quote(relation)} e '
+            f'WHERE e.{quote(foreign_column)} = {quote(table)}.{quote(local_column)} LIMIT 1)'
+        )
+
+    def normalize(self, table, row, embedded=()):
+        # Match PostgREST's JSON output: ISO dates, plain numbers and string UUIDs
+        for key, value in row.items():
+            if isinstance(value, (datetime, date)):
+                row[key] = value.isoformat()
+            elif isinstance(value, Decimal):
+                row[key] = float(value)
+            elif isinstance(value, UUID):
+                row[key] = str(value)
+        return row
+
+    def json_arguments(self, name):
+        """Names of a public function's json/jsonb arguments, looked up once per function"""
+        arguments = self._json_arguments.get(name)
+        if arguments is None:
+            rows = self.run(
+                "SELECT p.parameter_name AS name FROM information_schema.parameters p "
+                "JOIN information_schema.routines r "
+                "ON r.specific_schema = p.specific_schema AND r.specific_name = p.specific_name "
+                "WHERE r.routine_schema = 'public' AND r.routine_name = %s "
+                "AND p.parameter_mode = 'IN' AND p.data_type IN ('json', 'jsonb')",
+                [name]
+            )
+            arguments = {row['name'] for row in rows}
+            # A function that does not exist yet is looked up again on the next call
+            if rows:
+                self._json_arguments[name] = arguments
+        return arguments
+
+    def call_procedure(self, name, params):
+        # PostgREST passes arguments as JSON. psycopg cannot adapt dicts and
+        # would send [] as an array literal, so json arguments are sent as Jsonb.
+        json_arguments = self.json_arguments(name)
+        values = [
+            self.jsonb(value) if key in json_arguments and value is not None else value
+            for key, value in params.items()
+        ]
+        arguments = ', '.join(f'{quote(key)} => %s' for key in params)
+        try:
+            rows = self.run(f'SELECT {quote(name)}({arguments}) AS result', values)
+        except APIError as e:
+            # undefined_function for the call itself; PostgREST reports it as PGRST202
+            if e.code != '42883' or f'{name}(' not in (e.message or ''):
+                raise
+            raise APIError({"code": "PGRST202", "message": f"Could not find the function public.{name}"}) from e
+        return rows[0]['result'] if rows else None
+
+    def close(self):
+        self.pool.close()
+
+
+class SqliteDataStore(SqlDataStore):
+    """SQLite store for tests, benchmarks and offline runs (':memory:' by default)"""
+
+    placeholder = '?'
+    like_operator = {'like': 'LIKE', 'ilike': 'LIKE'}
+
+    def __init__(self, path=':memory:'):
+        super().__init__()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute('PRAGMA foreign_keys = ON')
+        # A single shared connection, so one thread at a time
+        self._lock = threading.RLock()
+        with open(SQLITE_SCHEMA_PATH) as schema:
+            self._connection.executescript(schema.read())
+        self._columns = {}
+        self._booleans = {}
+        self.procedures = {
+            "create_submission": create_submission_procedure,
+            "claim_metric_refresh_jobs": claim_metric_refresh_jobs_procedure,
+            "apply_metric_refresh": apply_metric_refresh_procedure
+        }
+
+    @contextmanager
+    def connection(self):
+        with self._lock:
+            self._connection.execute('BEGIN')
+            try:
+                yield self._connection
+            except BaseException:
+                self._connection.execute('ROLLBACK')
+                raise
+            else:
+                self._connection.execute('COMMIT')
+
+    def run(self, sql, params):
+        if getattr(self._local, 'connection', None) is not None:
+            return self.fetch(self._local.connection, sql, params)
+        with self._lock:
+            return self.fetch(self._connection, sql, params)
+
+    def fetch(self, connection, sql, params):
+        try:
+            return [dict(row) for row in connection.execute(sql, params).fetchall()]
+        except sqlite3.IntegrityError as e:
+            # Report constraint violations with the SQLSTATE Postgres would use
+            code = '23505' if 'UNIQUE' in str(e) else '23000'
+            raise APIError({"code": code, "message": str(e)}) from e
+
+    def table_columns(self, table):
+        if table not in self._columns:
+            with self._lock:
+                info = self._connection.execute(f'PRAGMA table_info({quote(table)})').fetchall()
+            self._columns[table] = [row['name'] for row in info]
+            self._booleans[table] = {row['name'] for row in info if row['type'].upper() == 'BOOLEAN'}
+        return self._columns[table]
+
+    def embed(self, table, relation, columns):
+        local_column, foreign_column = RELATIONS[(table, relation)]
+        names = self.table_columns(relation) if columns.strip() == '*' else [c.strip() for c in columns.split(',')]
+        pairs = ', '.join(f"'{name}', e.{quote(name)}" for name in names)
+        return (
+            f'(SELECT json_object({pairs}) FROM {quote(relation)} e '
+            f'WHERE e.{quote(foreign_column)} = {quote(table)}.{quote(local_column)} LIMIT 1)'
+        )
+
+    def adapt(self, value):
+        return json.dumps(value) if isinstance(value, (dict, list)) else value
+
+    def normalize(self, table, row, embedded=()):
+        self.table_columns(table)
+        for column in self._booleans[table]:
+            if row.get(column) is not None:
+                row[column] = bool(row[column])
+        for relation in embedded:
+            if row.get(relation) is not None:
+                row[relation] = self.normalize(relation, json.loads(row[relation]))
+        return row
+
+    def call_procedure(self, name, params):
+        procedure = self.procedures.get(name)
+        if procedure is None:
+            raise APIError({"code": "PGRST202", "message": f"Could not find the function public.{name}"})
+        with self.transaction():
+            return procedure(self, params)
+
+
+def create_submission_procedure(store, params):
+    """Local equivalent of sql/create_submission.sql, run inside a transaction"""
+    user_id = params['p_user_id']
+    idempotency_key = params.get('p_idempotency_key')
+    client_ids = params.get('p_client_ids')
+    influencer_ids = sorted(set(params['p_influencer_ids']))
+
+    if idempotency_key is not None:
+        existing = store.table('submissions').select('*').eq('submitted_by_user_id', user_id).eq('idempotency_key', idempotency_key).execute().data
+        if existing:
+            if existing[0].get('idempotency_fingerprint') != params.get('p_fingerprint'):
+                raise APIError({"code": "P0001", "message": "idempotency_key_reused"})
+            return {"submission": existing[0], "influencers": [], "replayed": True}
+
+    query = store.table('influencers').select('id, client_id').in_('id', influencer_ids)
+    if client_ids is not None:
+        query = query.in_('client_id', client_ids).eq('added_by_user_id', user_id)
+    owned = query.execute().data
+    if len(owned) != len(influencer_ids):
+        raise APIError({"code": "P0001", "message": "influencer_access_denied"})
+
+    submission = store.table('submissions').insert({
+        "submitted_by_user_id": user_id,
+        "influencer_count": len(influencer_ids),
+        "notes": params.get('p_notes') or '',
+        "idempotency_key": idempotency_key,
+        "idempotency_fingerprint": params.get('p_fingerprint')
+    }).execute().data[0]
+    store.table('submission_items').insert([
+        {"submission_id": submission['id'], "influencer_id": influencer_id}
+        for influencer_id in influencer_ids
+    ]).execute()
+    store.table('influencers').update({"submitted": True}).in_('id', influencer_ids).execute()
+
+    return {
+        "submission": submission,
+        "influencers": owned,
+        "replayed": False
+    }
+
+
+def claim_metric_refresh_jobs_procedure(store, params):
+    """Local equivalent of claim_metric_refresh_jobs in sql/metrics_refresh.sql"""
+    limit = int(params.get('p_limit', 50))
+    lease = int(params.get('p_lease_seconds', 300))
+    due = store.run(
+        "SELECT influencer_id FROM metric_refresh_jobs WHERE run_after <= datetime('now') "
+        "AND (locked_until IS NULL OR locked_until <= datetime('now')) ORDER BY run_after LIMIT ?",
+        [limit]
+    )
+    ids = [row['influencer_id'] for row in due]
+    if not ids:
+        return []
+
+    marks = ', '.join('?' * len(ids))
+    store.run(
+        f"UPDATE metric_refresh_jobs SET attempts = attempts + 1, locked_until = datetime('now', ?) "
+        f"WHERE influencer_id IN ({marks})",
+        [f'+{lease} seconds', *ids]
+    )
+    return store.run(
+        f"SELECT j.influencer_id, j.attempts, i.instagram_url, i.tiktok_url FROM metric_refresh_jobs j "
+        f"JOIN influencers i ON i.id = j.influencer_id WHERE j.influencer_id IN ({marks}) ORDER BY j.influencer_id",
+        ids
+    )
+
+
+def apply_metric_refresh_procedure(store, params):
+    """Local equivalent of apply_metric_refresh in sql/metrics_refresh.sql, run inside a transaction"""
+    results = params.get('p_results') or []
+    failures = params.get('p_failures') or []
+    interval = f"+{int(params.get('p_interval_seconds', 86400))} seconds"
+
+    for result in results:
+        store.run(
+            'UPDATE influencers SET instagram_followers = COALESCE(?, instagram_followers), '
+            'tiktok_followers = COALESCE(?, tiktok_followers), average_views = COALESCE(?, average_views), '
+            'engagement_rate = COALESCE(?, engagement_rate) WHERE id = ?',
+            [result.get('instagram_followers'), result.get('tiktok_followers'), result.get('average_views'),
+             result.get('engagement_rate'), result['influencer_id']]
+        )
+
+    ids = [result['influencer_id'] for result in results]
+    if ids:
+        marks = ', '.join('?' * len(ids))
+        store.run(
+            'INSERT INTO influencer_metric_snapshots (influencer_id, captured_on, instagram_followers, '
+            "tiktok_followers, average_views, engagement_rate) SELECT id, date('now'), instagram_followers, "
+            f'tiktok_followers, average_views, engagement_rate FROM influencers WHERE id IN ({marks}) '
+            'ON CONFLICT (influencer_id, captured_on) DO UPDATE SET '
+            'instagram_followers = excluded.instagram_followers, tiktok_followers = excluded.tiktok_followers, '
+            'average_views = excluded.average_views, engagement_rate = excluded.engagement_rate',
+            ids
+        )
+        store.run(
+            "UPDATE metric_refresh_jobs SET run_after = datetime('now', ?), attempts = 0, locked_until = NULL, "
+            f'last_error = NULL WHERE influencer_id IN ({marks})',
+            [interval, *ids]
+        )
+
+    for failure in failures:
+        store.run(
+            "UPDATE metric_refresh_jobs SET run_after = datetime('now', ?), attempts = COALESCE(?, attempts), "
+            'locked_until = NULL, last_error = ? WHERE influencer_id = ?',
+            [f"+{int(failure['delay_seconds'])} seconds", failure.get('attempts'), failure.get('error'),
+             failure['influencer_id']]
+        )
+
+    return {"updated": len(ids), "failed": len(failures)}
+
+
+def create_data_store(backend, **options):
+    """Build a SQL data store by name: 'postgres' or 'sqlite'"""
+    if backend == 'postgres':
+        return PostgresDataStore(
+            options['dsn'],
+            min_size=options.get('min_size', 1),
+            max_size=options.get('max_size', 10),
+            timeout=options.get('timeout', 10.0),
+            prepare=options.get('prepare', True)
+        )
+    if backend == 'sqlite':
+        return SqliteDataStore(options.get('path', ':memory:'))
+    raise ValueError(f"Unknown data backend: {backend}")
@@ -0,0 +1,50 @@
+# Production server settings: gunicorn -c gunicorn.conf.py main:app
+#
+# Each worker is a separate process with its own caches; each worker thread
+# serves one request at a time, so WEB_CONCURRENCY x WORKER_THREADS requests
+# can wait on Supabase concurrently.
+#
+# /api/realtime streams only carry the writes served by their own process
+# (main.change_hub), so the default is one worker with many threads. With
+# WEB_CONCURRENCY above 1, an open dashboard misses changes made through the
+# other workers until it refetches.
+import os
+import re
+
+from gunicorn.glogging import Logger
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "gthread"
+threads = int(os.getenv("WORKER_THREADS", "32"))
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("WORKER_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("WORKER_KEEPALIVE", "5"))
+max_requests = int(os.getenv("WORKER_MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("WORKER_MAX_REQUESTS_JITTER", "1000"))
+accesslog = os.getenv("ACCESS_LOG", "-")
+
+# EventSource cannot send headers, so /api/realtime takes the JWT as ?access_token=
+QUERY_TOKEN = re.compile(r'((?:^|[?&])access_token=)[^&\s]*')
+
+
+class RedactingLogger(Logger):
+    """Access log that never writes a JWT passed in the query string"""
+
+    def atoms(self, resp, req, environ, request_time):
+        atoms = super().atoms(resp, req, environ, request_time)
+        for key in ('r', 'q', '{raw_uri}e', '{query_string}e', '{request_uri}e'):
+            if atoms.get(key):
+                atoms[key] = QUERY_TOKEN.sub(r'\1[redacted]', atoms[key])
+        return atoms
+
+
+logger_class = RedactingLogger
+
+
+def on_starting(server):
+    if server.cfg.workers > 1:
+        server.log.warning(
+            "Running %d workers: /api/realtime streams only see writes served by their own worker",
+            server.cfg.workers
+        )
@@ -0,0 +1,127 @@
+import bisect
+import threading
+
+
+def number(value):
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+# Rankable metrics: name -> value of a row
+METRICS = {
+    'followers': lambda row: number(row.get('instagram_followers')) + number(row.get('tiktok_followers')),
+    'instagram_followers': lambda row: number(row.get('instagram_followers')),
+    'tiktok_followers': lambda row: number(row.get('tiktok_followers')),
+    'views': lambda row: number(row.get('average_views')),
+    'engagement': lambda row: number(row.get('engagement_rate'))
+}
+
+# Columns kept per influencer; enough to render a leaderboard entry
+COLUMNS = (
+    'id', 'client_id', 'name', 'business_email', 'instagram_followers', 'tiktok_followers',
+    'average_views', 'engagement_rate', 'instagram_url', 'tiktok_url'
+)
+
+
+def rank(rows, metric, k):
+    """Top k rows by metric, highest first, ties by id; used while the index loads"""
+    value = METRICS[metric]
+    return sorted(rows, key=lambda row: (-value(row), row['id']))[:k]
+
+
+class LeaderboardState:
+    """One generation of the leaderboards: rows by id and per-client sorted rankings"""
+
+    def __init__(self):
+        self.rows = {}
+        # client_id -> metric -> [(-value, id)] kept sorted, so the top k is a slice
+        self.rankings = {}
+
+    def add(self, row):
+        row = {column: row.get(column) for column in COLUMNS}
+        self.remove(row['id'])
+        self.rows[row['id']] = row
+        rankings = self.rankings.setdefault(str(row['client_id']), {metric: [] for metric in METRICS})
+        for metric, value in METRICS.items():
+            bisect.insort(rankings[metric], (-value(row), row['id']))
+
+    def remove(self, influencer_id):
+        row = self.rows.pop(influencer_id, None)
+        if row is None:
+            return
+        client_key = str(row['client_id'])
+        rankings = self.rankings[client_key]
+        for metric, value in METRICS.items():
+            ranking = rankings[metric]
+            key = (-value(row), influencer_id)
+            position = bisect.bisect_left(ranking, key)
+            if position < len(ranking) and ranking[position] == key:
+                del ranking[position]
+        if not rankings['followers']:
+            del self.rankings[client_key]
+
+
+class ClientLeaderboards:
+    """In-process top-K rankings of each client's influencers by follower, view and engagement metrics.
+
+    Writes keep it current through add()/remove() in O(log n) search plus a
+    list shift within one client; top() costs O(k) whatever the table size.
+    Rebuilds journal concurrent writes like InfluencerIndex.rebuild().
+    """
+
+    def __init__(self):
+        self._state = LeaderboardState()
+        self._lock = threading.RLock()
+        self._journal = None
+        self.ready = False
+
+    def __len__(self):
+        with self._lock:
+            return len(self._state.rows)
+
+    def add(self, row):
+        """Insert or replace an influencer row"""
+        with self._lock:
+            self._state.add(row)
+            if self._journal is not None:
+                self._journal.append(('add', row))
+
+    def remove(self, influencer_id):
+        with self._lock:
+            self._state.remove(influencer_id)
+            if self._journal is not None:
+                self._journal.append(('remove', influencer_id))
+
+    def rebuild(self, pages):
+        """Replace the rankings with rows from an iterable of pages, e.g. iter_pages()"""
+        with self._lock:
+            self._journal = []
+        try:
+            state = LeaderboardState()
+            for rows in pages:
+                for row in rows:
+                    state.add(row)
+        except BaseException:
+            with self._lock:
+                self._journal = None
+            raise
+
+        with self._lock:
+            for action, value in self._journal:
+                if action == 'add':
+                    state.add(value)
+                else:
+                    state.remove(value)
+            self._journal = None
+            self._state = state
+            self.ready = True
+
+    def top(self, client_id, metric, k):
+        """Copies of the client's k best rows by metric, highest first"""
+        with self._lock:
+            rankings = self._state.rankings.get(str(client_id))
+            if rankings is None:
+                return []
+            return [dict(self._state.rows[influencer_id]) for _, influencer_id in rankings[metric][:k]]
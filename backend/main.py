@@ -1,11 +1,35 @@
 import os
 import sys
 from dotenv import load_dotenv
-from flask import Flask, send_from_directory, jsonify, request
+from flask import Flask, send_from_directory, send_file, jsonify, request, g, Response, stream_with_context, make_response, has_request_context
 from flask_cors import CORS
 from supabase import create_client, Client
+from postgrest.exceptions import APIError
 import logging
-from datetime import datetime
+import hashlib
+import time
+import json
+import base64
+import csv
+import io
+import threading
+import contextvars
+import math
+import zlib
+import jwt
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from cache import TTLCache
+from admission import Overloaded, TokenBucket, RateLimiter, ConcurrencyLimiter, parse_route_rates
+from datastore import create_data_store
+from changefeed import ChangeHub
+from search import InfluencerIndex
+from staticfiles import StaticManifest
+from leaderboard import ClientLeaderboards, METRICS as LEADERBOARD_METRICS, COLUMNS as LEADERBOARD_COLUMNS, rank
+from metrics import MetricsRegistry, InstrumentedClient, RequestTimings, current_request, timed
+from serialization import FastJSONProvider, MSGPACK_ENABLED, COMPRESSIBLE_MIMETYPES, response_format, choose_encoding, compress
 
 # Load environment variables from .env file
 load_dotenv()
@@ -15,6 +39,91 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
 SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
+# Local JWT verification settings. HS256 tokens are checked against the
+# project's JWT secret; asymmetric tokens against the project's JWKS.
+SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
+SUPABASE_JWKS_URL = os.getenv("SUPABASE_JWKS_URL", f"{SUPABASE_URL}/auth/v1/.well-known/jwks.json")
+SUPABASE_JWT_AUDIENCE = os.getenv("SUPABASE_JWT_AUDIENCE", "authenticated")
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_TTL = int(os.getenv("TOKEN_CACHE_TTL", "300"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+PRINCIPAL_CACHE_TTL = int(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+INFLUENCER_PAGE_SIZE_MAX = int(os.getenv("INFLUENCER_PAGE_SIZE_MAX", "1000"))
+# Submissions per page when their items are included
+SUBMISSION_PAGE_SIZE_MAX = int(os.getenv("SUBMISSION_PAGE_SIZE_MAX", "100"))
+STATS_CACHE_SIZE = int(os.getenv("STATS_CACHE_SIZE", "5000"))
+STATS_CACHE_TTL = int(os.getenv("STATS_CACHE_TTL", "600"))
+# Versions are per process, so the TTL bounds staleness across workers
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1000"))
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "30"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(2 * 1024 * 1024)))
+# Bodies at least this large are sent br/gzip-compressed to clients that accept it
+COMPRESS_ENABLED = os.getenv("COMPRESS_ENABLED", "true").lower() == "true"
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "4"))
+REALTIME_DEBOUNCE_SECONDS = float(os.getenv("REALTIME_DEBOUNCE_SECONDS", "0.25"))
+REALTIME_HEARTBEAT_SECONDS = float(os.getenv("REALTIME_HEARTBEAT_SECONDS", "15"))
+REALTIME_MAX_PENDING = int(os.getenv("REALTIME_MAX_PENDING", "1000"))
+# Open streams per worker; each holds a request thread, so by default half
+# of gunicorn's WORKER_THREADS stay free for API requests (0 for no cap)
+REALTIME_MAX_STREAMS = int(os.getenv("REALTIME_MAX_STREAMS", max(1, int(os.getenv("WORKER_THREADS", "32")) // 2)))
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "1000"))
+SEARCH_INDEX_ENABLED = os.getenv("SEARCH_INDEX_ENABLED", "true").lower() == "true"
+LEADERBOARD_ENABLED = os.getenv("LEADERBOARD_ENABLED", "true").lower() == "true"
+# Full rebuilds of the search index and leaderboards pick up writes served by
+# other workers and the metrics refresh worker; 0 loads once
+SEARCH_INDEX_REFRESH_SECONDS = int(os.getenv("SEARCH_INDEX_REFRESH_SECONDS", "3600"))
+LEADERBOARD_K_MAX = int(os.getenv("LEADERBOARD_K_MAX", "100"))
+SEARCH_RESULTS_MAX = int(os.getenv("SEARCH_RESULTS_MAX", "50"))
+# Adds a Server-Timing header (auth, principal, upstream, serialize, total) to every response
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "false").lower() == "true"
+# When set, /metrics requires "Authorization: Bearer <METRICS_TOKEN>"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+BULK_INSERT_CHUNK_SIZE = int(os.getenv("BULK_INSERT_CHUNK_SIZE", "500"))
+BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", "50000"))
+# IDs per ownership lookup and per write statement in PATCH/DELETE /api/influencers
+BULK_WRITE_CHUNK_SIZE = int(os.getenv("BULK_WRITE_CHUNK_SIZE", "200"))
+BULK_WRITE_MAX_IDS = int(os.getenv("BULK_WRITE_MAX_IDS", "10000"))
+EXPORT_PAGE_SIZE = int(os.getenv("EXPORT_PAGE_SIZE", "1000"))
+IDEMPOTENCY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+IDEMPOTENCY_CACHE_TTL = int(os.getenv("IDEMPOTENCY_CACHE_TTL", "86400"))
+# Set to false until backend/sql/create_submission.sql has been applied
+USE_SUBMISSION_RPC = os.getenv("USE_SUBMISSION_RPC", "true").lower() == "true"
+
+# Data access backend: 'supabase' (PostgREST over HTTP), 'postgres' (direct,
+# pooled connection to DATABASE_URL) or 'sqlite' (local file or in-memory)
+DATA_BACKEND = os.getenv("DATA_BACKEND", "supabase")
+DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_POOL_MIN = int(os.getenv("DATABASE_POOL_MIN", "1"))
+DATABASE_POOL_MAX = int(os.getenv("DATABASE_POOL_MAX", "10"))
+DATABASE_PREPARE = os.getenv("DATABASE_PREPARE", "true").lower() == "true"
+SQLITE_PATH = os.getenv("SQLITE_PATH", ":memory:")
+# Threads shared by all requests for running independent upstream calls concurrently
+UPSTREAM_POOL_SIZE = int(os.getenv("UPSTREAM_POOL_SIZE", "32"))
+# Admission control, per worker process: a token bucket per user and per
+# listed route, and a cap on concurrent upstream calls. Refused requests get a
+# 429 (buckets) or 503 (cap) with Retry-After instead of queueing.
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+ADMISSION_USER_RATE = float(os.getenv("ADMISSION_USER_RATE", "20"))    # requests per second per user
+ADMISSION_USER_BURST = float(os.getenv("ADMISSION_USER_BURST", "60"))
+# "METHOD /rule=requests per second" pairs; routes not listed are only limited per user
+ADMISSION_ROUTE_RATES = parse_route_rates(os.getenv(
+    "ADMISSION_ROUTE_RATES",
+    "POST /api/auth/signup=2, POST /api/auth/signin=10, POST /api/influencers/bulk=5, "
+    "PATCH /api/influencers=5, DELETE /api/influencers=5, "
+    "GET /api/influencers/export=2, GET /api/submissions/export=2"
+))
+# 0 disables the cap; requests wait at most UPSTREAM_QUEUE_TIMEOUT_MS for a slot
+UPSTREAM_MAX_IN_FLIGHT = int(os.getenv("UPSTREAM_MAX_IN_FLIGHT", "64"))
+UPSTREAM_QUEUE_TIMEOUT_MS = float(os.getenv("UPSTREAM_QUEUE_TIMEOUT_MS", "250"))
+# Built frontend served by the catch-all route (copy of the vite dist/ directory)
+STATIC_DIR = os.getenv("STATIC_DIR", os.path.join(os.path.dirname(__file__), 'static'))
+# Index STATIC_DIR once at startup; disable while rebuilding the frontend under a running server
+STATIC_MANIFEST_ENABLED = os.getenv("STATIC_MANIFEST_ENABLED", "true").lower() == "true"
+# Files beyond this many bytes in total are read from disk per request instead of memory
+STATIC_MEMORY_MAX_BYTES = int(os.getenv("STATIC_MEMORY_MAX_BYTES", str(64 * 1024 * 1024)))
+
 if not SUPABASE_URL or not SUPABASE_ANON_KEY:
     raise ValueError("Supabase URL and Keys must be set in .env file")
 
@@ -22,8 +131,112 @@ if not SUPABASE_URL or not SUPABASE_ANON_KEY:
 supabase_anon: Client = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
 supabase_service: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
 
-app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+# Table access goes through db, which exposes the same table()/rpc() query
+# interface whichever backend is configured. Auth always uses Supabase.
+if DATA_BACKEND == 'supabase':
+    db = supabase_service
+    public_db = supabase_anon
+else:
+    db = create_data_store(
+        DATA_BACKEND,
+        dsn=DATABASE_URL,
+        min_size=DATABASE_POOL_MIN,
+        max_size=DATABASE_POOL_MAX,
+        prepare=DATABASE_PREPARE,
+        path=SQLITE_PATH
+    )
+    public_db = db
+
+# Request and upstream call metrics, exported at /metrics
+metrics_registry = MetricsRegistry()
+http_requests = metrics_registry.counter(
+    'http_requests_total', 'Requests served', ('method', 'route', 'status')
+)
+http_request_duration = metrics_registry.histogram(
+    'http_request_duration_seconds', 'Time until the response headers are ready', ('method', 'route')
+)
+upstream_duration = metrics_registry.histogram(
+    'upstream_request_duration_seconds', 'Supabase/database calls by route and table',
+    ('route', 'table', 'operation')
+)
+upstream_errors = metrics_registry.counter(
+    'upstream_errors_total', 'Failed Supabase/database calls by route and table', ('route', 'table', 'operation')
+)
+
+admission_rejections = metrics_registry.counter(
+    'admission_rejections_total', 'Requests refused by admission control, by reason (user, route, upstream, realtime)',
+    ('reason', 'route')
+)
+metrics_registry.gauge(
+    'upstream_in_flight', 'Upstream calls currently holding a slot', (),
+    lambda: {(): upstream_limiter.in_flight}
+)
+
+def record_upstream_call(table, operation, seconds, ok):
+    """Observe one upstream call against the route of the request that made it"""
+    timings = current_request.get()
+    route = timings.route if timings else 'background'
+    upstream_duration.observe(seconds, route, table, operation)
+    if not ok:
+        upstream_errors.inc(route, table, operation)
+    if timings:
+        timings.add_call(table, operation, seconds, ok)
+
+upstream_limiter = ConcurrencyLimiter(UPSTREAM_MAX_IN_FLIGHT if ADMISSION_ENABLED else 0)
+
+@contextmanager
+def upstream_slot():
+    """Hold one of UPSTREAM_MAX_IN_FLIGHT slots for the duration of an upstream call
+
+    Requests wait at most UPSTREAM_QUEUE_TIMEOUT_MS, then the call raises
+    Overloaded and the request is answered 503 (see shed_overloaded_request).
+    Background work outside a request waits as long as it takes.
+    """
+    in_request = has_request_context()
+    if not upstream_limiter.acquire(UPSTREAM_QUEUE_TIMEOUT_MS / 1000 if in_request else None):
+        request.environ['admission.overloaded'] = True
+        raise Overloaded("Too many upstream calls in flight")
+    try:
+        yield
+    finally:
+        upstream_limiter.release()
+
+upstream_gate = upstream_slot if ADMISSION_ENABLED and UPSTREAM_MAX_IN_FLIGHT > 0 else nullcontext
+
+@contextmanager
+def upstream_call(table, operation):
+    """Time a Supabase call that does not go through db (e.g. auth) like a table call"""
+    with upstream_gate():
+        started = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            record_upstream_call(table, operation, time.perf_counter() - started, ok)
+
+db = InstrumentedClient(db, record_upstream_call, upstream_gate)
+public_db = db if DATA_BACKEND != 'supabase' else InstrumentedClient(public_db, record_upstream_call, upstream_gate)
+
+class ResponseProvider(FastJSONProvider):
+    """Encodes jsonify() bodies as JSON, or MessagePack when the Accept header prefers it.
+
+    Encoding is recorded as the 'serialize' span.
+    """
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body_format = response_format(request.accept_mimetypes) if has_request_context() else 'json'
+        with timed('serialize'):
+            body, mimetype = self.encode(obj, body_format)
+        response = self._app.response_class(body, mimetype=mimetype)
+        if MSGPACK_ENABLED:
+            response.vary.add('Accept')
+        return response
+
+app = Flask(__name__, static_folder=STATIC_DIR)
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
+app.json = ResponseProvider(app)
 
 # Enable CORS for all routes
 CORS(app, origins=["http://localhost:5173", "http://localhost:3000", "https://usariodashboard.netlify.app"] )
@@ -32,6 +245,193 @@ CORS(app, origins=["http://localhost:5173", "http://localhost:3000", "https://us
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@app.before_request
+def start_request_timing():
+    """Start collecting spans and upstream calls for this request"""
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    # Batch sub-requests can run inline in the batch request's context, so keep
+    # the token to restore the outer request's timings afterwards
+    request.environ['timing.token'] = current_request.set(RequestTimings(route, request.method))
+
+@app.after_request
+def finish_request_timing(response):
+    """Record request metrics, log slow requests and add Server-Timing when enabled
+
+    Streaming responses are measured up to their headers, not the last byte.
+    """
+    timings = current_request.get()
+    if timings is None:
+        return response
+
+    elapsed = timings.elapsed()
+    http_requests.inc(timings.method, timings.route, str(response.status_code))
+    http_request_duration.observe(elapsed, timings.method, timings.route)
+
+    if elapsed * 1000 >= SLOW_REQUEST_MS:
+        # Never log a token passed as ?access_token=
+        path = request.path if 'access_token' in request.args else request.full_path.rstrip('?')
+        logger.warning(
+            f"Slow request: {request.method} {path} {response.status_code} "
+            f"{elapsed * 1000:.0f}ms {timings.breakdown()}"
+        )
+    if SERVER_TIMING_ENABLED:
+        response.headers['Server-Timing'] = timings.server_timing()
+        if request.headers.get('Origin'):
+            response.headers['Timing-Allow-Origin'] = request.headers['Origin']
+    return response
+
+# Compressed bodies of cached GET responses keyed by (ETag, encoding), so repeats skip compression
+compressed_cache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+ETAG_ENCODINGS = ('br', 'gzip')
+
+def strip_etag_encoding(tag):
+    """The identity ETag behind a tag compress_response suffixed with its encoding"""
+    base, _, encoding = tag.rpartition('-')
+    return base if base and encoding in ETAG_ENCODINGS else tag
+
+@app.after_request
+def compress_response(response):
+    """Compress large JSON, MessagePack and text bodies with br or gzip, per Accept-Encoding
+
+    Streams (exports, realtime) and files are left alone; exports compress
+    themselves with ?gzip=true.
+    """
+    if (not COMPRESS_ENABLED or response.status_code != 200 or response.direct_passthrough
+            or response.is_streamed or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None or (response.content_length or 0) < COMPRESS_MIN_BYTES:
+        return response
+
+    # Each encoding is its own representation and needs its own strong ETag
+    etag, weak = response.get_etag()
+    body = compressed_cache.get((etag, encoding)) if etag else None
+    if body is None:
+        with timed('compress'):
+            body = compress(response.get_data(), encoding, COMPRESS_LEVEL)
+        if etag and len(body) <= RESPONSE_CACHE_MAX_BYTES:
+            compressed_cache.set((etag, encoding), body)
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak)
+    return response
+
+# Admission control; registered after the hooks above so its after_request runs before theirs
+user_limiter = RateLimiter(ADMISSION_USER_RATE, ADMISSION_USER_BURST)
+route_buckets = {route: TokenBucket(rate) for route, rate in ADMISSION_ROUTE_RATES.items()}
+ADMISSION_EXEMPT_ENDPOINTS = {'serve', 'static', 'metrics'}
+
+def refused(message, status, retry_after):
+    response = jsonify({"error": message})
+    response.status_code = status
+    response.headers['Retry-After'] = str(max(1, retry_after))
+    return response
+
+def admit_user(user_id):
+    """None if the user's token bucket admits one more request, else a 429 response"""
+    if not ADMISSION_ENABLED:
+        return None
+    retry_after = user_limiter.check(user_id)
+    if not retry_after:
+        return None
+    admission_rejections.inc('user', request.url_rule.rule if request.url_rule else 'unmatched')
+    return refused("Too many requests; retry later", 429, retry_after)
+
+@app.before_request
+def admit_request():
+    """Answer 429 while the route's token bucket (ADMISSION_ROUTE_RATES) is empty"""
+    if (not ADMISSION_ENABLED or request.method == 'OPTIONS' or request.url_rule is None
+            or request.endpoint in ADMISSION_EXEMPT_ENDPOINTS):
+        return None
+    bucket = route_buckets.get(f'{request.method} {request.url_rule.rule}')
+    if bucket is None:
+        return None
+    wait = bucket.reserve()
+    if wait <= 0:
+        return None
+    admission_rejections.inc('route', request.url_rule.rule)
+    return refused("Too many requests for this endpoint; retry later", 429, math.ceil(wait))
+
+@app.after_request
+def shed_overloaded_request(response):
+    """Answer 503 for a request refused an upstream slot, whatever its handler made of the Overloaded error"""
+    if not request.environ.get('admission.overloaded') or response.status_code == 503:
+        return response
+    admission_rejections.inc('upstream', request.url_rule.rule if request.url_rule else 'unmatched')
+    return refused("Server is busy; retry later", 503, 1)
+
+@app.teardown_request
+def clear_request_timing(exc):
+    token = request.environ.pop('timing.token', None)
+    if token is not None:
+        current_request.reset(token)
+
+upstream_pool = ThreadPoolExecutor(max_workers=UPSTREAM_POOL_SIZE, thread_name_prefix='upstream')
+
+def fan_out(*calls):
+    """Run independent upstream calls concurrently and return their results in order"""
+    # Calls made from inside the pool run inline so nested fan-outs cannot exhaust it
+    if len(calls) < 2 or threading.current_thread().name.startswith('upstream'):
+        return [call() for call in calls]
+    # Each call runs in a copy of this context so its timings land on the current request
+    futures = [upstream_pool.submit(contextvars.copy_context().run, call) for call in calls]
+    return [future.result() for future in futures]
+
+class TokenUser:
+    """User resolved from verified JWT claims (exposes the fields handlers use)"""
+
+    def __init__(self, claims):
+        self.id = claims.get('sub')
+        self.email = claims.get('email')
+        self.role = claims.get('role')
+        self.user_metadata = claims.get('user_metadata') or {}
+        self.app_metadata = claims.get('app_metadata') or {}
+
+# Verified users keyed by token hash, so repeat requests skip verification entirely
+token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL)
+token_stats = {"local": 0, "remote": 0, "rejected": 0}
+jwks_client = jwt.PyJWKClient(SUPABASE_JWKS_URL, cache_keys=True, lifespan=3600) if SUPABASE_JWKS_URL else None
+
+class TokenUnverifiable(Exception):
+    """Raised when a token cannot be checked locally (no key material available)"""
+
+def verify_token_locally(token):
+    """Verify a JWT's signature and expiry without calling the auth server"""
+    header = jwt.get_unverified_header(token)
+    algorithm = header.get('alg')
+
+    if algorithm == 'HS256':
+        if not SUPABASE_JWT_SECRET:
+            raise TokenUnverifiable("SUPABASE_JWT_SECRET is not configured")
+        key = SUPABASE_JWT_SECRET
+    elif jwks_client is not None and algorithm in ('RS256', 'ES256', 'EdDSA'):
+        try:
+            key = jwks_client.get_signing_key_from_jwt(token).key
+        except jwt.PyJWKClientError as e:
+            raise TokenUnverifiable(str(e))
+    else:
+        raise TokenUnverifiable(f"No verification key for algorithm {algorithm}")
+
+    return jwt.decode(
+        token,
+        key,
+        algorithms=[algorithm],
+        audience=SUPABASE_JWT_AUDIENCE,
+        options={"require": ["exp", "sub"]}
+    )
+
+def seconds_until_expiry(token):
+    """Remaining lifetime of a token according to its (unverified) exp claim"""
+    try:
+        claims = jwt.decode(token, options={"verify_signature": False})
+        return claims.get('exp', 0) - time.time()
+    except jwt.PyJWTError:
+        return 0
+
 # Helper function to get user from token
 def get_user_from_token(auth_header):
     """Extract user from Authorization header"""
@@ -39,13 +439,398 @@ def get_user_from_token(auth_header):
         return None
     
     token = auth_header.replace('Bearer ', '')
+    token_key = hashlib.sha256(token.encode()).hexdigest()
+
+    user = token_cache.get(token_key)
+    if user is not None:
+        return user
+
     try:
-        # Use the anon client to get user info
-        user = supabase_anon.auth.get_user(token)
-        return user.user if user else None
-    except Exception as e:
-        logger.error(f"Error getting user from token: {e}")
+        claims = verify_token_locally(token)
+        user = TokenUser(claims)
+        token_stats["local"] += 1
+    except TokenUnverifiable as e:
+        logger.debug(f"Falling back to remote token check: {e}")
+        user = None
+    except jwt.PyJWTError as e:
+        token_stats["rejected"] += 1
+        logger.info(f"Rejected token: {e}")
+        return None
+
+    if user is None:
+        try:
+            # Use the anon client to get user info
+            with upstream_call('auth', 'get_user'):
+                response = supabase_anon.auth.get_user(token)
+            user = response.user if response else None
+            token_stats["remote"] += 1
+        except Exception as e:
+            logger.error(f"Error getting user from token: {e}")
+            return None
+
+    if user is not None:
+        token_cache.set(token_key, user, ttl=seconds_until_expiry(token))
+    return user
+
+# Role and client assignments per user id, shared across requests
+principal_cache = TTLCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL)
+
+def get_principal(user_id):
+    """Return the profile, role and assigned client IDs for a user"""
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    # Assignments are fetched alongside the profile and dropped for admins
+    profile_response, assignments_response = fan_out(
+        lambda: db.table('profiles').select('*').eq('user_id', user_id).execute(),
+        lambda: db.table('user_client_assignments').select('client_id').eq('user_id', user_id).execute()
+    )
+    profile = profile_response.data[0] if profile_response.data else None
+    role = profile.get('role') if profile else 'va'
+
+    client_ids = []
+    if role != 'admin':
+        client_ids = [assignment['client_id'] for assignment in assignments_response.data]
+
+    principal = {"profile": profile, "role": role, "client_ids": client_ids}
+    principal_cache.set(user_id, principal)
+    return principal
+
+def invalidate_principal(user_id):
+    """Drop cached principal data after writes to profiles or user_client_assignments"""
+    principal_cache.delete(user_id)
+
+def has_client_access(client_id):
+    """Check whether the current principal may act on the given client"""
+    return g.is_admin or str(client_id) in {str(cid) for cid in g.client_ids}
+
+def require_auth(f):
+    """Resolve the caller's user, role and assigned clients once per request onto flask.g"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        if 'user' in g:
+            # Already resolved for this request (batch sub-requests inherit it,
+            # and each one counts against the user's bucket)
+            rejection = admit_user(g.user.id)
+            return rejection if rejection is not None else f(*args, **kwargs)
+
+        with timed('auth'):
+            user = get_user_from_token(request.headers.get('Authorization'))
+        if not user:
+            return jsonify({"error": "Unauthorized"}), 401
+
+        rejection = admit_user(user.id)
+        if rejection is not None:
+            return rejection
+
+        try:
+            with timed('principal'):
+                principal = get_principal(user.id)
+        except Exception as e:
+            logger.error(f"Principal lookup error: {e}")
+            return jsonify({"error": str(e)}), 500
+
+        g.user = user
+        g.profile = principal['profile']
+        g.role = principal['role']
+        g.is_admin = principal['role'] == 'admin'
+        g.client_ids = principal['client_ids']
+        return f(*args, **kwargs)
+    return decorated
+
+def require_admin(f):
+    """Like require_auth, but rejects non-admin callers with a 403"""
+    @wraps(f)
+    @require_auth
+    def decorated(*args, **kwargs):
+        if not g.is_admin:
+            return jsonify({"error": "Admin access required"}), 403
+        return f(*args, **kwargs)
+    return decorated
+
+def allow_query_token(f):
+    """Accept ?access_token= when no Authorization header is sent (EventSource cannot set headers)"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        token = request.args.get('access_token')
+        if token and not request.headers.get('Authorization'):
+            request.environ['HTTP_AUTHORIZATION'] = f"Bearer {token}"
+        return f(*args, **kwargs)
+    return decorated
+
+# Per-resource version counters, bumped by every write to that resource
+resource_versions = {"clients": 0, "profiles": 0, "assignments": 0, "influencers": 0, "submissions": 0}
+resource_versions_lock = threading.Lock()
+# Rendered GET responses keyed by (endpoint, scope, arguments, resource versions)
+response_cache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+
+def bump_versions(*resources):
+    """Mark resources as changed so cached responses and ETags built on them go stale"""
+    with resource_versions_lock:
+        for resource in resources:
+            resource_versions[resource] += 1
+
+def matching_etag(etag):
+    """The If-None-Match tag naming etag, bare or with its encoding suffix; None if none does"""
+    if request.if_none_match.star_tag:
+        return etag
+    return next((tag for tag in request.if_none_match if strip_etag_encoding(tag) == etag), None)
+
+def cached_get(*resources):
+    """Cache a GET handler's JSON response and answer If-None-Match with 304s.
+
+    The cache key includes the versions of the resources the response is
+    built from, so a write bumping any of them changes the key and the ETag.
+    Admins share one scope; other users are scoped to themselves. Bodies over
+    RESPONSE_CACHE_MAX_BYTES keep only their ETag, which still allows 304s.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            user = getattr(g, 'user', None)
+            scope = 'public' if user is None else ('admin' if g.is_admin else user.id)
+            with resource_versions_lock:
+                versions = tuple(resource_versions[resource] for resource in resources)
+            key = (
+                request.endpoint, scope, request.query_string, tuple(sorted(kwargs.items())), versions,
+                response_format(request.accept_mimetypes)
+            )
+
+            cached = response_cache.get(key)
+            if cached is not None and (cached['body'] is not None or matching_etag(cached['etag'])):
+                response = Response(cached['body'] or b'', mimetype=cached['mimetype'])
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                body = response.get_data()
+                cached = {
+                    "etag": hashlib.sha256(body).hexdigest(),
+                    "body": body if len(body) <= RESPONSE_CACHE_MAX_BYTES else None,
+                    "mimetype": response.mimetype
+                }
+                response_cache.set(key, cached)
+
+            # Echo a matching encoded tag so the 304 names the representation the client holds
+            response.set_etag(matching_etag(cached['etag']) or cached['etag'])
+            response.headers['Cache-Control'] = 'private, no-cache'
+            # Cache hits and 304s skip the hooks that add these for fresh 200s
+            if MSGPACK_ENABLED:
+                response.vary.add('Accept')
+            if COMPRESS_ENABLED:
+                response.vary.add('Accept-Encoding')
+            return response.make_conditional(request)
+        return decorated
+    return decorator
+
+# Columns that may be requested through the fields= projection parameter
+INFLUENCER_COLUMNS = {
+    'id', 'client_id', 'added_by_user_id', 'name', 'business_email',
+    'instagram_followers', 'tiktok_followers', 'average_views', 'engagement_rate',
+    'instagram_url', 'tiktok_url', 'notes', 'submitted', 'submission_id',
+    'date_added', 'created_at'
+}
+
+def encode_cursor(last_id):
+    """Encode the last seen row id as an opaque pagination cursor"""
+    return base64.urlsafe_b64encode(json.dumps({"id": last_id}).encode()).decode()
+
+def decode_cursor(cursor):
+    """Decode a pagination cursor back into the last seen row id"""
+    try:
+        last_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))['id']
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise ValueError("Invalid cursor")
+    return last_id
+
+def parse_influencer_fields(fields_param):
+    """Translate a fields= parameter into a PostgREST select string"""
+    if not fields_param:
+        return '*, clients(name)'
+
+    fields = [field.strip() for field in fields_param.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in INFLUENCER_COLUMNS and field != 'clients']
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    # The id is always needed to build the next cursor
+    columns = ['id'] + [field for field in fields if field not in ('id', 'clients')]
+    if 'clients' in fields:
+        columns.append('clients(name)')
+    return ', '.join(columns)
+
+def parse_int_param(args, name):
+    value = args.get(name)
+    if value in (None, ''):
         return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer")
+
+def resolve_client_scope(args):
+    """Return the client IDs a query should be limited to, or None for no limit.
+
+    Requested client_id values are intersected with the caller's assignments;
+    asking for a client the caller cannot access raises PermissionError.
+    """
+    requested = [cid.strip() for cid in args.get('client_id', '').split(',') if cid.strip()]
+    if g.is_admin:
+        return requested or None
+
+    for client_id in requested:
+        if not has_client_access(client_id):
+            raise PermissionError("Access denied for this client")
+    return requested or list(g.client_ids)
+
+def apply_influencer_filters(query, args, client_ids):
+    """Apply the server-side influencer filters shared by list, stats and export routes"""
+    if client_ids is not None:
+        query = query.in_('client_id', client_ids)
+
+    submitted = args.get('submitted')
+    if submitted is not None:
+        if submitted.lower() not in ('true', 'false'):
+            raise ValueError("submitted must be true or false")
+        query = query.eq('submitted', submitted.lower() == 'true')
+
+    submission_id = parse_int_param(args, 'submission_id')
+    if submission_id is not None:
+        query = query.eq('submission_id', submission_id)
+
+    if args.get('added_from'):
+        query = query.gte('date_added', args['added_from'])
+    if args.get('added_to'):
+        query = query.lte('date_added', args['added_to'])
+
+    for platform in ('instagram', 'tiktok'):
+        minimum = parse_int_param(args, f'min_{platform}_followers')
+        maximum = parse_int_param(args, f'max_{platform}_followers')
+        if minimum is not None:
+            query = query.gte(f'{platform}_followers', minimum)
+        if maximum is not None:
+            query = query.lte(f'{platform}_followers', maximum)
+
+    return query
+
+def to_number(value, cast):
+    """Coerce a submitted metric to a number, treating blanks as zero"""
+    if value in (None, ''):
+        return 0
+    if isinstance(value, str):
+        value = value.replace(',', '').replace('%', '').strip()
+    return cast(float(value))
+
+def build_influencer_row(data, user_id):
+    """Validate submitted influencer data and build the row to insert"""
+    # Validate required fields
+    required_fields = ['client_id', 'name', 'business_email']
+    for field in required_fields:
+        if not data.get(field):
+            raise ValueError(f"{field} is required")
+
+    try:
+        metrics = {
+            "instagram_followers": to_number(data.get('instagram_followers', 0), int),
+            "tiktok_followers": to_number(data.get('tiktok_followers', 0), int),
+            "average_views": to_number(data.get('average_views', 0), int),
+            "engagement_rate": to_number(data.get('engagement_rate', 0), float)
+        }
+    except (TypeError, ValueError):
+        raise ValueError("Follower, view and engagement values must be numeric")
+
+    return {
+        "client_id": data['client_id'],
+        "added_by_user_id": user_id,
+        "name": data['name'],
+        "business_email": data['business_email'],
+        **metrics,
+        "instagram_url": data.get('instagram_url', ''),
+        "tiktok_url": data.get('tiktok_url', ''),
+        "notes": data.get('notes', ''),
+        "submitted": False
+    }
+
+def iter_pages(build_query, page_size=1000):
+    """Yield pages of rows by keyset on id; build_query must return a fresh query selecting id"""
+    last_id = None
+    while True:
+        query = build_query()
+        if last_id is not None:
+            query = query.gt('id', last_id)
+        rows = query.order('id').limit(page_size).execute().data
+        if not rows:
+            return
+        yield rows
+        if len(rows) < page_size:
+            return
+        last_id = rows[-1]['id']
+
+def flatten_row(row, prefix=''):
+    """Flatten embedded relations ({'clients': {'name': ..}}) into 'clients.name' columns"""
+    flat = {}
+    for key, value in row.items():
+        if isinstance(value, dict):
+            flat.update(flatten_row(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+def encode_export(pages, export_format):
+    """Encode pages of rows as NDJSON lines or CSV text, one page at a time"""
+    if export_format == 'ndjson':
+        for rows in pages:
+            yield ''.join(json.dumps(row, default=str) + '\n' for row in rows)
+        return
+
+    buffer = io.StringIO()
+    writer = None
+    for rows in pages:
+        for row in rows:
+            row = flatten_row(row)
+            if writer is None:
+                writer = csv.DictWriter(buffer, fieldnames=list(row.keys()), extrasaction='ignore')
+                writer.writeheader()
+            writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+def export_response(pages, export_format, compress, filename):
+    """Stream an export as NDJSON or CSV, optionally gzip-compressed"""
+    def generate():
+        compressor = zlib.compressobj(wbits=31) if compress else None
+        try:
+            for text in encode_export(pages, export_format):
+                data = text.encode('utf-8')
+                yield compressor.compress(data) if compressor else data
+        except Exception as e:
+            logger.error(f"Export error: {e}")
+            if export_format != 'ndjson':
+                # CSV has no way to mark an error, so abort the connection (no
+                # final chunk, no gzip trailer) rather than end a truncated file cleanly
+                raise
+            error_line = (json.dumps({"error": str(e)}) + '\n').encode('utf-8')
+            yield compressor.compress(error_line) if compressor else error_line
+        if compressor:
+            yield compressor.flush()
+
+    mimetype = 'application/x-ndjson' if export_format == 'ndjson' else 'text/csv'
+    headers = {"Content-Disposition": f"attachment; filename={filename}.{export_format}"}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return Response(stream_with_context(generate()), mimetype=mimetype, headers=headers)
+
+def parse_export_options(args):
+    """Return (format, compress) from ?format=ndjson|csv and ?gzip=true"""
+    export_format = args.get('format', 'ndjson').lower()
+    if export_format not in ('ndjson', 'csv'):
+        raise ValueError("format must be ndjson or csv")
+    compress = args.get('gzip', 'false').lower() in ('1', 'true')
+    return export_format, compress
 
 # Authentication endpoints
 @app.route('/api/auth/signup', methods=['POST'])
@@ -62,16 +847,17 @@ def signup():
             return jsonify({"error": "Email, password, and full name are required"}), 400
         
         # Create user with Supabase Auth
-        auth_response = supabase_anon.auth.sign_up({
-            "email": email,
-            "password": password,
-            "options": {
-                "data": {
-                    "full_name": full_name,
-                    "role": role
+        with upstream_call('auth', 'sign_up'):
+            auth_response = supabase_anon.auth.sign_up({
+                "email": email,
+                "password": password,
+                "options": {
+                    "data": {
+                        "full_name": full_name,
+                        "role": role
+                    }
                 }
-            }
-        })
+            })
         
         if auth_response.user:
             # Create profile entry
@@ -81,7 +867,10 @@ def signup():
                 "role": role
             }
             
-            profile_response = supabase_service.table('profiles').insert(profile_data).execute()
+            profile_response = db.table('profiles').insert(profile_data).execute()
+            invalidate_principal(auth_response.user.id)
+            invalidate_client_stats([])
+            bump_versions('profiles')
             
             return jsonify({
                 "message": "User created successfully",
@@ -111,14 +900,15 @@ def signin():
             return jsonify({"error": "Email and password are required"}), 400
         
         # Sign in with Supabase Auth
-        auth_response = supabase_anon.auth.sign_in_with_password({
-            "email": email,
-            "password": password
-        })
+        with upstream_call('auth', 'sign_in'):
+            auth_response = supabase_anon.auth.sign_in_with_password({
+                "email": email,
+                "password": password
+            })
         
         if auth_response.user and auth_response.session:
             # Get user profile
-            profile_response = supabase_service.table('profiles').select('*').eq('user_id', auth_response.user.id).execute()
+            profile_response = db.table('profiles').select('*').eq('user_id', auth_response.user.id).execute()
             
             profile = profile_response.data[0] if profile_response.data else None
             
@@ -149,7 +939,8 @@ def signout():
         auth_header = request.headers.get('Authorization')
         if auth_header and auth_header.startswith('Bearer '):
             token = auth_header.replace('Bearer ', '')
-            supabase_anon.auth.sign_out()
+            with upstream_call('auth', 'sign_out'):
+                supabase_anon.auth.sign_out()
         
         return jsonify({"message": "Signed out successfully"}), 200
     except Exception as e:
@@ -157,23 +948,16 @@ def signout():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/auth/user', methods=['GET'])
+@require_auth
 def get_current_user():
     """Get current user info"""
     try:
-        auth_header = request.headers.get('Authorization')
-        user = get_user_from_token(auth_header)
-        
-        if not user:
-            return jsonify({"error": "Unauthorized"}), 401
-        
-        # Get user profile
-        profile_response = supabase_service.table('profiles').select('*').eq('user_id', user.id).execute()
-        profile = profile_response.data[0] if profile_response.data else None
+        profile = g.profile
         
         return jsonify({
             "user": {
-                "id": user.id,
-                "email": user.email,
+                "id": g.user.id,
+                "email": g.user.email,
                 "full_name": profile.get('full_name') if profile else '',
                 "role": profile.get('role') if profile else 'va'
             }
@@ -185,30 +969,21 @@ def get_current_user():
 
 # Clients endpoints
 @app.route('/api/clients', methods=['GET'])
+@cached_get('clients')
 def get_clients():
     """Get all clients"""
     try:
-        response = supabase_anon.table('clients').select('*').execute()
+        response = public_db.table('clients').select('*').execute()
         return jsonify({"clients": response.data}), 200
     except Exception as e:
         logger.error(f"Get clients error: {e}")
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/clients', methods=['POST'])
+@require_admin
 def create_client():
     """Create a new client (admin only)"""
     try:
-        auth_header = request.headers.get('Authorization')
-        user = get_user_from_token(auth_header)
-        
-        if not user:
-            return jsonify({"error": "Unauthorized"}), 401
-        
-        # Check if user is admin
-        profile_response = supabase_service.table('profiles').select('role').eq('user_id', user.id).execute()
-        if not profile_response.data or profile_response.data[0].get('role') != 'admin':
-            return jsonify({"error": "Admin access required"}), 403
-        
         data = request.get_json()
         name = data.get('name')
         description = data.get('description', '')
@@ -221,31 +996,53 @@ def create_client():
             "description": description
         }
         
-        response = supabase_service.table('clients').insert(client_data).execute()
+        response = db.table('clients').insert(client_data).execute()
+        invalidate_client_stats([], client_list_changed=True)
+        bump_versions('clients')
+        change_hub.publish('clients', 'INSERT', response.data[0], public=True)
         return jsonify({"client": response.data[0]}), 201
         
     except Exception as e:
         logger.error(f"Create client error: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/clients/<int:client_id>/top', methods=['GET'])
+@require_auth
+def get_top_influencers(client_id):
+    """A client's top influencers by ?metric= (default followers), best first (?k=, default 10)"""
+    try:
+        if not has_client_access(client_id):
+            return jsonify({"error": "Access denied"}), 403
+        metric = request.args.get('metric', 'followers')
+        if metric not in LEADERBOARD_METRICS:
+            return jsonify({"error": f"metric must be one of: {', '.join(LEADERBOARD_METRICS)}"}), 400
+        try:
+            k = parse_int_param(request.args, 'k') or 10
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        k = max(1, min(k, LEADERBOARD_K_MAX))
+
+        if not client_leaderboards.ready:
+            # Still loading: rank the client's influencers per request
+            rows = db.table('influencers').select(', '.join(LEADERBOARD_COLUMNS)).eq('client_id', client_id).execute().data
+            return jsonify({"client_id": client_id, "metric": metric, "influencers": rank(rows, metric, k), "index": "loading"}), 200
+
+        influencers = client_leaderboards.top(client_id, metric, k)
+        return jsonify({"client_id": client_id, "metric": metric, "influencers": influencers, "index": "ready"}), 200
+
+    except Exception as e:
+        logger.error(f"Get top influencers error: {e}")
+        return jsonify({"error": str(e)}), 500
+
 # User management endpoints
 @app.route('/api/users', methods=['GET'])
+@require_admin
+@cached_get('profiles')
 def get_users():
     """Get all users (admin only)"""
     try:
-        auth_header = request.headers.get('Authorization')
-        user = get_user_from_token(auth_header)
-        
-        if not user:
-            return jsonify({"error": "Unauthorized"}), 401
-        
-        # Check if user is admin
-        profile_response = supabase_service.table('profiles').select('role').eq('user_id', user.id).execute()
-        if not profile_response.data or profile_response.data[0].get('role') != 'admin':
-            return jsonify({"error": "Admin access required"}), 403
-        
         # Get all profiles
-        response = supabase_service.table('profiles').select('*').execute()
+        response = db.table('profiles').select('*').execute()
         return jsonify({"users": response.data}), 200
         
     except Exception as e:
@@ -253,20 +1050,10 @@ def get_users():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/users/<user_id>/clients', methods=['POST'])
+@require_admin
 def assign_client_to_user(user_id):
     """Assign a client to a user (admin only)"""
     try:
-        auth_header = request.headers.get('Authorization')
-        user = get_user_from_token(auth_header)
-        
-        if not user:
-            return jsonify({"error": "Unauthorized"}), 401
-        
-        # Check if user is admin
-        profile_response = supabase_service.table('profiles').select('role').eq('user_id', user.id).execute()
-        if not profile_response.data or profile_response.data[0].get('role') != 'admin':
-            return jsonify({"error": "Admin access required"}), 403
-        
         data = request.get_json()
         client_id = data.get('client_id')
         
@@ -278,7 +1065,9 @@ def assign_client_to_user(user_id):
             "client_id": client_id
         }
         
-        response = supabase_service.table('user_client_assignments').insert(assignment_data).execute()
+        response = db.table('user_client_assignments').insert(assignment_data).execute()
+        invalidate_principal(user_id)
+        bump_versions('assignments')
         return jsonify({"assignment": response.data[0]}), 201
         
     except Exception as e:
@@ -286,24 +1075,16 @@ def assign_client_to_user(user_id):
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/users/<user_id>/clients', methods=['GET'])
+@require_auth
+@cached_get('assignments', 'clients')
 def get_user_clients(user_id):
     """Get clients assigned to a user"""
     try:
-        auth_header = request.headers.get('Authorization')
-        user = get_user_from_token(auth_header)
-        
-        if not user:
-            return jsonify({"error": "Unauthorized"}), 401
-        
-        # Users can only see their own assignments unless they're admin
-        profile_response = supabase_service.table('profiles').select('role').eq('user_id', user.id).execute()
-        is_admin = profile_response.data and profile_response.data[0].get('role') == 'admin'
-        
-        if not is_admin and user.id != user_id:
+        if not g.is_admin and g.user.id != user_id:
             return jsonify({"error": "Access denied"}), 403
         
         # Get user's client assignments with client details
-        response = supabase_service.table('user_client_assignments').select('*, clients(*)').eq('user_id', user_id).execute()
+        response = db.table('user_client_assignments').select('*, clients(*)').eq('user_id', user_id).execute()
         
         clients = [assignment['clients'] for assignment in response.data]
         return jsonify({"clients": clients}), 200
@@ -312,245 +1093,1395 @@ def get_user_clients(user_id):
         logger.error(f"Get user clients error: {e}")
         return jsonify({"error": str(e)}), 500
 
+# Influencer search index and per-client leaderboards, loaded in the background
+# once a worker serves its first request
+SEARCH_COLUMNS = 'id, client_id, added_by_user_id, name, business_email, instagram_url, tiktok_url'
+influencer_index = InfluencerIndex()
+client_leaderboards = ClientLeaderboards()
+index_loader = {"thread": None}
+index_loader_lock = threading.Lock()
+
+def load_influencer_indexes(search=True, leaderboards=True):
+    """Rebuild the search index and/or the leaderboards from full scans of influencers"""
+    if search:
+        started = time.perf_counter()
+        influencer_index.rebuild(
+            iter_pages(lambda: db.table('influencers').select(SEARCH_COLUMNS), EXPORT_PAGE_SIZE)
+        )
+        logger.info(f"Search index loaded {len(influencer_index)} influencers in {time.perf_counter() - started:.1f}s")
+    if leaderboards:
+        started = time.perf_counter()
+        client_leaderboards.rebuild(
+            iter_pages(lambda: db.table('influencers').select(', '.join(LEADERBOARD_COLUMNS)), EXPORT_PAGE_SIZE)
+        )
+        logger.info(f"Leaderboards loaded {len(client_leaderboards)} influencers in {time.perf_counter() - started:.1f}s")
+
+def refresh_influencer_index():
+    """Load the enabled indexes, then rebuild them every SEARCH_INDEX_REFRESH_SECONDS"""
+    while True:
+        try:
+            load_influencer_indexes(search=SEARCH_INDEX_ENABLED, leaderboards=LEADERBOARD_ENABLED)
+        except Exception as e:
+            logger.error(f"Influencer index load error: {e}")
+
+        # Retry a failed first load sooner than the regular refresh
+        loaded = (influencer_index.ready or not SEARCH_INDEX_ENABLED) and (client_leaderboards.ready or not LEADERBOARD_ENABLED)
+        delay = SEARCH_INDEX_REFRESH_SECONDS if loaded else 30
+        if delay <= 0:
+            return
+        time.sleep(delay)
+
+@app.before_request
+def start_influencer_index():
+    if not (SEARCH_INDEX_ENABLED or LEADERBOARD_ENABLED) or index_loader["thread"] is not None:
+        return
+    with index_loader_lock:
+        if index_loader["thread"] is None:
+            index_loader["thread"] = threading.Thread(target=refresh_influencer_index, name='influencer-indexes', daemon=True)
+            index_loader["thread"].start()
+
+def present_match(document, **extra):
+    """Shape an index document for the caller, withholding contact details of other clients' influencers"""
+    in_scope = has_client_access(document['client_id'])
+    match = {
+        "id": document['id'],
+        "client_id": document['client_id'],
+        "name": document['name'],
+        "instagram_handle": document['instagram'],
+        "tiktok_handle": document['tiktok'],
+        "in_scope": in_scope
+    }
+    if in_scope:
+        match["business_email"] = document['business_email']
+        match["added_by_user_id"] = document['added_by_user_id']
+    match.update(extra)
+    return match
+
+def duplicate_warnings(row, exclude_ids=()):
+    """Existing influencers sharing an email or handle with row, or None while the index loads"""
+    if not influencer_index.ready:
+        return None
+    return [
+        present_match(match, matched_on=match['matched_on'])
+        for match in influencer_index.find_duplicates(row, exclude_ids)
+    ]
+
 # Influencers endpoints
 @app.route('/api/influencers', methods=['GET'])
+@require_auth
+@cached_get('influencers', 'clients', 'assignments')
 def get_influencers():
-    """Get influencers (filtered by user's assigned clients)"""
+    """Get influencers (filtered by user's assigned clients)
+
+    Supports fields= projection, client_id/submitted/submission_id/added_from/
+    added_to/min_*_followers/max_*_followers filters and keyset pagination via
+    limit= and cursor= (newest first, next_cursor is returned while rows remain).
+    """
     try:
-        auth_header = request.headers.get('Authorization')
-        user = get_user_from_token(auth_header)
-        
-        if not user:
-            return jsonify({"error": "Unauthorized"}), 401
-        
-        # Check if user is admin
-        profile_response = supabase_service.table('profiles').select('role').eq('user_id', user.id).execute()
-        is_admin = profile_response.data and profile_response.data[0].get('role') == 'admin'
-        
-        if is_admin:
-            # Admin can see all influencers
-            response = supabase_service.table('influencers').select('*, clients(name)').execute()
-        else:
-            # Regular users can only see influencers for their assigned clients
-            assignments_response = supabase_service.table('user_client_assignments').select('client_id').eq('user_id', user.id).execute()
-            client_ids = [assignment['client_id'] for assignment in assignments_response.data]
-            
-            if not client_ids:
-                return jsonify({"influencers": []}), 200
-            
-            response = supabase_service.table('influencers').select('*, clients(name)').in_('client_id', client_ids).execute()
-        
-        return jsonify({"influencers": response.data}), 200
+        args = request.args
+        try:
+            columns = parse_influencer_fields(args.get('fields'))
+            client_ids = resolve_client_scope(args)
+            limit = parse_int_param(args, 'limit')
+            after_id = decode_cursor(args['cursor']) if args.get('cursor') else None
+        except PermissionError as e:
+            return jsonify({"error": str(e)}), 403
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # Regular users can only see influencers for their assigned clients
+        if client_ids is not None and not client_ids:
+            return jsonify({"influencers": [], "next_cursor": None}), 200
+
+        try:
+            query = apply_influencer_filters(db.table('influencers').select(columns), args, client_ids)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        paginated = limit is not None or after_id is not None
+        if not paginated:
+            response = query.execute()
+            return jsonify({"influencers": response.data}), 200
+
+        limit = max(1, min(limit or INFLUENCER_PAGE_SIZE_MAX, INFLUENCER_PAGE_SIZE_MAX))
+        if after_id is not None:
+            query = query.lt('id', after_id)
+
+        # Fetch one extra row to learn whether another page exists
+        response = query.order('id', desc=True).limit(limit + 1).execute()
+        rows = response.data[:limit]
+        next_cursor = encode_cursor(rows[-1]['id']) if len(response.data) > limit else None
+
+        return jsonify({"influencers": rows, "next_cursor": next_cursor}), 200
         
     except Exception as e:
         logger.error(f"Get influencers error: {e}")
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/influencers', methods=['POST'])
+@require_auth
 def create_influencer():
     """Create a new influencer"""
     try:
-        auth_header = request.headers.get('Authorization')
-        user = get_user_from_token(auth_header)
-        
-        if not user:
-            return jsonify({"error": "Unauthorized"}), 401
-        
         data = request.get_json()
         
-        # Validate required fields
-        required_fields = ['client_id', 'name', 'business_email']
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({"error": f"{field} is required"}), 400
+        try:
+            influencer_data = build_influencer_row(data, g.user.id)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         
         # Check if user has access to this client
-        profile_response = supabase_service.table('profiles').select('role').eq('user_id', user.id).execute()
-        is_admin = profile_response.data and profile_response.data[0].get('role') == 'admin'
-        
-        if not is_admin:
-            assignments_response = supabase_service.table('user_client_assignments').select('client_id').eq('user_id', user.id).eq('client_id', data['client_id']).execute()
-            if not assignments_response.data:
-                return jsonify({"error": "Access denied for this client"}), 403
-        
-        influencer_data = {
-            "client_id": data['client_id'],
-            "added_by_user_id": user.id,
-            "name": data['name'],
-            "business_email": data['business_email'],
-            "instagram_followers": data.get('instagram_followers', 0),
-            "tiktok_followers": data.get('tiktok_followers', 0),
-            "average_views": data.get('average_views', 0),
-            "engagement_rate": data.get('engagement_rate', 0),
-            "instagram_url": data.get('instagram_url', ''),
-            "tiktok_url": data.get('tiktok_url', ''),
-            "notes": data.get('notes', ''),
-            "submitted": False
-        }
-        
-        response = supabase_service.table('influencers').insert(influencer_data).execute()
-        return jsonify({"influencer": response.data[0]}), 201
+        if not has_client_access(data['client_id']):
+            return jsonify({"error": "Access denied for this client"}), 403
+        
+        response = db.table('influencers').insert(influencer_data).execute()
+        influencer = response.data[0]
+        duplicates = duplicate_warnings(influencer, exclude_ids={influencer['id']})
+        influencer_index.add(influencer)
+        client_leaderboards.add(influencer)
+        invalidate_client_stats([data['client_id']])
+        bump_versions('influencers')
+        change_hub.publish('influencers', 'INSERT', influencer, client_id=influencer['client_id'])
+
+        result = {"influencer": influencer}
+        if duplicates is not None:
+            result["duplicates"] = duplicates
+        return jsonify(result), 201
         
     except Exception as e:
         logger.error(f"Create influencer error: {e}")
         return jsonify({"error": str(e)}), 500
 
+def normalize_csv_header(header):
+    """Map CSV headers like 'Business Email' onto column names like business_email"""
+    return header.strip().lower().replace(' ', '_')
+
+def iter_bulk_records():
+    """Yield submitted rows from a JSON array, NDJSON or CSV body.
+
+    CSV and NDJSON bodies are read from the request stream line by line.
+    Lines that fail to parse are yielded as the exception so the caller can
+    report them against their row index and carry on.
+    """
+    if request.mimetype == 'text/csv':
+        stream = io.TextIOWrapper(request.stream, encoding='utf-8-sig', newline='')
+        for record in csv.DictReader(stream):
+            yield {normalize_csv_header(key): value for key, value in record.items() if key}
+    elif request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        for line in request.stream:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield e
+    else:
+        data = request.get_json(silent=True)
+        if data is None:
+            raise ValueError("Unsupported body; send a JSON array, NDJSON or CSV")
+        records = data.get('influencers') if isinstance(data, dict) else data
+        if not isinstance(records, list):
+            raise ValueError("Expected a JSON array of influencers")
+        yield from records
+
+def insert_influencer_chunk(chunk, created, errors):
+    """Insert (index, row) pairs in one statement, isolating failures row by row"""
+    if not chunk:
+        return
+    try:
+        response = db.table('influencers').insert([row for _, row in chunk]).execute()
+        created.extend(response.data)
+    except Exception as e:
+        logger.warning(f"Bulk insert chunk failed, retrying rows individually: {e}")
+        for index, row in chunk:
+            try:
+                response = db.table('influencers').insert(row).execute()
+                created.extend(response.data)
+            except Exception as row_error:
+                errors.append({"index": index, "error": str(row_error)})
+
+@app.route('/api/influencers/bulk', methods=['POST'])
+@require_auth
+def bulk_create_influencers():
+    """Create many influencers from a JSON array, NDJSON or CSV body
+
+    Rows without a client_id use the ?client_id= query parameter. Valid rows
+    are inserted in chunks; invalid rows are reported by index without
+    aborting the rest of the import.
+    """
+    try:
+        default_client_id = request.args.get('client_id')
+        created = []
+        errors = []
+        chunk = []
+        client_access = {}
+
+        for index, record in enumerate(iter_bulk_records()):
+            if index >= BULK_MAX_ROWS:
+                errors.append({"index": index, "error": f"Imports are limited to {BULK_MAX_ROWS} rows"})
+                break
+
+            try:
+                if isinstance(record, Exception):
+                    raise ValueError(f"Invalid row: {record}")
+                if not isinstance(record, dict):
+                    raise ValueError("Each row must be an object")
+                if default_client_id and not record.get('client_id'):
+                    record['client_id'] = default_client_id
+                row = build_influencer_row(record, g.user.id)
+            except ValueError as e:
+                errors.append({"index": index, "error": str(e)})
+                continue
+
+            # Check access once per distinct client
+            client_key = str(row['client_id'])
+            if client_key not in client_access:
+                client_access[client_key] = has_client_access(client_key)
+            if not client_access[client_key]:
+                errors.append({"index": index, "error": "Access denied for this client"})
+                continue
+
+            chunk.append((index, row))
+            if len(chunk) >= BULK_INSERT_CHUNK_SIZE:
+                insert_influencer_chunk(chunk, created, errors)
+                chunk = []
+
+        insert_influencer_chunk(chunk, created, errors)
+
+        # Rows are indexed in order, so repeats within the import are flagged too
+        duplicates = []
+        for row in created:
+            matches = duplicate_warnings(row, exclude_ids={row['id']})
+            influencer_index.add(row)
+            client_leaderboards.add(row)
+            if matches:
+                duplicates.append({"id": row['id'], "name": row.get('name'), "matches": matches})
+
+        if created:
+            invalidate_client_stats({row['client_id'] for row in created})
+            bump_versions('influencers')
+            for row in created:
+                change_hub.publish('influencers', 'INSERT', row, client_id=row['client_id'])
+
+        errors.sort(key=lambda error: error['index'])
+        status = 201 if created else 400
+        return jsonify({
+            "created": len(created),
+            "influencers": created,
+            "errors": errors,
+            "duplicates": duplicates
+        }), status
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Bulk create influencers error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/influencers/search', methods=['GET'])
+@require_auth
+def search_influencers():
+    """Fuzzy search influencers by name, business email or Instagram/TikTok handle
+
+    Matches under clients the caller is not assigned to are included, without
+    contact details, so VAs can spot creators that already exist. Pass
+    client_id to restrict results to specific clients.
+    """
+    try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({"error": "q is required"}), 400
+        try:
+            limit = min(parse_int_param(request.args, 'limit') or 20, SEARCH_RESULTS_MAX)
+            client_ids = resolve_client_scope(request.args) if request.args.get('client_id') else None
+        except PermissionError as e:
+            return jsonify({"error": str(e)}), 403
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        if not influencer_index.ready:
+            # Still loading: fall back to a plain name substring query
+            pattern = ''.join(char for char in query if char not in '%*_,()')
+            name_query = db.table('influencers').select(SEARCH_COLUMNS).ilike('name', f'%{pattern}%')
+            if client_ids is not None:
+                name_query = name_query.in_('client_id', client_ids)
+            rows = name_query.order('id').limit(limit).execute().data
+            results = [
+                present_match(InfluencerIndex.document(row), score=None, matched_field='name') for row in rows
+            ]
+            return jsonify({"results": results, "index": "loading"}), 200
+
+        matches = influencer_index.search(query, limit=limit, client_ids=client_ids)
+        results = [
+            present_match(document, score=score, matched_field=field) for document, score, field in matches
+        ]
+        return jsonify({"results": results, "index": "ready"}), 200
+        
+    except Exception as e:
+        logger.error(f"Search influencers error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/influencers/export', methods=['GET'])
+@require_auth
+def export_influencers():
+    """Stream influencers as NDJSON or CSV
+
+    Accepts the same fields= and filter parameters as GET /api/influencers.
+    """
+    try:
+        args = request.args
+        try:
+            export_format, compress = parse_export_options(args)
+            columns = parse_influencer_fields(args.get('fields'))
+            client_ids = resolve_client_scope(args)
+            # Surface filter errors before the response starts streaming
+            apply_influencer_filters(db.table('influencers').select(columns), args, client_ids)
+        except PermissionError as e:
+            return jsonify({"error": str(e)}), 403
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        if client_ids is not None and not client_ids:
+            pages = iter([])
+        else:
+            build_query = lambda: apply_influencer_filters(
+                db.table('influencers').select(columns), args, client_ids
+            )
+            pages = iter_pages(build_query, EXPORT_PAGE_SIZE)
+
+        return export_response(pages, export_format, compress, 'influencers')
+        
+    except Exception as e:
+        logger.error(f"Export influencers error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+# Fields PUT and PATCH may change; influencers cannot be moved between clients
+INFLUENCER_UPDATABLE_FIELDS = [
+    'name', 'business_email', 'instagram_followers', 'tiktok_followers',
+    'average_views', 'engagement_rate', 'instagram_url', 'tiktok_url', 'notes', 'submitted'
+]
+INFLUENCER_METRIC_FIELDS = {
+    'instagram_followers': int, 'tiktok_followers': int, 'average_views': int, 'engagement_rate': float
+}
+
+def build_influencer_changes(changes):
+    """Pick the updatable fields out of changes, coercing them as build_influencer_row does"""
+    update_data = {field: changes[field] for field in INFLUENCER_UPDATABLE_FIELDS if field in changes}
+    for field in ('name', 'business_email'):
+        if field in update_data and not update_data[field]:
+            raise ValueError(f"{field} cannot be empty")
+    try:
+        for field, cast in INFLUENCER_METRIC_FIELDS.items():
+            if field in update_data:
+                update_data[field] = to_number(update_data[field], cast)
+    except (TypeError, ValueError):
+        raise ValueError("Follower, view and engagement values must be numeric")
+    return update_data
+
+@app.route('/api/influencers/<int:influencer_id>/metrics', methods=['GET'])
+@require_auth
+def get_influencer_metrics(influencer_id):
+    """Daily metric snapshots recorded by the refresh worker, oldest first (?days=, default 90)"""
+    try:
+        try:
+            days = parse_int_param(request.args, 'days') or 90
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        since = (datetime.now(timezone.utc).date() - timedelta(days=max(1, min(days, 3650)))).isoformat()
+
+        # The primary key (influencer_id, captured_on) serves this as one range read
+        snapshots_query = db.table('influencer_metric_snapshots').select(
+            'captured_on, instagram_followers, tiktok_followers, average_views, engagement_rate'
+        ).eq('influencer_id', influencer_id).gte('captured_on', since).order('captured_on')
+        influencer_response, snapshots_response = fan_out(
+            lambda: db.table('influencers').select('client_id').eq('id', influencer_id).execute(),
+            snapshots_query.execute
+        )
+        if not influencer_response.data:
+            return jsonify({"error": "Influencer not found"}), 404
+        if not has_client_access(influencer_response.data[0]['client_id']):
+            return jsonify({"error": "Access denied"}), 403
+
+        return jsonify({"influencer_id": influencer_id, "snapshots": snapshots_response.data}), 200
+
+    except Exception as e:
+        logger.error(f"Get influencer metrics error: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/influencers/<int:influencer_id>', methods=['PUT'])
+@require_auth
 def update_influencer(influencer_id):
     """Update an influencer"""
     try:
-        auth_header = request.headers.get('Authorization')
-        user = get_user_from_token(auth_header)
-        
-        if not user:
-            return jsonify({"error": "Unauthorized"}), 401
-        
-        data = request.get_json()
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({"error": "Send the fields to update as a JSON object"}), 400
+        update_data = build_influencer_changes(data)
         
         # Check if user has permission to update this influencer
-        influencer_response = supabase_service.table('influencers').select('added_by_user_id').eq('id', influencer_id).execute()
+        influencer_response = db.table('influencers').select('added_by_user_id, client_id').eq('id', influencer_id).execute()
         if not influencer_response.data:
             return jsonify({"error": "Influencer not found"}), 404
         
         influencer = influencer_response.data[0]
-        profile_response = supabase_service.table('profiles').select('role').eq('user_id', user.id).execute()
-        is_admin = profile_response.data and profile_response.data[0].get('role') == 'admin'
-        
-        if not is_admin and influencer['added_by_user_id'] != user.id:
+        if not g.is_admin and influencer['added_by_user_id'] != g.user.id:
             return jsonify({"error": "Access denied"}), 403
         
         # Update influencer
-        update_data = {}
-        updatable_fields = ['name', 'business_email', 'instagram_followers', 'tiktok_followers', 
-                           'average_views', 'engagement_rate', 'instagram_url', 'tiktok_url', 'notes', 'submitted']
-        
-        for field in updatable_fields:
-            if field in data:
-                update_data[field] = data[field]
-        
         if update_data:
-            response = supabase_service.table('influencers').update(update_data).eq('id', influencer_id).execute()
+            response = db.table('influencers').update(update_data).eq('id', influencer_id).execute()
+            influencer_index.add(response.data[0])
+            client_leaderboards.add(response.data[0])
+            invalidate_client_stats([influencer['client_id']])
+            bump_versions('influencers')
+            change_hub.publish('influencers', 'UPDATE', response.data[0], client_id=influencer['client_id'])
             return jsonify({"influencer": response.data[0]}), 200
         else:
             return jsonify({"error": "No valid fields to update"}), 400
         
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Update influencer error: {e}")
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/influencers/<int:influencer_id>', methods=['DELETE'])
+@require_auth
 def delete_influencer(influencer_id):
     """Delete an influencer"""
     try:
-        auth_header = request.headers.get('Authorization')
-        user = get_user_from_token(auth_header)
-        
-        if not user:
-            return jsonify({"error": "Unauthorized"}), 401
-        
         # Check if user has permission to delete this influencer
-        influencer_response = supabase_service.table('influencers').select('added_by_user_id').eq('id', influencer_id).execute()
+        influencer_response = db.table('influencers').select('added_by_user_id, client_id').eq('id', influencer_id).execute()
         if not influencer_response.data:
             return jsonify({"error": "Influencer not found"}), 404
         
         influencer = influencer_response.data[0]
-        profile_response = supabase_service.table('profiles').select('role').eq('user_id', user.id).execute()
-        is_admin = profile_response.data and profile_response.data[0].get('role') == 'admin'
-        
-        if not is_admin and influencer['added_by_user_id'] != user.id:
+        if not g.is_admin and influencer['added_by_user_id'] != g.user.id:
             return jsonify({"error": "Access denied"}), 403
         
         # Delete influencer
-        supabase_service.table('influencers').delete().eq('id', influencer_id).execute()
+        db.table('influencers').delete().eq('id', influencer_id).execute()
+        influencer_index.remove(influencer_id)
+        client_leaderboards.remove(influencer_id)
+        invalidate_client_stats([influencer['client_id']])
+        bump_versions('influencers')
+        change_hub.publish(
+            'influencers', 'DELETE', None,
+            old_record={"id": influencer_id, "client_id": influencer['client_id']},
+            client_id=influencer['client_id']
+        )
         return jsonify({"message": "Influencer deleted successfully"}), 200
         
     except Exception as e:
         logger.error(f"Delete influencer error: {e}")
         return jsonify({"error": str(e)}), 500
 
+def parse_influencer_id(value):
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"Invalid influencer id: {value!r}")
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Invalid influencer id: {value!r}")
+
+def chunked(items, size):
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+def load_writable_influencers(influencer_ids):
+    """Look up influencers with one in_ query per chunk.
+
+    Returns ({id: row} the caller may change, {id: outcome} for IDs that are
+    missing or belong to someone else).
+    """
+    responses = fan_out(*[
+        lambda chunk=chunk: db.table('influencers').select('id, added_by_user_id, client_id').in_('id', chunk).execute()
+        for chunk in chunked(influencer_ids, BULK_WRITE_CHUNK_SIZE)
+    ])
+    found = {row['id']: row for response in responses for row in response.data}
+
+    writable, outcomes = {}, {}
+    for influencer_id in influencer_ids:
+        row = found.get(influencer_id)
+        if row is None:
+            outcomes[influencer_id] = {"id": influencer_id, "status": "not_found"}
+        elif not g.is_admin and row['added_by_user_id'] != g.user.id:
+            outcomes[influencer_id] = {"id": influencer_id, "status": "forbidden"}
+        else:
+            writable[influencer_id] = row
+    return writable, outcomes
+
+def run_bulk_writes(writes):
+    """Execute (ids, query) statements concurrently; returns ({id: returned row}, {id: error})"""
+    def run(ids, query):
+        try:
+            return ids, query.execute().data, None
+        except Exception as e:
+            logger.warning(f"Bulk influencer write failed for {len(ids)} rows: {e}")
+            return ids, [], str(e)
+
+    rows, errors = {}, {}
+    for ids, data, error in fan_out(*[lambda ids=ids, query=query: run(ids, query) for ids, query in writes]):
+        for row in data:
+            rows[row['id']] = row
+        if error:
+            errors.update({influencer_id: error for influencer_id in ids})
+    return rows, errors
+
+def collect_outcomes(influencer_ids, outcomes, rows, errors, status):
+    """Per-ID results in request order"""
+    results = []
+    for influencer_id in influencer_ids:
+        if influencer_id in outcomes:
+            results.append(outcomes[influencer_id])
+        elif influencer_id in rows:
+            results.append({"id": influencer_id, "status": status})
+        elif influencer_id in errors:
+            results.append({"id": influencer_id, "status": "error", "error": errors[influencer_id]})
+        else:
+            # Removed by someone else between the lookup and the write
+            results.append({"id": influencer_id, "status": "not_found"})
+    return results
+
+@app.route('/api/influencers', methods=['PATCH'])
+@require_auth
+def bulk_update_influencers():
+    """Update many influencers at once
+
+    Takes {"ids": [...], "changes": {...}} to apply the same changes to every
+    ID, or {"updates": {"<id>": {...}, ...}} for changes per ID. IDs sharing
+    the same changes are written together in chunks of BULK_WRITE_CHUNK_SIZE.
+    Every ID gets an outcome: updated, not_found, forbidden, invalid or error.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return jsonify({"error": "Send ids with changes, or updates"}), 400
+        changes_by_id = {}
+        if 'updates' in data:
+            if not isinstance(data['updates'], dict):
+                return jsonify({"error": "updates must map influencer IDs to changes"}), 400
+            for key, changes in data['updates'].items():
+                changes_by_id[parse_influencer_id(key)] = changes
+        else:
+            ids = data.get('ids')
+            if not isinstance(ids, list):
+                return jsonify({"error": "Send ids with changes, or updates"}), 400
+            for value in ids:
+                changes_by_id[parse_influencer_id(value)] = data.get('changes')
+
+        influencer_ids = list(changes_by_id)
+        if not influencer_ids:
+            return jsonify({"error": "No influencer IDs given"}), 400
+        if len(influencer_ids) > BULK_WRITE_MAX_IDS:
+            return jsonify({"error": f"Bulk updates are limited to {BULK_WRITE_MAX_IDS} influencers"}), 400
+
+        outcomes = {}
+        groups = {}
+        for influencer_id, changes in changes_by_id.items():
+            try:
+                update_data = build_influencer_changes(changes) if isinstance(changes, dict) else {}
+            except ValueError as e:
+                outcomes[influencer_id] = {"id": influencer_id, "status": "invalid", "error": str(e)}
+                continue
+            if not update_data:
+                outcomes[influencer_id] = {"id": influencer_id, "status": "invalid", "error": "No valid fields to update"}
+                continue
+            key = json.dumps(update_data, sort_keys=True, default=str)
+            groups.setdefault(key, (update_data, []))[1].append(influencer_id)
+
+        writable, denied = load_writable_influencers([
+            influencer_id for influencer_id in influencer_ids if influencer_id not in outcomes
+        ])
+        outcomes.update(denied)
+
+        writes = []
+        for update_data, ids in groups.values():
+            ids = [influencer_id for influencer_id in ids if influencer_id in writable]
+            for chunk in chunked(ids, BULK_WRITE_CHUNK_SIZE):
+                writes.append((chunk, db.table('influencers').update(update_data).in_('id', chunk)))
+        rows, errors = run_bulk_writes(writes)
+
+        if rows:
+            for row in rows.values():
+                influencer_index.add(row)
+                client_leaderboards.add(row)
+            invalidate_client_stats({row['client_id'] for row in rows.values()})
+            bump_versions('influencers')
+            for row in rows.values():
+                change_hub.publish('influencers', 'UPDATE', row, client_id=row['client_id'])
+
+        # Per-ID failures are reported in results; only malformed requests get a 400
+        return jsonify({
+            "updated": len(rows),
+            "results": collect_outcomes(influencer_ids, outcomes, rows, errors, 'updated'),
+            "influencers": [rows[influencer_id] for influencer_id in influencer_ids if influencer_id in rows]
+        }), 200
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Bulk update influencers error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/influencers', methods=['DELETE'])
+@require_auth
+def bulk_delete_influencers():
+    """Delete many influencers from {"ids": [...]}, reporting deleted, not_found, forbidden or error per ID"""
+    try:
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict) or not isinstance(data.get('ids'), list) or not data['ids']:
+            return jsonify({"error": "ids must be a non-empty list"}), 400
+        influencer_ids = list(dict.fromkeys(parse_influencer_id(value) for value in data['ids']))
+        if len(influencer_ids) > BULK_WRITE_MAX_IDS:
+            return jsonify({"error": f"Bulk deletes are limited to {BULK_WRITE_MAX_IDS} influencers"}), 400
+
+        writable, outcomes = load_writable_influencers(influencer_ids)
+        rows, errors = run_bulk_writes([
+            (chunk, db.table('influencers').delete().in_('id', chunk))
+            for chunk in chunked([influencer_id for influencer_id in influencer_ids if influencer_id in writable], BULK_WRITE_CHUNK_SIZE)
+        ])
+
+        if rows:
+            for influencer_id in rows:
+                influencer_index.remove(influencer_id)
+                client_leaderboards.remove(influencer_id)
+            invalidate_client_stats({row['client_id'] for row in rows.values()})
+            bump_versions('influencers')
+            for influencer_id, row in rows.items():
+                change_hub.publish(
+                    'influencers', 'DELETE', None,
+                    old_record={"id": influencer_id, "client_id": row['client_id']},
+                    client_id=row['client_id']
+                )
+
+        return jsonify({
+            "deleted": len(rows),
+            "results": collect_outcomes(influencer_ids, outcomes, rows, errors, 'deleted')
+        }), 200
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Bulk delete influencers error: {e}")
+        return jsonify({"error": str(e)}), 500
+
 # Submissions endpoints
+# Completed submission responses keyed by (user id, Idempotency-Key)
+idempotency_cache = TTLCache(maxsize=IDEMPOTENCY_CACHE_SIZE, ttl=IDEMPOTENCY_CACHE_TTL)
+idempotency_in_flight = set()
+idempotency_lock = threading.Lock()
+submission_rpc_available = {"value": USE_SUBMISSION_RPC}
+
+class IdempotencyKeyReused(Exception):
+    """The Idempotency-Key already belongs to a submission made with a different body"""
+
+def submit_influencers_rpc(user_id, influencer_ids, notes, client_ids, idempotency_key, fingerprint):
+    """Create the submission in one transaction via the create_submission function"""
+    try:
+        response = db.rpc('create_submission', {
+            "p_user_id": user_id,
+            "p_influencer_ids": influencer_ids,
+            "p_notes": notes,
+            "p_client_ids": client_ids,
+            "p_idempotency_key": idempotency_key,
+            "p_fingerprint": fingerprint
+        }).execute()
+    except APIError as e:
+        if 'influencer_access_denied' in (e.message or ''):
+            raise PermissionError("Access denied for one or more influencers")
+        if 'idempotency_key_reused' in (e.message or ''):
+            raise IdempotencyKeyReused()
+        raise
+    return response.data['submission'], response.data['influencers']
+
+def find_idempotent_submission(user_id, idempotency_key, fingerprint):
+    """The submission already made with this key, or None; raises IdempotencyKeyReused on a different body"""
+    existing = db.table('submissions').select('*').eq('submitted_by_user_id', user_id).eq(
+        'idempotency_key', idempotency_key
+    ).execute().data
+    if existing and existing[0].get('idempotency_fingerprint') != fingerprint:
+        raise IdempotencyKeyReused()
+    return existing[0] if existing else None
+
+def submit_influencers_fallback(user_id, influencer_ids, notes, client_ids, idempotency_key, fingerprint):
+    """Create the submission with separate writes, undoing them if a later write fails"""
+    if idempotency_key:
+        existing = find_idempotent_submission(user_id, idempotency_key, fingerprint)
+        if existing:
+            return existing, []
+
+    # Check the influencers exist and, for non-admins, belong to the caller's
+    # clients and were added by the caller
+    query = db.table('influencers').select('id, client_id').in_('id', influencer_ids)
+    if client_ids is not None:
+        query = query.in_('client_id', client_ids).eq('added_by_user_id', user_id)
+    owned = query.execute().data
+    if len(owned) != len(influencer_ids):
+        raise PermissionError("Access denied for one or more influencers")
+
+    submission_data = {
+        "submitted_by_user_id": user_id,
+        "influencer_count": len(influencer_ids),
+        "notes": notes,
+        "idempotency_key": idempotency_key,
+        "idempotency_fingerprint": fingerprint if idempotency_key else None
+    }
+    try:
+        submission = db.table('submissions').insert(submission_data).execute().data[0]
+    except APIError as e:
+        # 23505: a concurrent request with the same key inserted first
+        if e.code != '23505' or not idempotency_key:
+            raise
+        existing = find_idempotent_submission(user_id, idempotency_key, fingerprint)
+        if existing is None:
+            raise
+        return existing, []
+
+    try:
+        submission_items = [
+            {"submission_id": submission['id'], "influencer_id": influencer_id}
+            for influencer_id in influencer_ids
+        ]
+        db.table('submission_items').insert(submission_items).execute()
+        db.table('influencers').update({"submitted": True}).in_('id', influencer_ids).execute()
+    except Exception:
+        db.table('submission_items').delete().eq('submission_id', submission['id']).execute()
+        db.table('submissions').delete().eq('id', submission['id']).execute()
+        raise
+
+    return submission, owned
+
+def submit_influencers(user_id, influencer_ids, notes, client_ids, idempotency_key, fingerprint):
+    """Create a submission, preferring the single-round-trip RPC when it is installed"""
+    if submission_rpc_available["value"]:
+        try:
+            return submit_influencers_rpc(user_id, influencer_ids, notes, client_ids, idempotency_key, fingerprint)
+        except APIError as e:
+            # PGRST202: the function has not been created in this database
+            if e.code != 'PGRST202':
+                raise
+            logger.warning("create_submission RPC not installed; using multi-write fallback")
+            submission_rpc_available["value"] = False
+    return submit_influencers_fallback(user_id, influencer_ids, notes, client_ids, idempotency_key, fingerprint)
+
 @app.route('/api/submissions', methods=['POST'])
+@require_auth
 def create_submission():
-    """Submit influencers"""
+    """Submit influencers
+
+    An Idempotency-Key header makes retries safe: a repeated key returns the
+    original response instead of creating another submission.
+    """
     try:
-        auth_header = request.headers.get('Authorization')
-        user = get_user_from_token(auth_header)
-        
-        if not user:
-            return jsonify({"error": "Unauthorized"}), 401
-        
         data = request.get_json()
         influencer_ids = data.get('influencer_ids', [])
         notes = data.get('notes', '')
         
         if not influencer_ids:
             return jsonify({"error": "At least one influencer ID is required"}), 400
-        
-        # Create submission record
-        submission_data = {
-            "submitted_by_user_id": user.id,
-            "influencer_count": len(influencer_ids),
-            "notes": notes
-        }
-        
-        submission_response = supabase_service.table('submissions').insert(submission_data).execute()
-        submission = submission_response.data[0]
-        
-        # Create submission items
-        submission_items = []
-        for influencer_id in influencer_ids:
-            submission_items.append({
-                "submission_id": submission['id'],
-                "influencer_id": influencer_id
-            })
-        
-        supabase_service.table('submission_items').insert(submission_items).execute()
-        
-        # Mark influencers as submitted
-        supabase_service.table('influencers').update({"submitted": True}).in_('id', influencer_ids).execute()
-        
-        return jsonify({"submission": submission}), 201
+
+        try:
+            influencer_ids = sorted({parse_influencer_id(influencer_id) for influencer_id in influencer_ids})
+        except (TypeError, ValueError):
+            return jsonify({"error": "Influencer IDs must be integers"}), 400
+
+        idempotency_key = request.headers.get('Idempotency-Key')
+        fingerprint = hashlib.sha256(json.dumps([influencer_ids, notes]).encode()).hexdigest()
+        cache_key = (g.user.id, idempotency_key)
+
+        if idempotency_key:
+            # The cache answers repeats this worker has seen; the stored
+            # fingerprint catches the rest (other workers, evicted entries)
+            with idempotency_lock:
+                cached = idempotency_cache.get(cache_key)
+                if cached is None:
+                    if cache_key in idempotency_in_flight:
+                        return jsonify({"error": "A request with this Idempotency-Key is in progress"}), 409
+                    idempotency_in_flight.add(cache_key)
+            if cached is not None:
+                if cached['fingerprint'] != fingerprint:
+                    return jsonify({"error": "Idempotency-Key was already used with a different request"}), 422
+                return jsonify(cached['body']), cached['status']
+
+        try:
+            client_ids = None if g.is_admin else list(g.client_ids)
+            try:
+                submission, submitted_influencers = submit_influencers(
+                    g.user.id, influencer_ids, notes, client_ids, idempotency_key, fingerprint
+                )
+            except PermissionError as e:
+                return jsonify({"error": str(e)}), 403
+            except IdempotencyKeyReused:
+                return jsonify({"error": "Idempotency-Key was already used with a different request"}), 422
+
+            invalidate_client_stats({row['client_id'] for row in submitted_influencers})
+            bump_versions('influencers', 'submissions')
+            change_hub.publish('submissions', 'INSERT', submission, user_id=g.user.id)
+            for row in submitted_influencers:
+                change_hub.publish('influencers', 'UPDATE', {**row, "submitted": True}, client_id=row['client_id'])
+            body = {"submission": submission}
+            if idempotency_key:
+                idempotency_cache.set(cache_key, {"fingerprint": fingerprint, "body": body, "status": 201})
+            return jsonify(body), 201
+        finally:
+            if idempotency_key:
+                with idempotency_lock:
+                    idempotency_in_flight.discard(cache_key)
         
     except Exception as e:
         logger.error(f"Create submission error: {e}")
         return jsonify({"error": str(e)}), 500
 
+SUBMISSION_ITEM_COLUMNS = 'id, submission_id, influencer_id, influencers(*)'
+
+def load_submission_items(submission_ids):
+    """Items of the given submissions with their influencers in one query, as {submission_id: [item]}"""
+    items = {submission_id: [] for submission_id in submission_ids}
+    if not submission_ids:
+        return items
+    rows = db.table('submission_items').select(SUBMISSION_ITEM_COLUMNS).in_(
+        'submission_id', list(submission_ids)
+    ).order('id').execute().data
+    for row in rows:
+        items[row['submission_id']].append({
+            "id": row['id'],
+            "influencer_id": row['influencer_id'],
+            "influencer": row['influencers']
+        })
+    return items
+
+def submissions_query():
+    """Submissions the caller may see: all for admins, their own for everyone else"""
+    query = db.table('submissions').select('*, profiles(full_name)')
+    if not g.is_admin:
+        query = query.eq('submitted_by_user_id', g.user.id)
+    return query
+
 @app.route('/api/submissions', methods=['GET'])
+@require_auth
 def get_submissions():
-    """Get submissions"""
+    """Get submissions
+
+    include=items adds each submission's items with their influencer rows and
+    paginates newest first via limit= and cursor= (next_cursor is returned
+    while rows remain); limit/cursor also paginate the plain list.
+    """
     try:
-        auth_header = request.headers.get('Authorization')
-        user = get_user_from_token(auth_header)
-        
-        if not user:
-            return jsonify({"error": "Unauthorized"}), 401
-        
-        # Check if user is admin
-        profile_response = supabase_service.table('profiles').select('role').eq('user_id', user.id).execute()
-        is_admin = profile_response.data and profile_response.data[0].get('role') == 'admin'
-        
-        if is_admin:
-            # Admin can see all submissions
-            response = supabase_service.table('submissions').select('*, profiles(full_name)').execute()
-        else:
-            # Regular users can only see their own submissions
-            response = supabase_service.table('submissions').select('*, profiles(full_name)').eq('submitted_by_user_id', user.id).execute()
+        includes = {part.strip() for part in request.args.get('include', '').split(',') if part.strip()}
+        if includes - {'items'}:
+            return jsonify({"error": f"Unknown include: {', '.join(sorted(includes - {'items'}))}"}), 400
+        try:
+            limit = parse_int_param(request.args, 'limit')
+            after_id = decode_cursor(request.args['cursor']) if request.args.get('cursor') else None
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        if includes:
+            return list_submissions_with_items(limit=limit, after_id=after_id)
+        return list_submissions(limit=limit, after_id=after_id)
         
+    except Exception as e:
+        logger.error(f"Get submissions error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@cached_get('submissions', 'profiles')
+def list_submissions(limit, after_id):
+    if limit is None and after_id is None:
+        response = submissions_query().execute()
         return jsonify({"submissions": response.data}), 200
+
+    rows, next_cursor = fetch_submissions_page(limit, after_id)
+    return jsonify({"submissions": rows, "next_cursor": next_cursor}), 200
+
+# Influencer edits change the embedded rows, so they invalidate these responses too
+@cached_get('submissions', 'profiles', 'influencers')
+def list_submissions_with_items(limit, after_id):
+    rows, next_cursor = fetch_submissions_page(limit, after_id)
+    # One batched join for the whole page rather than one query per submission
+    items = load_submission_items([row['id'] for row in rows])
+    for row in rows:
+        row['items'] = items[row['id']]
+    return jsonify({"submissions": rows, "next_cursor": next_cursor}), 200
+
+def fetch_submissions_page(limit, after_id):
+    """One page of visible submissions, newest first, and the cursor of the next page or None"""
+    limit = max(1, min(limit or SUBMISSION_PAGE_SIZE_MAX, SUBMISSION_PAGE_SIZE_MAX))
+    query = submissions_query()
+    if after_id is not None:
+        query = query.lt('id', after_id)
+
+    # Fetch one extra row to learn whether another page exists
+    response = query.order('id', desc=True).limit(limit + 1).execute()
+    rows = response.data[:limit]
+    next_cursor = encode_cursor(rows[-1]['id']) if len(response.data) > limit else None
+    return rows, next_cursor
+
+@app.route('/api/submissions/<int:submission_id>', methods=['GET'])
+@require_auth
+@cached_get('submissions', 'profiles', 'influencers')
+def get_submission(submission_id):
+    """Get one submission with its items and their influencers"""
+    try:
+        submission_response, items = fan_out(
+            submissions_query().eq('id', submission_id).execute,
+            lambda: load_submission_items([submission_id])
+        )
+        # Non-admins only find their own submissions; answer 404 either way
+        if not submission_response.data:
+            return jsonify({"error": "Submission not found"}), 404
+
+        submission = submission_response.data[0]
+        submission['items'] = items[submission_id]
+        return jsonify({"submission": submission}), 200
+
+    except Exception as e:
+        logger.error(f"Get submission error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/submissions/export', methods=['GET'])
+@require_auth
+def export_submissions():
+    """Stream submissions as NDJSON or CSV"""
+    try:
+        try:
+            export_format, compress = parse_export_options(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        is_admin = g.is_admin
+        user_id = g.user.id
+
+        def build_query():
+            query = db.table('submissions').select('*, profiles(full_name)')
+            # Regular users can only export their own submissions
+            return query if is_admin else query.eq('submitted_by_user_id', user_id)
+
+        return export_response(iter_pages(build_query, EXPORT_PAGE_SIZE), export_format, compress, 'submissions')
         
     except Exception as e:
-        logger.error(f"Get submissions error: {e}")
+        logger.error(f"Export submissions error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+# Stats endpoints
+FOLLOWER_RANGES = [
+    ('0-10K', 0, 10000),
+    ('10K-50K', 10000, 50000),
+    ('50K-100K', 50000, 100000),
+    ('100K-500K', 100000, 500000),
+    ('500K+', 500000, float('inf'))
+]
+ENGAGEMENT_RANGES = [
+    ('0-1%', 0, 1),
+    ('1-3%', 1, 3),
+    ('3-5%', 3, 5),
+    ('5-10%', 5, 10),
+    ('10%+', 10, float('inf'))
+]
+STATS_COLUMNS = 'id, client_id, instagram_followers, tiktok_followers, average_views, engagement_rate, submitted, date_added'
+
+# Per-client aggregates keyed by ('client', id), plus composed responses keyed
+# by ('scope', role, client IDs, version). Writes drop only the affected
+# clients' aggregates and bump the version so composed responses are rebuilt
+# from the remaining cached aggregates.
+stats_cache = TTLCache(maxsize=STATS_CACHE_SIZE, ttl=STATS_CACHE_TTL)
+stats_version = {"value": 0}
+stats_lock = threading.Lock()
+
+def invalidate_client_stats(client_ids, client_list_changed=False):
+    """Drop cached aggregates for the given clients after a write"""
+    with stats_lock:
+        for client_id in client_ids:
+            stats_cache.delete(('client', str(client_id)))
+        if client_list_changed:
+            stats_cache.delete(('clients',))
+        stats_version["value"] += 1
+
+def empty_client_stats():
+    return {
+        "total": 0,
+        "submitted": 0,
+        "instagram_followers": 0,
+        "tiktok_followers": 0,
+        "average_views": 0,
+        "engagement_rate": 0.0,
+        "daily": {},
+        "follower_ranges": [0] * len(FOLLOWER_RANGES),
+        "engagement_ranges": [0] * len(ENGAGEMENT_RANGES)
+    }
+
+def bucket_index(ranges, value):
+    for index, (_, low, high) in enumerate(ranges):
+        if low <= value < high:
+            return index
+    return None
+
+def accumulate_stats(stats, row):
+    """Fold one influencer row into a client's aggregate"""
+    instagram_followers = row.get('instagram_followers') or 0
+    engagement_rate = float(row.get('engagement_rate') or 0)
+
+    stats["total"] += 1
+    stats["submitted"] += 1 if row.get('submitted') else 0
+    stats["instagram_followers"] += instagram_followers
+    stats["tiktok_followers"] += row.get('tiktok_followers') or 0
+    stats["average_views"] += row.get('average_views') or 0
+    stats["engagement_rate"] += engagement_rate
+
+    if row.get('date_added'):
+        day = str(row['date_added'])[:10]
+        stats["daily"][day] = stats["daily"].get(day, 0) + 1
+
+    follower_index = bucket_index(FOLLOWER_RANGES, instagram_followers)
+    if follower_index is not None:
+        stats["follower_ranges"][follower_index] += 1
+    engagement_index = bucket_index(ENGAGEMENT_RANGES, engagement_rate)
+    if engagement_index is not None:
+        stats["engagement_ranges"][engagement_index] += 1
+
+def load_client_stats(client_ids):
+    """Return aggregates for each client, computing only the ones not cached"""
+    version = stats_version["value"]
+    result = {}
+    missing = []
+    for client_id in client_ids:
+        cached = stats_cache.get(('client', str(client_id)))
+        if cached is None:
+            missing.append(str(client_id))
+        else:
+            result[str(client_id)] = cached
+
+    if missing:
+        computed = {client_id: empty_client_stats() for client_id in missing}
+        build_query = lambda: db.table('influencers').select(STATS_COLUMNS).in_('client_id', missing)
+        for rows in iter_pages(build_query):
+            for row in rows:
+                accumulate_stats(computed[str(row['client_id'])], row)
+        # Don't cache aggregates that a concurrent write may have invalidated
+        with stats_lock:
+            if version == stats_version["value"]:
+                for client_id, stats in computed.items():
+                    stats_cache.set(('client', client_id), stats)
+        result.update(computed)
+
+    return result
+
+def list_clients():
+    clients = stats_cache.get(('clients',))
+    if clients is None:
+        clients = db.table('clients').select('id, name').execute().data
+        stats_cache.set(('clients',), clients)
+    return clients
+
+def average(total, count, digits=0):
+    if not count:
+        return 0
+    value = round(total / count, digits)
+    return int(value) if digits == 0 else value
+
+def build_stats(client_ids, days):
+    """Compose dashboard statistics for a set of clients from per-client aggregates"""
+    clients = [client for client in list_clients() if client_ids is None or str(client['id']) in client_ids]
+    per_client = load_client_stats([client['id'] for client in clients])
+
+    combined = empty_client_stats()
+    client_rows = []
+    for client in clients:
+        stats = per_client[str(client['id'])]
+        for key in ('total', 'submitted', 'instagram_followers', 'tiktok_followers', 'average_views', 'engagement_rate'):
+            combined[key] += stats[key]
+        for day, count in stats["daily"].items():
+            combined["daily"][day] = combined["daily"].get(day, 0) + count
+        for index, count in enumerate(stats["follower_ranges"]):
+            combined["follower_ranges"][index] += count
+        for index, count in enumerate(stats["engagement_ranges"]):
+            combined["engagement_ranges"][index] += count
+        client_rows.append({
+            "client_id": client['id'],
+            "name": client['name'],
+            "influencers": stats["total"],
+            "avg_followers": average(stats["instagram_followers"], stats["total"])
+        })
+
+    today = datetime.now(timezone.utc).date()
+    daily = []
+    for offset in range(days - 1, -1, -1):
+        day = (today - timedelta(days=offset)).isoformat()
+        daily.append({"date": day, "influencers": combined["daily"].get(day, 0)})
+
+    total = combined["total"]
+    return {
+        "totals": {
+            "clients": len(clients),
+            "influencers": total,
+            "submitted": combined["submitted"],
+            "new_today": combined["daily"].get(today.isoformat(), 0),
+            "avg_instagram_followers": average(combined["instagram_followers"], total),
+            "avg_tiktok_followers": average(combined["tiktok_followers"], total),
+            "avg_views": average(combined["average_views"], total),
+            "avg_engagement": average(combined["engagement_rate"], total, 2)
+        },
+        "clients": client_rows,
+        "daily": daily,
+        "follower_distribution": [
+            {"name": name, "count": count}
+            for (name, _, _), count in zip(FOLLOWER_RANGES, combined["follower_ranges"])
+        ],
+        "engagement_distribution": [
+            {"name": name, "count": count}
+            for (name, _, _), count in zip(ENGAGEMENT_RANGES, combined["engagement_ranges"])
+        ]
+    }
+
+def get_scoped_stats():
+    """Resolve scope from the request and return cached or freshly composed stats"""
+    days = parse_int_param(request.args, 'days') or 7
+    days = max(1, min(days, 90))
+    client_ids = resolve_client_scope(request.args)
+    if client_ids is not None:
+        client_ids = sorted(str(client_id) for client_id in client_ids)
+
+    # Non-admin totals include the caller's own submissions, so scope them per user
+    owner = None if g.is_admin else g.user.id
+    today = datetime.now(timezone.utc).date().isoformat()
+    scope_key = ('scope', g.role, owner, tuple(client_ids) if client_ids is not None else None, days, today, stats_version["value"])
+    stats = stats_cache.get(scope_key)
+    if stats is None:
+        submissions_query = db.table('submissions').select('id', count='exact', head=True)
+        if owner is not None:
+            submissions_query = submissions_query.eq('submitted_by_user_id', owner)
+        vas_query = db.table('profiles').select('user_id', count='exact', head=True).eq('role', 'va')
+
+        calls = [lambda: build_stats(client_ids, days), lambda: submissions_query.execute()]
+        if g.is_admin:
+            calls.append(lambda: vas_query.execute())
+        results = fan_out(*calls)
+
+        stats = results[0]
+        stats["totals"]["submissions"] = results[1].count or 0
+        if g.is_admin:
+            stats["totals"]["vas"] = results[2].count or 0
+        stats_cache.set(scope_key, stats)
+    return stats
+
+def stats_route(f):
+    """Shared auth, scope and error handling for the /api/stats family"""
+    @wraps(f)
+    @require_auth
+    def decorated(*args, **kwargs):
+        try:
+            stats = get_scoped_stats()
+        except PermissionError as e:
+            return jsonify({"error": str(e)}), 403
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        except Exception as e:
+            logger.error(f"Stats error: {e}")
+            return jsonify({"error": str(e)}), 500
+        return f(stats, *args, **kwargs)
+    return decorated
+
+@app.route('/api/stats', methods=['GET'])
+@stats_route
+def get_stats(stats):
+    """Get all dashboard statistics for the caller's scope"""
+    return jsonify({"stats": stats}), 200
+
+@app.route('/api/stats/overview', methods=['GET'])
+@stats_route
+def get_stats_overview(stats):
+    """Get dashboard totals"""
+    return jsonify({"totals": stats["totals"]}), 200
+
+@app.route('/api/stats/clients', methods=['GET'])
+@stats_route
+def get_stats_clients(stats):
+    """Get per-client influencer counts"""
+    return jsonify({"clients": stats["clients"]}), 200
+
+@app.route('/api/stats/timeseries', methods=['GET'])
+@stats_route
+def get_stats_timeseries(stats):
+    """Get daily influencer counts for the last ?days= days"""
+    return jsonify({"daily": stats["daily"]}), 200
+
+@app.route('/api/stats/distribution', methods=['GET'])
+@stats_route
+def get_stats_distribution(stats):
+    """Get follower and engagement histograms"""
+    return jsonify({
+        "follower_distribution": stats["follower_distribution"],
+        "engagement_distribution": stats["engagement_distribution"]
+    }), 200
+
+# Batch endpoint
+PRINCIPAL_FIELDS = ('user', 'profile', 'role', 'is_admin', 'client_ids')
+# Streaming and batch routes cannot be answered as a single JSON body
+BATCH_EXCLUDED_ENDPOINTS = {'batch_requests', 'realtime_stream', 'export_influencers', 'export_submissions', 'serve'}
+
+def run_batch_request(path, headers, principal):
+    """Dispatch one GET sub-request through the normal view stack with a pre-resolved principal"""
+    with app.test_request_context(path, method='GET', headers=headers):
+        for field, value in principal.items():
+            setattr(g, field, value)
+        endpoint = request.url_rule.endpoint if request.url_rule else None
+        if endpoint is None or endpoint in BATCH_EXCLUDED_ENDPOINTS:
+            return {"status": 404, "body": {"error": f"Unsupported batch path: {path.split('?')[0]}"}}
+
+        response = app.full_dispatch_request()
+        result = {"status": response.status_code, "body": response.get_json(silent=True)}
+        if response.headers.get('ETag'):
+            result["etag"] = response.headers['ETag']
+        return result
+
+@app.route('/api/batch', methods=['POST'])
+@require_auth
+def batch_requests():
+    """Run several GET requests in one round trip, authenticating once
+
+    Body: {"requests": [{"id": "influencers", "path": "/api/influencers?limit=50"}, ...]}.
+    Sub-requests run concurrently; each result carries its own status and
+    body, so one failing request does not fail the batch.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        sub_requests = data.get('requests')
+        if not isinstance(sub_requests, list) or not sub_requests:
+            return jsonify({"error": "requests must be a non-empty list"}), 400
+        if len(sub_requests) > BATCH_MAX_REQUESTS:
+            return jsonify({"error": f"At most {BATCH_MAX_REQUESTS} requests per batch"}), 400
+
+        for index, sub_request in enumerate(sub_requests):
+            if not isinstance(sub_request, dict) or not str(sub_request.get('path', '')).startswith('/api/'):
+                return jsonify({"error": f"Request {index} needs a path starting with /api/"}), 400
+            if sub_request.get('method', 'GET').upper() != 'GET':
+                return jsonify({"error": f"Request {index}: only GET requests can be batched"}), 400
+
+        headers = {"Authorization": request.headers.get('Authorization')}
+        principal = {field: getattr(g, field) for field in PRINCIPAL_FIELDS}
+        results = fan_out(*[
+            lambda path=sub_request['path']: run_batch_request(path, headers, principal)
+            for sub_request in sub_requests
+        ])
+
+        return jsonify({"responses": [
+            {"id": sub_request.get('id', index), **result}
+            for index, (sub_request, result) in enumerate(zip(sub_requests, results))
+        ]}), 200
+
+    except Exception as e:
+        logger.error(f"Batch error: {e}")
         return jsonify({"error": str(e)}), 500
 
+# Metrics endpoint
+metrics_registry.gauge(
+    'token_verifications_total', 'Bearer tokens checked, by how they were verified', ('result',),
+    lambda: {(result,): count for result, count in token_stats.items()}, kind='counter'
+)
+instrumented_caches = {
+    "token": lambda: token_cache,
+    "principal": lambda: principal_cache,
+    "response": lambda: response_cache,
+    "stats": lambda: stats_cache,
+    "idempotency": lambda: idempotency_cache,
+    "compressed": lambda: compressed_cache
+}
+metrics_registry.gauge(
+    'cache_hits_total', 'In-process cache hits', ('cache',),
+    lambda: {(name,): cache().stats()['hits'] for name, cache in instrumented_caches.items()}, kind='counter'
+)
+metrics_registry.gauge(
+    'cache_misses_total', 'In-process cache misses', ('cache',),
+    lambda: {(name,): cache().stats()['misses'] for name, cache in instrumented_caches.items()}, kind='counter'
+)
+metrics_registry.gauge(
+    'cache_entries', 'Entries currently held by each in-process cache', ('cache',),
+    lambda: {(name,): len(cache()) for name, cache in instrumented_caches.items()}
+)
+metrics_registry.gauge(
+    'search_index_documents', 'Influencers in the search index (absent until loaded)', (),
+    lambda: {(): len(influencer_index)} if influencer_index.ready else {}
+)
+metrics_registry.gauge(
+    'realtime_subscribers', 'Open /api/realtime streams', (),
+    lambda: {(): change_hub.subscriber_count()}
+)
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics for this worker process"""
+    if METRICS_TOKEN and request.headers.get('Authorization') != f"Bearer {METRICS_TOKEN}":
+        return jsonify({"error": "Unauthorized"}), 401
+    return Response(metrics_registry.render(), mimetype='text/plain; version=0.0.4')
+
+# Realtime endpoint
+change_hub = ChangeHub(
+    debounce=REALTIME_DEBOUNCE_SECONDS,
+    heartbeat=REALTIME_HEARTBEAT_SECONDS,
+    max_pending=REALTIME_MAX_PENDING,
+    max_subscribers=REALTIME_MAX_STREAMS
+)
+
+@app.route('/api/realtime', methods=['GET'])
+@allow_query_token
+@require_auth
+def realtime_stream():
+    """Stream coalesced changes visible to the current user as Server-Sent Events
+
+    Each 'changes' event carries a batch of {table, type, record, old_record}
+    entries. A 'resync' event means the client fell behind and should refetch.
+    Once REALTIME_MAX_STREAMS streams are open, new ones get a 503.
+    """
+    subscriber = change_hub.subscribe(g.user.id, g.is_admin, g.client_ids)
+    if subscriber is None:
+        admission_rejections.inc('realtime', request.url_rule.rule)
+        return refused("Too many open realtime streams; retry later", 503, 30)
+    return Response(
+        stream_with_context(change_hub.stream(subscriber)),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # Test endpoint
 @app.route('/api/test', methods=['GET'])
 def test_api():
     """Test API endpoint"""
     return jsonify({"message": "API is working!", "timestamp": datetime.now().isoformat()}), 200
 
+static_manifest = StaticManifest(STATIC_DIR if STATIC_MANIFEST_ENABLED else None, STATIC_MEMORY_MAX_BYTES)
+if STATIC_MANIFEST_ENABLED:
+    logger.info(f"Static manifest: {len(static_manifest)} files, {static_manifest.size} bytes in memory")
+
+def static_response(asset):
+    """Serve a manifest entry, precompressed when the client accepts it
+
+    Content-hashed bundles are cacheable forever; everything else (index.html
+    above all) is revalidated against its ETag on every load.
+    """
+    representation = asset.negotiate(request.accept_encodings)
+    if representation.body is not None:
+        response = Response(representation.body, mimetype=asset.mimetype)
+    else:
+        response = send_file(representation.filename, mimetype=asset.mimetype, conditional=False, etag=False)
+    # compress_response suffixes the ETag of files compressed per response
+    response.set_etag(matching_etag(representation.etag) or representation.etag)
+    response.headers['Last-Modified'] = representation.last_modified
+    if representation.encoding:
+        response.headers['Content-Encoding'] = representation.encoding
+    if len(asset.representations) > 1:
+        response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable' if asset.immutable else 'no-cache'
+    return response.make_conditional(request, accept_ranges=True, complete_length=representation.size)
+
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve(path):
+    if STATIC_MANIFEST_ENABLED:
+        # Unknown paths are client-side routes of the single-page app
+        asset = static_manifest.lookup(path) or static_manifest.lookup('index.html')
+        if asset is None:
+            return "index.html not found", 404
+        return static_response(asset)
+
     static_folder_path = app.static_folder
     if static_folder_path is None:
             return "Static folder not configured", 404
@@ -566,6 +2497,7 @@ def serve(path):
 
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # Development server only; see gunicorn.conf.py and asgi.py for production
+    app.run(host='0.0.0.0', port=int(os.getenv("PORT", "5000")), debug=os.getenv("FLASK_DEBUG", "true").lower() == "true")
 
 
@@ -0,0 +1,252 @@
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+# Seconds; covers cache hits through slow exports
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Timings of the request being served, visible to upstream calls made on its behalf
+current_request = ContextVar('current_request', default=None)
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(names, values):
+    if not names:
+        return ''
+    pairs = ','.join(
+        f'{name}="{escape_label(value)}"' for name, value in zip(names, values)
+    )
+    return '{' + pairs + '}'
+
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, self.labelnames, labels, value) for labels, value in sorted(self._values.items())]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels, in Prometheus exposition order"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["buckets"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def samples(self):
+        samples = []
+        bucket_labels = self.labelnames + ('le',)
+        with self._lock:
+            for labels, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series["buckets"]):
+                    samples.append((f'{self.name}_bucket', bucket_labels, labels + (repr(bound),), count))
+                samples.append((f'{self.name}_bucket', bucket_labels, labels + ('+Inf',), series["count"]))
+                samples.append((f'{self.name}_sum', self.labelnames, labels, series["sum"]))
+                samples.append((f'{self.name}_count', self.labelnames, labels, series["count"]))
+        return samples
+
+
+class Gauge:
+    """Values read from a callback at scrape time, as {labelvalues: value}"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, help_text, labelnames, collect, kind='gauge'):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+        self.kind = kind
+
+    def samples(self):
+        return [(self.name, self.labelnames, labels, value) for labels, value in sorted(self.collect().items())]
+
+
+class MetricsRegistry:
+    """Holds metrics and renders them in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def gauge(self, name, help_text, labelnames, collect, kind='gauge'):
+        """Register a metric computed at scrape time; kind='counter' for running totals kept elsewhere"""
+        return self._register(Gauge(name, help_text, labelnames, collect, kind))
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labelnames, labelvalues, value in metric.samples():
+                lines.append(f'{name}{format_labels(labelnames, labelvalues)} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+class RequestTimings:
+    """Spans and upstream calls recorded while serving one request"""
+
+    def __init__(self, route, method):
+        self.route = route
+        self.method = method
+        self.started = time.perf_counter()
+        self.spans = []
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def add_span(self, name, seconds):
+        with self._lock:
+            self.spans.append((name, seconds))
+
+    def add_call(self, table, operation, seconds, ok):
+        with self._lock:
+            self.calls.append((table, operation, seconds, ok))
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def span_totals(self):
+        totals = {}
+        with self._lock:
+            for name, seconds in self.spans:
+                totals[name] = totals.get(name, 0.0) + seconds
+        return totals
+
+    def server_timing(self):
+        """Server-Timing header value, in milliseconds"""
+        parts = [f'{name};dur={seconds * 1000:.1f}' for name, seconds in self.span_totals().items()]
+        with self._lock:
+            calls = list(self.calls)
+        if calls:
+            # Upstream calls may overlap, so this is their summed time, not wall time
+            upstream = sum(seconds for _, _, seconds, _ in calls)
+            parts.append(f'upstream;dur={upstream * 1000:.1f};desc="{len(calls)} calls"')
+        parts.append(f'total;dur={self.elapsed() * 1000:.1f}')
+        return ', '.join(parts)
+
+    def breakdown(self):
+        """One-line summary of spans and upstream calls for the slow request log"""
+        parts = [f'{name}={seconds * 1000:.1f}ms' for name, seconds in self.span_totals().items()]
+        with self._lock:
+            calls = list(self.calls)
+        for table, operation, seconds, ok in calls:
+            parts.append(f'{table}.{operation}={seconds * 1000:.1f}ms{"" if ok else "!"}')
+        return ' '.join(parts)
+
+
+@contextmanager
+def timed(name):
+    """Record the enclosed block as a named span of the current request"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = current_request.get()
+        if timings is not None:
+            timings.add_span(name, time.perf_counter() - started)
+
+
+# Builder methods that name the operation a query performs
+OPERATIONS = {'select', 'insert', 'upsert', 'update', 'delete'}
+
+
+class InstrumentedQuery:
+    """Wraps a query builder so execute() is timed and reported to the observer"""
+
+    def __init__(self, builder, table, operation, observer, gate=None):
+        self._builder = builder
+        self._table = table
+        self._operation = operation
+        self._observer = observer
+        self._gate = gate
+
+    def __getattr__(self, name):
+        attribute = getattr(self._builder, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            if name in OPERATIONS:
+                self._operation = name
+            result = attribute(*args, **kwargs)
+            if hasattr(result, 'execute'):
+                return InstrumentedQuery(result, self._table, self._operation, self._observer, self._gate)
+            return result
+        return call
+
+    def execute(self):
+        # The gate (e.g. a concurrency cap) is entered before timing starts, so waiting for it is not upstream time
+        with self._gate() if self._gate else nullcontext():
+            started = time.perf_counter()
+            ok = False
+            try:
+                result = self._builder.execute()
+                ok = True
+                return result
+            finally:
+                self._observer(self._table, self._operation, time.perf_counter() - started, ok)
+
+
+class InstrumentedClient:
+    """Wraps a Supabase client or data store so every table()/rpc() call is timed
+
+    gate, if given, is a context manager factory entered around each execute().
+    """
+
+    def __init__(self, client, observer, gate=None):
+        self._client = client
+        self._observer = observer
+        self._gate = gate
+
+    def table(self, name):
+        return InstrumentedQuery(self._client.table(name), name, 'select', self._observer, self._gate)
+
+    def rpc(self, name, params=None):
+        return InstrumentedQuery(self._client.rpc(name, params), 'rpc', name, self._observer, self._gate)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
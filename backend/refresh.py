@@ -0,0 +1,247 @@
+# Background refresh of influencer follower counts, views and engagement.
+# Run as its own process next to the API:
+#   METRICS_FETCHER=stub python refresh.py
+#
+# Jobs live in the metric_refresh_jobs table (sql/metrics_refresh.sql), so
+# the queue survives restarts and several refresh processes can share it.
+import os
+import sys
+import time
+import zlib
+import signal
+import random
+import logging
+import threading
+import importlib
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+
+from search import normalize_handle
+from admission import TokenBucket
+
+PLATFORMS = ('instagram', 'tiktok')
+
+logger = logging.getLogger(__name__)
+
+
+class FetchError(Exception):
+    """A failed fetch; retryable errors are retried with backoff, others wait for the next refresh"""
+
+    def __init__(self, message, retryable=True, retry_after=None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class MetricsFetcher:
+    """Source of platform metrics.
+
+    fetch() returns {"followers", "average_views", "engagement_rate"} for one
+    handle (missing keys leave the stored value alone) or raises FetchError.
+    It is called from several worker threads at once.
+    """
+
+    def fetch(self, platform, handle):
+        raise NotImplementedError
+
+
+class StubFetcher(MetricsFetcher):
+    """Local stand-in returning stable, slowly growing metrics derived from the handle"""
+
+    EPOCH = date(2026, 1, 1)
+
+    def __init__(self, latency_ms=0.0, failure_rate=0.0, seed=None):
+        self.latency_ms = latency_ms
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def fetch(self, platform, handle):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        if self.failure_rate:
+            with self._lock:
+                failed = self._random.random() < self.failure_rate
+            if failed:
+                raise FetchError(f"{platform} rate limited (stub)", retry_after=1)
+
+        profile = random.Random(zlib.crc32(f'{platform}:{handle}'.encode()))
+        base = profile.lognormvariate(9.5, 1.4)
+        daily_growth = profile.uniform(-0.001, 0.004)
+        followers = int(base * (1 + daily_growth) ** (date.today() - self.EPOCH).days)
+        return {
+            "followers": followers,
+            "average_views": int(followers * profile.uniform(0.05, 0.4)),
+            "engagement_rate": round(profile.uniform(0.5, 12.0), 2)
+        }
+
+
+def load_fetcher(spec):
+    """Build a fetcher from METRICS_FETCHER: 'stub' or 'package.module:ClassName'"""
+    if spec == 'stub':
+        return StubFetcher()
+    module_name, _, class_name = spec.partition(':')
+    if not class_name:
+        raise ValueError(f"METRICS_FETCHER must be 'stub' or 'module:ClassName', got {spec!r}")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+class MetricsRefresher:
+    """Claims due jobs in batches, fetches them on a thread pool and writes each batch back at once.
+
+    Calls to each platform go through its TokenBucket in limits, shared by all
+    threads. A retryable failure is retried after exponential backoff (or the
+    platform's Retry-After) until max_attempts, then parked until the next
+    regular refresh like a permanent failure.
+    """
+
+    def __init__(self, db, fetcher, limits, workers=4, batch_size=50, interval=86400, lease=300,
+                 max_attempts=5, backoff_base=60, backoff_max=3600, poll_interval=5.0):
+        self.db = db
+        self.fetcher = fetcher
+        self.limits = limits
+        self.batch_size = batch_size
+        self.interval = interval
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.poll_interval = poll_interval
+        self.stop = threading.Event()
+        self.stats = {"refreshed": 0, "retried": 0, "failed": 0}
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='refresh')
+        self._random = random.Random()
+
+    def backoff(self, attempts):
+        """Exponential delay with jitter, so retries of one batch spread out"""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** max(attempts - 1, 0))
+        return int(delay * self._random.uniform(0.5, 1.0))
+
+    def fetch_all(self, job):
+        """Fetch every platform the influencer has a handle on; returns (metrics, permanent errors)"""
+        metrics, errors = {}, []
+        for platform in PLATFORMS:
+            handle = normalize_handle(job.get(f'{platform}_url'))
+            if not handle:
+                continue
+            if not self.limits[platform].acquire(self.stop):
+                raise InterruptedError("Refresh stopped")
+            try:
+                metrics[platform] = self.fetcher.fetch(platform, handle)
+            except FetchError as e:
+                if e.retry_after:
+                    self.limits[platform].pause(e.retry_after)
+                if e.retryable:
+                    raise
+                errors.append(f"{platform}: {e}")
+        return metrics, errors
+
+    def refresh(self, job):
+        """Return (result, None) for a refreshed job or (None, failure) to reschedule it"""
+        influencer_id = job['influencer_id']
+        try:
+            metrics, errors = self.fetch_all(job)
+        except InterruptedError:
+            # Hand the job back untouched so another process can claim it now
+            return None, {"influencer_id": influencer_id, "delay_seconds": 0,
+                          "attempts": job['attempts'] - 1, "error": None}
+        except Exception as e:
+            retry_after = getattr(e, 'retry_after', None) or 0
+            if job['attempts'] < self.max_attempts:
+                delay = max(self.backoff(job['attempts']), int(retry_after))
+                return None, {"influencer_id": influencer_id, "delay_seconds": delay,
+                              "attempts": None, "error": str(e)}
+            return None, {"influencer_id": influencer_id, "delay_seconds": self.interval,
+                          "attempts": 0, "error": f"Gave up after {job['attempts']} attempts: {e}"}
+
+        if not metrics:
+            return None, {"influencer_id": influencer_id, "delay_seconds": self.interval,
+                          "attempts": 0, "error": '; '.join(errors) or "No social handles"}
+
+        result = {"influencer_id": influencer_id}
+        for platform, values in metrics.items():
+            if values.get('followers') is not None:
+                result[f'{platform}_followers'] = int(values['followers'])
+        # Views and engagement come from the creator's larger audience
+        primary = max(metrics.values(), key=lambda values: values.get('followers') or 0)
+        if primary.get('average_views') is not None:
+            result['average_views'] = int(primary['average_views'])
+        if primary.get('engagement_rate') is not None:
+            result['engagement_rate'] = round(float(primary['engagement_rate']), 2)
+        return result, None
+
+    def run_batch(self):
+        """Claim, fetch and write back one batch; returns the number of jobs claimed"""
+        jobs = self.db.rpc('claim_metric_refresh_jobs', {
+            "p_limit": self.batch_size,
+            "p_lease_seconds": self.lease
+        }).execute().data or []
+        if not jobs:
+            return 0
+
+        started = time.perf_counter()
+        outcomes = list(self._pool.map(self.refresh, jobs))
+        results = [result for result, _ in outcomes if result is not None]
+        failures = [failure for _, failure in outcomes if failure is not None]
+        self.db.rpc('apply_metric_refresh', {
+            "p_results": results,
+            "p_failures": failures,
+            "p_interval_seconds": self.interval
+        }).execute()
+
+        retried = sum(1 for failure in failures if failure['attempts'] is None)
+        failed = sum(1 for failure in failures if failure['attempts'] is not None and failure['error'])
+        self.stats["refreshed"] += len(results)
+        self.stats["retried"] += retried
+        self.stats["failed"] += failed
+        logger.info(
+            f"Refreshed {len(results)}/{len(jobs)} influencers in {time.perf_counter() - started:.1f}s "
+            f"({retried} to retry, {failed} failed)"
+        )
+        return len(jobs)
+
+    def run(self):
+        """Process batches until stop is set, polling while the queue has nothing due"""
+        while not self.stop.is_set():
+            try:
+                claimed = self.run_batch()
+            except Exception as e:
+                logger.error(f"Metrics refresh error: {e}")
+                claimed = 0
+            if claimed < self.batch_size:
+                self.stop.wait(self.poll_interval)
+        self._pool.shutdown(wait=True)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    spec = os.getenv("METRICS_FETCHER")
+    if not spec:
+        sys.exit("Set METRICS_FETCHER to 'stub' or 'package.module:ClassName'")
+
+    # Reuses the API's data backend settings (DATA_BACKEND, DATABASE_URL, Supabase keys)
+    from main import db
+
+    burst = float(os.getenv("METRICS_REFRESH_BURST", "5"))
+    refresher = MetricsRefresher(
+        db,
+        load_fetcher(spec),
+        {
+            "instagram": TokenBucket(float(os.getenv("METRICS_REFRESH_INSTAGRAM_RATE", "1")), burst),
+            "tiktok": TokenBucket(float(os.getenv("METRICS_REFRESH_TIKTOK_RATE", "1")), burst)
+        },
+        workers=int(os.getenv("METRICS_REFRESH_WORKERS", "4")),
+        batch_size=int(os.getenv("METRICS_REFRESH_BATCH_SIZE", "50")),
+        interval=int(os.getenv("METRICS_REFRESH_INTERVAL_SECONDS", "86400")),
+        lease=int(os.getenv("METRICS_REFRESH_LEASE_SECONDS", "300")),
+        max_attempts=int(os.getenv("METRICS_REFRESH_MAX_ATTEMPTS", "5"))
+    )
+    signal.signal(signal.SIGTERM, lambda *_: refresher.stop.set())
+    signal.signal(signal.SIGINT, lambda *_: refresher.stop.set())
+    logger.info("Metrics refresh worker started")
+    refresher.run()
+    logger.info(f"Metrics refresh worker stopped: {refresher.stats}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,260 @@
+import re
+import math
+import threading
+import unicodedata
+from collections import Counter
+
+WORD = re.compile(r'[a-z0-9]+')
+HANDLE = re.compile(r'^[a-z0-9._]+$')
+
+# Identifier fields that mark an exact duplicate, in the order they are reported
+DUPLICATE_FIELDS = ('business_email', 'instagram', 'tiktok')
+
+
+def fold(text):
+    """Lowercase and strip accents so 'Zoë' and 'zoe' index the same"""
+    text = str(text or '')
+    if text.isascii():
+        return text.lower().strip()
+    text = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in text if not unicodedata.combining(char)).lower().strip()
+
+
+def normalize_handle(value):
+    """Reduce a profile URL or '@handle' to the bare handle ('https://instagram.com/ava.fit/' -> 'ava.fit')"""
+    value = fold(value)
+    if not value:
+        return ''
+    if '/' in value:
+        # Drop scheme and host, then keep the first path segment
+        path = value.split('://', 1)[-1].split('?', 1)[0].split('#', 1)[0]
+        segments = [segment for segment in path.split('/')[1:] if segment]
+        if not segments:
+            return ''
+        value = segments[0]
+    value = value.lstrip('@')
+    return value if HANDLE.match(value) else ''
+
+
+def normalize_email(value):
+    return fold(value)
+
+
+def trigrams(text):
+    """pg_trgm-style trigrams: each word padded with two leading spaces and one trailing"""
+    grams = set()
+    for word in WORD.findall(fold(text)):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(query_grams, field_grams):
+    """Dice coefficient between two trigram sets"""
+    if not query_grams or not field_grams:
+        return 0.0
+    return 2 * len(query_grams & field_grams) / (len(query_grams) + len(field_grams))
+
+
+class IndexState:
+    """One generation of the index: documents, trigram postings and exact identifier maps"""
+
+    def __init__(self):
+        self.documents = {}
+        self.postings = {}
+        self.identifiers = {field: {} for field in DUPLICATE_FIELDS}
+
+    def fields(self, document):
+        return {
+            "name": document['name'],
+            "business_email": document['business_email'],
+            "instagram": document['instagram'],
+            "tiktok": document['tiktok']
+        }
+
+    def document_grams(self, document):
+        grams = set()
+        for value in self.fields(document).values():
+            grams |= trigrams(value)
+        return grams
+
+    def add(self, document):
+        self.remove(document['id'])
+        self.documents[document['id']] = document
+        for gram in self.document_grams(document):
+            self.postings.setdefault(gram, set()).add(document['id'])
+        for field in DUPLICATE_FIELDS:
+            if document[field]:
+                self.identifiers[field].setdefault(document[field], set()).add(document['id'])
+
+    def remove(self, influencer_id):
+        document = self.documents.pop(influencer_id, None)
+        if document is None:
+            return
+        for gram in self.document_grams(document):
+            posting = self.postings.get(gram)
+            if posting is not None:
+                posting.discard(influencer_id)
+                if not posting:
+                    del self.postings[gram]
+        for field in DUPLICATE_FIELDS:
+            ids = self.identifiers[field].get(document[field])
+            if ids is not None:
+                ids.discard(influencer_id)
+                if not ids:
+                    del self.identifiers[field][document[field]]
+
+
+class InfluencerIndex:
+    """In-process search index over influencer names, emails and social handles.
+
+    Built from a full scan with rebuild() and kept current by add()/remove()
+    from the write handlers. Writes that land while a rebuild is scanning are
+    journaled and replayed onto the new generation before it is swapped in.
+    """
+
+    def __init__(self):
+        self._state = IndexState()
+        self._lock = threading.RLock()
+        self._journal = None
+        self.ready = False
+
+    @staticmethod
+    def document(row):
+        return {
+            "id": row['id'],
+            "client_id": row.get('client_id'),
+            "added_by_user_id": row.get('added_by_user_id'),
+            "name": row.get('name') or '',
+            "business_email": normalize_email(row.get('business_email')),
+            "instagram": normalize_handle(row.get('instagram_url')),
+            "tiktok": normalize_handle(row.get('tiktok_url'))
+        }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._state.documents)
+
+    def add(self, row):
+        """Insert or replace an influencer row"""
+        document = self.document(row)
+        with self._lock:
+            self._state.add(document)
+            if self._journal is not None:
+                self._journal.append(('add', document))
+
+    def remove(self, influencer_id):
+        with self._lock:
+            self._state.remove(influencer_id)
+            if self._journal is not None:
+                self._journal.append(('remove', influencer_id))
+
+    def rebuild(self, pages):
+        """Replace the index with rows from an iterable of pages, e.g. iter_pages()"""
+        with self._lock:
+            self._journal = []
+        try:
+            state = IndexState()
+            for rows in pages:
+                for row in rows:
+                    state.add(self.document(row))
+        except BaseException:
+            with self._lock:
+                self._journal = None
+            raise
+
+        with self._lock:
+            for action, value in self._journal:
+                if action == 'add':
+                    state.add(value)
+                else:
+                    state.remove(value)
+            self._journal = None
+            self._state = state
+            self.ready = True
+
+    def find_duplicates(self, row, exclude_ids=()):
+        """Return indexed influencers sharing an email or social handle with row"""
+        document = self.document({**row, "id": None})
+        matches = {}
+        with self._lock:
+            for field in DUPLICATE_FIELDS:
+                if not document[field]:
+                    continue
+                for influencer_id in self._state.identifiers[field].get(document[field], ()):
+                    if influencer_id in exclude_ids:
+                        continue
+                    if influencer_id not in matches:
+                        matches[influencer_id] = dict(self._state.documents[influencer_id], matched_on=[])
+                    matches[influencer_id]['matched_on'].append(field)
+        return sorted(matches.values(), key=lambda match: match['id'])
+
+    def search(self, query, limit=20, client_ids=None, min_similarity=0.3):
+        """Return (document, score, field) tuples best matching query, highest score first"""
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        exact = {normalize_handle(query), normalize_email(query)} - {''}
+        allowed = {str(client_id) for client_id in client_ids} if client_ids is not None else None
+        # A document must share this many trigrams with the query to reach min_similarity
+        needed = max(1, math.ceil(len(query_grams) * min_similarity / 2))
+
+        with self._lock:
+            state = self._state
+            postings = sorted((state.postings.get(gram, ()) for gram in query_grams), key=len)
+
+            # Trigrams shared by a large share of documents ('mai', 'ail') cost the
+            # most to count; try without them first and fall back to all of them
+            common = max(1000, len(state.documents) // 10)
+            selective = [posting for posting in postings if len(posting) <= common]
+            if selective and len(selective) < len(postings):
+                skipped = len(postings) - len(selective)
+                results = self._rank(
+                    state, query_grams, exact, selective, max(1, needed - skipped), allowed, limit, min_similarity
+                )
+                if len(results) >= limit:
+                    return results
+            return self._rank(state, query_grams, exact, postings, needed, allowed, limit, min_similarity)
+
+    def _rank(self, state, query_grams, exact, postings, needed, allowed, limit, min_similarity):
+        # Only the rarest lists can introduce candidates; the rest just add to their counts
+        counts = Counter()
+        for posting in postings[:len(postings) - needed + 1]:
+            counts.update(posting)
+        for posting in postings[len(postings) - needed + 1:]:
+            smaller, larger = (posting, counts) if len(posting) < len(counts) else (counts, posting)
+            for influencer_id in smaller:
+                if influencer_id in larger:
+                    counts[influencer_id] += 1
+
+        by_overlap = {}
+        for influencer_id, shared in counts.items():
+            if shared >= needed:
+                by_overlap.setdefault(shared, []).append(influencer_id)
+
+        results = []
+        scored = 0
+        # Candidates are visited by overlap, so once enough are scored the rest rank lower
+        candidates = (
+            influencer_id for shared in sorted(by_overlap, reverse=True) for influencer_id in by_overlap[shared]
+        )
+        for influencer_id in candidates:
+            if scored >= max(limit * 5, 50):
+                break
+            document = state.documents[influencer_id]
+            if allowed is not None and str(document['client_id']) not in allowed:
+                continue
+            best_score, best_field = 0.0, None
+            for field, value in state.fields(document).items():
+                if value in exact:
+                    best_score, best_field = 1.0, field
+                    break
+                score = similarity(query_grams, trigrams(value))
+                if score > best_score:
+                    best_score, best_field = score, field
+            if best_score >= min_similarity:
+                results.append((document, round(best_score, 3), best_field))
+            scored += 1
+
+        results.sort(key=lambda result: (-result[1], result[0]['id']))
+        return results[:limit]
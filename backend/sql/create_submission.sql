@@ -0,0 +1,97 @@
+-- Atomic submission pipeline used by POST /api/submissions.
+--
+-- Creates the submission, its submission_items and marks the influencers as
+-- submitted in a single transaction. Unless p_client_ids is NULL (admins),
+-- every influencer must belong to one of p_client_ids and have been added by
+-- p_user_id, the same rule PUT/PATCH /api/influencers apply; otherwise the
+-- call is rejected. A repeated p_idempotency_key for the same
+-- user returns the original submission instead of creating a new one, or
+-- raises idempotency_key_reused when p_fingerprint (a hash of the request
+-- body) differs from the one stored with it. This holds for concurrent calls
+-- with the same key too: the one that loses the race on the unique index
+-- replays the winner's submission.
+--
+-- The function trusts p_user_id and p_client_ids, so only the API (service
+-- role) may call it; PostgREST clients holding the anon key or a user JWT
+-- cannot.
+
+alter table public.submissions add column if not exists idempotency_key text;
+alter table public.submissions add column if not exists idempotency_fingerprint text;
+
+create unique index if not exists submissions_user_idempotency_key_idx
+    on public.submissions (submitted_by_user_id, idempotency_key)
+    where idempotency_key is not null;
+
+drop function if exists public.create_submission(uuid, bigint[], text, bigint[], text);
+
+create or replace function public.create_submission(
+    p_user_id uuid,
+    p_influencer_ids bigint[],
+    p_notes text default '',
+    p_client_ids bigint[] default null,
+    p_idempotency_key text default null,
+    p_fingerprint text default null
+)
+returns jsonb
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_submission submissions;
+    v_ids bigint[];
+    v_found integer;
+    v_influencers jsonb;
+begin
+    if p_idempotency_key is not null then
+        select * into v_submission
+        from submissions
+        where submitted_by_user_id = p_user_id and idempotency_key = p_idempotency_key;
+
+        if found then
+            if v_submission.idempotency_fingerprint is distinct from p_fingerprint then
+                raise exception 'idempotency_key_reused' using errcode = 'P0001';
+            end if;
+            return jsonb_build_object('submission', to_jsonb(v_submission), 'influencers', '[]'::jsonb, 'replayed', true);
+        end if;
+    end if;
+
+    select array_agg(distinct id) into v_ids from unnest(p_influencer_ids) as id;
+
+    select count(*), coalesce(jsonb_agg(jsonb_build_object('id', id, 'client_id', client_id)), '[]'::jsonb)
+    into v_found, v_influencers
+    from influencers
+    where id = any(v_ids)
+      and (p_client_ids is null or (client_id = any(p_client_ids) and added_by_user_id = p_user_id));
+
+    if v_found <> coalesce(cardinality(v_ids), 0) then
+        raise exception 'influencer_access_denied' using errcode = 'P0001';
+    end if;
+
+    begin
+        insert into submissions (submitted_by_user_id, influencer_count, notes, idempotency_key, idempotency_fingerprint)
+        values (p_user_id, cardinality(v_ids), coalesce(p_notes, ''), p_idempotency_key, p_fingerprint)
+        returning * into v_submission;
+    exception when unique_violation then
+        -- A concurrent call with the same key committed first; replay its submission
+        select * into v_submission
+        from submissions
+        where submitted_by_user_id = p_user_id and idempotency_key = p_idempotency_key;
+
+        if v_submission.idempotency_fingerprint is distinct from p_fingerprint then
+            raise exception 'idempotency_key_reused' using errcode = 'P0001';
+        end if;
+        return jsonb_build_object('submission', to_jsonb(v_submission), 'influencers', '[]'::jsonb, 'replayed', true);
+    end;
+
+    insert into submission_items (submission_id, influencer_id)
+    select v_submission.id, unnest(v_ids);
+
+    update influencers set submitted = true where id = any(v_ids);
+
+    return jsonb_build_object('submission', to_jsonb(v_submission), 'influencers', v_influencers, 'replayed', false);
+end;
+$$;
+
+revoke execute on function public.create_submission(uuid, bigint[], text, bigint[], text, text) from public, anon, authenticated;
+grant execute on function public.create_submission(uuid, bigint[], text, bigint[], text, text) to service_role;
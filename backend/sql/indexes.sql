@@ -0,0 +1,10 @@
+-- Indexes backing the queries issued by backend/main.py.
+-- Safe to run repeatedly against the Supabase Postgres database.
+
+create index if not exists influencers_client_id_idx on public.influencers (client_id, id);
+create index if not exists influencers_date_added_idx on public.influencers (date_added);
+create index if not exists influencers_added_by_idx on public.influencers (added_by_user_id);
+create index if not exists user_client_assignments_user_idx on public.user_client_assignments (user_id);
+create index if not exists submissions_user_idx on public.submissions (submitted_by_user_id, id);
+create index if not exists submission_items_submission_idx on public.submission_items (submission_id);
+create index if not exists submission_items_influencer_idx on public.submission_items (influencer_id);
@@ -0,0 +1,157 @@
+-- Queue and history tables for the creator metrics refresh worker (backend/refresh.py).
+--
+-- Every influencer has one row in metric_refresh_jobs, created by a trigger on
+-- insert. Workers claim due rows with claim_metric_refresh_jobs (FOR UPDATE
+-- SKIP LOCKED, so several worker processes never fetch the same creator), and
+-- report a whole batch back with apply_metric_refresh, which updates the
+-- influencer rows, records today's snapshot and reschedules the jobs in one
+-- transaction. A claimed job whose worker dies becomes due again once its
+-- lease expires.
+
+create table if not exists public.metric_refresh_jobs (
+    influencer_id bigint primary key references public.influencers(id) on delete cascade,
+    run_after timestamptz not null default now(),
+    attempts integer not null default 0,
+    locked_until timestamptz,
+    last_error text
+);
+
+-- Only the service role (which bypasses RLS) reads or writes the queue
+alter table public.metric_refresh_jobs enable row level security;
+
+create index if not exists metric_refresh_jobs_run_after_idx on public.metric_refresh_jobs (run_after);
+
+-- One row per influencer per day: growth charts read a single primary key range
+create table if not exists public.influencer_metric_snapshots (
+    influencer_id bigint not null references public.influencers(id) on delete cascade,
+    captured_on date not null default current_date,
+    instagram_followers integer,
+    tiktok_followers integer,
+    average_views integer,
+    engagement_rate real,
+    primary key (influencer_id, captured_on)
+);
+
+-- Served through GET /api/influencers/<id>/metrics, which checks access itself
+alter table public.influencer_metric_snapshots enable row level security;
+
+create or replace function public.enqueue_metric_refresh()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+    insert into metric_refresh_jobs (influencer_id)
+    select id from inserted
+    on conflict (influencer_id) do nothing;
+    return null;
+end;
+$$;
+
+-- Statement-level, so a bulk import enqueues its rows with one insert
+drop trigger if exists influencers_enqueue_metric_refresh on public.influencers;
+create trigger influencers_enqueue_metric_refresh
+    after insert on public.influencers
+    referencing new table as inserted
+    for each statement execute function public.enqueue_metric_refresh();
+
+-- Backfill influencers created before the trigger existed
+insert into public.metric_refresh_jobs (influencer_id)
+select id from public.influencers
+on conflict (influencer_id) do nothing;
+
+create or replace function public.claim_metric_refresh_jobs(
+    p_limit integer default 50,
+    p_lease_seconds integer default 300
+)
+returns jsonb
+language sql
+security definer
+set search_path = public
+as $$
+    with claimed as (
+        update metric_refresh_jobs j
+        set attempts = j.attempts + 1,
+            locked_until = now() + make_interval(secs => p_lease_seconds)
+        where j.influencer_id in (
+            select influencer_id
+            from metric_refresh_jobs
+            where run_after <= now()
+              and (locked_until is null or locked_until <= now())
+            order by run_after
+            limit p_limit
+            for update skip locked
+        )
+        returning j.influencer_id, j.attempts
+    )
+    select coalesce(jsonb_agg(jsonb_build_object(
+        'influencer_id', c.influencer_id,
+        'attempts', c.attempts,
+        'instagram_url', i.instagram_url,
+        'tiktok_url', i.tiktok_url
+    ) order by c.influencer_id), '[]'::jsonb)
+    from claimed c
+    join influencers i on i.id = c.influencer_id;
+$$;
+
+create or replace function public.apply_metric_refresh(
+    p_results jsonb default '[]'::jsonb,
+    p_failures jsonb default '[]'::jsonb,
+    p_interval_seconds integer default 86400
+)
+returns jsonb
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_updated integer;
+begin
+    -- Metrics missing from a result (e.g. no TikTok handle) keep their current value
+    update influencers i
+    set instagram_followers = coalesce(r.instagram_followers, i.instagram_followers),
+        tiktok_followers = coalesce(r.tiktok_followers, i.tiktok_followers),
+        average_views = coalesce(r.average_views, i.average_views),
+        engagement_rate = coalesce(r.engagement_rate, i.engagement_rate)
+    from jsonb_to_recordset(p_results) as r(
+        influencer_id bigint, instagram_followers integer, tiktok_followers integer,
+        average_views integer, engagement_rate numeric
+    )
+    where i.id = r.influencer_id;
+    get diagnostics v_updated = row_count;
+
+    insert into influencer_metric_snapshots (
+        influencer_id, captured_on, instagram_followers, tiktok_followers, average_views, engagement_rate
+    )
+    select i.id, current_date, i.instagram_followers, i.tiktok_followers, i.average_views, i.engagement_rate
+    from influencers i
+    where i.id in (select (value->>'influencer_id')::bigint from jsonb_array_elements(p_results))
+    on conflict (influencer_id, captured_on) do update
+    set instagram_followers = excluded.instagram_followers,
+        tiktok_followers = excluded.tiktok_followers,
+        average_views = excluded.average_views,
+        engagement_rate = excluded.engagement_rate;
+
+    update metric_refresh_jobs j
+    set run_after = now() + make_interval(secs => p_interval_seconds),
+        attempts = 0,
+        locked_until = null,
+        last_error = null
+    where j.influencer_id in (select (value->>'influencer_id')::bigint from jsonb_array_elements(p_results));
+
+    -- A null attempts keeps the count taken at claim time; 0 parks a job that ran out of retries
+    update metric_refresh_jobs j
+    set run_after = now() + make_interval(secs => f.delay_seconds),
+        attempts = coalesce(f.attempts, j.attempts),
+        locked_until = null,
+        last_error = f.error
+    from jsonb_to_recordset(p_failures) as f(influencer_id bigint, delay_seconds integer, attempts integer, error text)
+    where j.influencer_id = f.influencer_id;
+
+    return jsonb_build_object('updated', v_updated, 'failed', jsonb_array_length(p_failures));
+end;
+$$;
+
+revoke execute on function public.claim_metric_refresh_jobs(integer, integer) from public, anon, authenticated;
+revoke execute on function public.apply_metric_refresh(jsonb, jsonb, integer) from public, anon, authenticated;
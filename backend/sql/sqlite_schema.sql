@@ -0,0 +1,95 @@
+-- Local schema used by the sqlite data store (tests, benchmarks, offline runs).
+-- Mirrors the columns of the hosted Supabase tables that the API reads and writes.
+
+create table if not exists profiles (
+    user_id text primary key,
+    full_name text,
+    role text not null default 'va',
+    created_at timestamp default current_timestamp
+);
+
+create table if not exists clients (
+    id integer primary key autoincrement,
+    name text not null,
+    description text default '',
+    created_at timestamp default current_timestamp
+);
+
+create table if not exists user_client_assignments (
+    id integer primary key autoincrement,
+    user_id text not null,
+    client_id integer not null references clients(id) on delete cascade,
+    created_at timestamp default current_timestamp,
+    unique (user_id, client_id)
+);
+
+create table if not exists influencers (
+    id integer primary key autoincrement,
+    client_id integer not null references clients(id) on delete cascade,
+    added_by_user_id text,
+    name text not null,
+    business_email text,
+    instagram_followers integer default 0,
+    tiktok_followers integer default 0,
+    average_views integer default 0,
+    engagement_rate real default 0,
+    instagram_url text default '',
+    tiktok_url text default '',
+    notes text default '',
+    submitted boolean default 0,
+    submission_id integer,
+    date_added date default current_date,
+    created_at timestamp default current_timestamp
+);
+
+create index if not exists influencers_client_id_idx on influencers (client_id, id);
+create index if not exists influencers_date_added_idx on influencers (date_added);
+
+create table if not exists submissions (
+    id integer primary key autoincrement,
+    submitted_by_user_id text not null,
+    influencer_count integer default 0,
+    notes text default '',
+    idempotency_key text,
+    idempotency_fingerprint text,
+    created_at timestamp default current_timestamp
+);
+
+create index if not exists submissions_user_idx on submissions (submitted_by_user_id, id);
+create unique index if not exists submissions_user_idempotency_key_idx
+    on submissions (submitted_by_user_id, idempotency_key)
+    where idempotency_key is not null;
+
+create table if not exists submission_items (
+    id integer primary key autoincrement,
+    submission_id integer not null references submissions(id) on delete cascade,
+    influencer_id integer not null references influencers(id) on delete cascade
+);
+
+create index if not exists submission_items_submission_idx on submission_items (submission_id);
+
+-- Creator metrics refresh queue and daily snapshots (see sql/metrics_refresh.sql)
+create table if not exists metric_refresh_jobs (
+    influencer_id integer primary key references influencers(id) on delete cascade,
+    run_after timestamp not null default current_timestamp,
+    attempts integer not null default 0,
+    locked_until timestamp,
+    last_error text
+);
+
+create index if not exists metric_refresh_jobs_run_after_idx on metric_refresh_jobs (run_after);
+
+create table if not exists influencer_metric_snapshots (
+    influencer_id integer not null references influencers(id) on delete cascade,
+    captured_on date not null default current_date,
+    instagram_followers integer,
+    tiktok_followers integer,
+    average_views integer,
+    engagement_rate real,
+    primary key (influencer_id, captured_on)
+) without rowid;
+
+create trigger if not exists influencers_enqueue_metric_refresh after insert on influencers
+begin
+    insert or ignore into metric_refresh_jobs (influencer_id) values (new.id);
+end;
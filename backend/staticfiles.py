@@ -0,0 +1,138 @@
+# In-memory manifest of the built frontend served by main.py's catch-all
+# route, and a build step that writes precompressed .br/.gz variants next to
+# the files so they are never compressed per request:
+#   npm run build && python staticfiles.py ../dist
+import os
+import re
+import sys
+import hashlib
+import mimetypes
+from collections import namedtuple
+from email.utils import formatdate
+
+from serialization import COMPRESSIBLE_MIMETYPES, brotli, compress
+
+# Vite names bundled files <name>-<content hash>.<ext>, e.g. assets/index-DpyLHKiN.js
+HASHED_NAME = re.compile(r'-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$')
+# Content-Encoding -> suffix of the precompressed file, in order of preference
+VARIANTS = (('br', '.br'), ('gzip', '.gz'))
+PRECOMPRESS_MIN_BYTES = 1024
+
+# One encoding of a file; body is None when the file is read from disk per request
+Representation = namedtuple('Representation', 'encoding filename size etag last_modified body')
+
+
+class StaticAsset:
+    """A file of the build with its precompressed variants"""
+
+    def __init__(self, path, mimetype, immutable, representations):
+        self.path = path
+        self.mimetype = mimetype
+        self.immutable = immutable
+        # Content-Encoding (None for the file itself) -> Representation
+        self.representations = representations
+
+    def negotiate(self, accept_encodings):
+        """The representation to send for a request's Accept-Encoding"""
+        for encoding, _ in VARIANTS:
+            if encoding in self.representations and accept_encodings[encoding]:
+                return self.representations[encoding]
+        return self.representations[None]
+
+
+class StaticManifest:
+    """Metadata, ETags and (within memory_budget bytes) contents of every file under root.
+
+    Built once at startup, so serving a file needs no filesystem checks.
+    Files added or rebuilt later are not seen until the process restarts.
+    """
+
+    def __init__(self, root, memory_budget=64 * 1024 * 1024):
+        self.root = root
+        self.assets = {}
+        self.size = 0
+        if root and os.path.isdir(root):
+            self.load(memory_budget)
+
+    def load(self, memory_budget):
+        budget = memory_budget
+        for directory, _, filenames in os.walk(self.root):
+            names = set(filenames)
+            for name in filenames:
+                # Variants are served through the file they compress
+                if any(name.endswith(suffix) and name[:-len(suffix)] in names for _, suffix in VARIANTS):
+                    continue
+                filename = os.path.join(directory, name)
+                path = os.path.relpath(filename, self.root).replace(os.sep, '/')
+                representations = {None: self.representation(None, filename, budget)}
+                for encoding, suffix in VARIANTS:
+                    if name + suffix in names:
+                        representations[encoding] = self.representation(encoding, filename + suffix, budget)
+                for representation in representations.values():
+                    if representation.body is not None:
+                        budget -= representation.size
+                        self.size += representation.size
+                mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+                immutable = path.startswith('assets/') and HASHED_NAME.search(name) is not None
+                self.assets[path] = StaticAsset(path, mimetype, immutable, representations)
+
+    @staticmethod
+    def representation(encoding, filename, budget):
+        with open(filename, 'rb') as f:
+            body = f.read()
+        stat = os.stat(filename)
+        etag = hashlib.sha256(body).hexdigest()[:32]
+        return Representation(
+            encoding, filename, len(body), etag, formatdate(stat.st_mtime, usegmt=True),
+            body if len(body) <= budget else None
+        )
+
+    def __len__(self):
+        return len(self.assets)
+
+    def lookup(self, path):
+        return self.assets.get(path)
+
+
+def precompress(root, level=9, min_bytes=PRECOMPRESS_MIN_BYTES):
+    """Write .gz (and .br, with Brotli installed) next to each compressible file; returns files written"""
+    written = []
+    for directory, _, filenames in os.walk(root):
+        for name in filenames:
+            if any(name.endswith(suffix) for _, suffix in VARIANTS):
+                continue
+            if (mimetypes.guess_type(name)[0] or '') not in COMPRESSIBLE_MIMETYPES:
+                continue
+            filename = os.path.join(directory, name)
+            with open(filename, 'rb') as f:
+                body = f.read()
+            if len(body) < min_bytes:
+                continue
+            for encoding, suffix in VARIANTS:
+                if encoding == 'br' and brotli is None:
+                    continue
+                # Build-time compression can afford the slowest, smallest settings
+                compressed = brotli.compress(body, quality=11) if encoding == 'br' else compress(body, encoding, level)
+                if len(compressed) >= len(body):
+                    continue
+                with open(filename + suffix, 'wb') as f:
+                    f.write(compressed)
+                written.append((filename + suffix, len(body), len(compressed)))
+    return written
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    root = argv[0] if argv else os.getenv("STATIC_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static'))
+    if not os.path.isdir(root):
+        print(f"{root} is not a directory")
+        return 1
+    for filename, size, compressed in precompress(root):
+        print(f"{os.path.relpath(filename, root)}: {size} -> {compressed} bytes")
+    if brotli is None:
+        print("Brotli is not installed; wrote .gz variants only")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import contextlib
+
+import pytest
+from psycopg import errors
+from psycopg.adapt import PyFormat, Transformer
+from postgrest.exceptions import APIError
+
+import datastore
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.description = [('result',)] if rows is not None else None
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    """Adapts parameters exactly as psycopg does before sending them; answers from canned rows"""
+
+    def __init__(self, json_arguments):
+        self.json_arguments = json_arguments
+        self.statements = []
+        # Raised by the next statement that is not a catalog lookup
+        self.error = None
+
+    def execute(self, sql, params, prepare=None):
+        dumped = Transformer().dump_sequence(params, [PyFormat.AUTO] * len(params))
+        self.statements.append((sql, dumped))
+        if 'information_schema.parameters' in sql:
+            return FakeCursor([{"name": name} for name in self.json_arguments.get(params[0], ())])
+        if self.error is not None:
+            raise self.error
+        return FakeCursor([{"result": None}])
+
+
+class FakePool:
+    connection_factory = None
+
+    def __init__(self, dsn, **kwargs):
+        self._connection = FakePool.connection_factory()
+
+    def connection(self):
+        return contextlib.nullcontext(self._connection)
+
+
+@pytest.fixture
+def postgres(monkeypatch):
+    connection = FakeConnection({'apply_metric_refresh': ['p_results', 'p_failures']})
+    FakePool.connection_factory = lambda: connection
+    monkeypatch.setattr('psycopg_pool.ConnectionPool', FakePool)
+    return datastore.PostgresDataStore('postgresql://bench'), connection
+
+
+def test_rpc_sends_json_arguments_as_jsonb(postgres):
+    store, connection = postgres
+    store.rpc('apply_metric_refresh', {
+        "p_results": [{"influencer_id": 1, "instagram_followers": 1200}],
+        "p_failures": [],
+        "p_interval_seconds": 86400
+    }).execute()
+
+    sql, dumped = connection.statements[-1]
+    assert sql.startswith('SELECT "apply_metric_refresh"(')
+    assert dumped[0] == b'[{"influencer_id": 1, "instagram_followers": 1200}]'
+    # An empty list goes out as a JSON array, not the array literal '{}'
+    assert dumped[1] == b'[]'
+
+
+def test_rpc_leaves_array_arguments_alone(postgres):
+    store, connection = postgres
+    store.rpc('create_submission', {"p_influencer_ids": [1, 2], "p_client_ids": None}).execute()
+
+    _, dumped = connection.statements[-1]
+    assert dumped == [b'{1,2}', None]
+
+
+def test_raise_exception_becomes_api_error(postgres):
+    store, connection = postgres
+    connection.error = errors.RaiseException("influencer_access_denied")
+
+    with pytest.raises(APIError) as raised:
+        store.rpc('create_submission', {"p_influencer_ids": [1]}).execute()
+    assert raised.value.code == 'P0001'
+    assert raised.value.message == 'influencer_access_denied'
+
+
+def test_missing_function_becomes_pgrst202(postgres):
+    store, connection = postgres
+    connection.error = errors.UndefinedFunction(
+        "function create_submission(p_influencer_ids => smallint[]) does not exist"
+    )
+
+    with pytest.raises(APIError) as raised:
+        store.rpc('create_submission', {"p_influencer_ids": [1]}).execute()
+    assert raised.value.code == 'PGRST202'
+
+
+def test_table_errors_keep_their_sqlstate(postgres):
+    store, connection = postgres
+    connection.error = errors.UniqueViolation("duplicate key value violates unique constraint")
+
+    with pytest.raises(APIError) as raised:
+        store.table('submissions').insert({"idempotency_key": "a"}).execute()
+    assert raised.value.code == '23505'
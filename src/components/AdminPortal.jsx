@@ -11,6 +11,7 @@ import { Users, Building2, UserPlus, Download, Calendar, TrendingUp, Eye, Heart,
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, LineChart, Line, PieChart, Pie, Cell } from 'recharts';
 import { useAuth } from '../contexts/AuthContext';
 import apiService from '../services/api';
+import { applyChanges, useInfluencersRealtime, useSubmissionsRealtime } from '../hooks/useRealtime';
 
 const AdminPortal = () => {
   const { user } = useAuth();
@@ -19,6 +20,8 @@ const AdminPortal = () => {
   const [clients, setClients] = useState([]);
   const [influencers, setInfluencers] = useState([]);
   const [submissions, setSubmissions] = useState([]);
+  const [submissionsCursor, setSubmissionsCursor] = useState(null);
+  const [submissionCount, setSubmissionCount] = useState(0);
   const [loading, setLoading] = useState(true);
   
   // Dialog states
@@ -40,17 +43,21 @@ const AdminPortal = () => {
     try {
       setLoading(true);
       
-      const [usersRes, clientsRes, influencersRes, submissionsRes] = await Promise.all([
-        apiService.getUsers(),
-        apiService.getClients(),
-        apiService.getInfluencers(),
-        apiService.getSubmissions()
-      ]);
+      const results = await apiService.batch({
+        users: '/api/users',
+        clients: '/api/clients',
+        influencers: '/api/influencers',
+        submissions: '/api/submissions?include=items',
+        stats: '/api/stats/overview'
+      });
       
-      setUsers(usersRes.users);
-      setClients(clientsRes.clients);
-      setInfluencers(influencersRes.influencers);
-      setSubmissions(submissionsRes.submissions);
+      setUsers(results.users.users);
+      setClients(results.clients.clients);
+      setInfluencers(results.influencers.influencers);
+      setSubmissions(results.submissions.submissions);
+      setSubmissionsCursor(results.submissions.next_cursor);
+      // Submissions are paginated; the total comes from the stats endpoint
+      setSubmissionCount(results.stats.totals.submissions);
       
     } catch (error) {
       console.error('Error loading data:', error);
@@ -59,6 +66,44 @@ const AdminPortal = () => {
     }
   };
 
+  // Submissions are shown with their items, which change events do not carry,
+  // so a new submission refetches the first page and the total
+  const refreshSubmissions = async () => {
+    try {
+      const results = await apiService.batch({
+        submissions: '/api/submissions?include=items',
+        stats: '/api/stats/overview'
+      });
+      setSubmissions(results.submissions.submissions);
+      setSubmissionsCursor(results.submissions.next_cursor);
+      setSubmissionCount(results.stats.totals.submissions);
+    } catch (error) {
+      console.error('Error refreshing submissions:', error);
+    }
+  };
+
+  useInfluencersRealtime((event) => {
+    if (event.eventType === 'RESYNC') {
+      loadAllData();
+      return;
+    }
+    setInfluencers(previous => applyChanges(previous, event.changes));
+  });
+
+  useSubmissionsRealtime(() => {
+    refreshSubmissions();
+  });
+
+  const loadMoreSubmissions = async () => {
+    try {
+      const response = await apiService.getSubmissions({ include: 'items', cursor: submissionsCursor });
+      setSubmissions(previous => [...previous, ...response.submissions]);
+      setSubmissionsCursor(response.next_cursor);
+    } catch (error) {
+      console.error('Error loading submissions:', error);
+    }
+  };
+
   const handleAddUser = async () => {
     try {
       await apiService.createUser(newUser);
@@ -127,7 +172,7 @@ const AdminPortal = () => {
       totalClients: clients.length,
       totalInfluencers: influencers.length,
       newInfluencersToday: influencers.filter(inf => inf.date_added === today).length,
-      totalSubmissions: submissions.length,
+      totalSubmissions: submissionCount,
       avgFollowers: influencers.length > 0 ? Math.round(influencers.reduce((sum, inf) => sum + (inf.instagram_followers || 0), 0) / influencers.length) : 0
     };
   };
@@ -619,7 +664,7 @@ const AdminPortal = () => {
 
               <div className="grid gap-4">
                 {submissions.map(submission => {
-                  const submissionInfluencers = influencers.filter(inf => inf.submission_id === submission.id);
+                  const submissionInfluencers = submission.items.map(item => item.influencer);
                   return (
                     <Card key={submission.id}>
                       <CardContent className="p-6">
@@ -667,6 +712,12 @@ const AdminPortal = () => {
                   );
                 })}
               </div>
+
+              {submissionsCursor && (
+                <div className="text-center">
+                  <Button variant="outline" onClick={loadMoreSubmissions}>Load more submissions</Button>
+                </div>
+              )}
             </TabsContent>
           </div>
         </Tabs>
@@ -14,12 +14,17 @@ const ClientPortal = () => {
   const [userClients, setUserClients] = useState([]);
   const [influencers, setInfluencers] = useState([]);
   const [submissions, setSubmissions] = useState([]);
+  const [topInfluencers, setTopInfluencers] = useState([]);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
     loadInitialData();
   }, [user]);
 
+  useEffect(() => {
+    loadTopInfluencers();
+  }, [selectedClient]);
+
   const loadInitialData = async () => {
     try {
       setLoading(true);
@@ -54,6 +59,20 @@ const ClientPortal = () => {
     }
   };
 
+  // Ranked server-side from the per-client leaderboard
+  const loadTopInfluencers = async () => {
+    if (!selectedClient) {
+      setTopInfluencers([]);
+      return;
+    }
+    try {
+      const response = await apiService.getTopInfluencers(selectedClient, { metric: 'instagram_followers', k: 5 });
+      setTopInfluencers(response.influencers);
+    } catch (error) {
+      console.error('Error loading top influencers:', error);
+    }
+  };
+
   const getClientInfluencers = () => {
     if (!selectedClient) return [];
     return influencers.filter(inf => inf.client_id.toString() === selectedClient);
@@ -396,16 +415,14 @@ const ClientPortal = () => {
                 <CardDescription>Highest performing influencers for {getClientName(selectedClient)}</CardDescription>
               </CardHeader>
               <CardContent>
-                {getClientInfluencers().length === 0 ? (
+                {topInfluencers.length === 0 ? (
                   <div className="text-center py-8 text-gray-500">
                     <Users className="h-12 w-12 mx-auto mb-4 text-gray-300" />
                     <p>No influencers found for this client.</p>
                   </div>
                 ) : (
                   <div className="space-y-4">
-                    {getClientInfluencers()
-                      .sort((a, b) => (b.instagram_followers || 0) - (a.instagram_followers || 0))
-                      .slice(0, 5)
+                    {topInfluencers
                       .map((influencer) => (
                         <div key={influencer.id} className="flex items-center justify-between p-4 border rounded-lg">
                           <div className="flex-1">
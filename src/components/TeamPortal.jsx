@@ -10,6 +10,7 @@ import { Badge } from '@/components/ui/badge.jsx';
 import { Users, Plus, Upload, Calendar, TrendingUp, Eye, Heart, Instagram } from 'lucide-react';
 import { useAuth } from '../contexts/AuthContext';
 import apiService from '../services/api';
+import { applyChanges, useInfluencersRealtime, useSubmissionsRealtime } from '../hooks/useRealtime';
 
 const TeamPortal = () => {
   const { user } = useAuth();
@@ -18,6 +19,8 @@ const TeamPortal = () => {
   const [userClients, setUserClients] = useState([]);
   const [influencers, setInfluencers] = useState([]);
   const [submissions, setSubmissions] = useState([]);
+  const [submissionsCursor, setSubmissionsCursor] = useState(null);
+  const [submissionCount, setSubmissionCount] = useState(0);
   const [loading, setLoading] = useState(true);
 
   // Form states
@@ -66,8 +69,13 @@ const TeamPortal = () => {
       setInfluencers(influencersResponse.influencers);
       
       // Load submissions
-      const submissionsResponse = await apiService.getSubmissions();
+      const submissionsResponse = await apiService.getSubmissions({ include: 'items' });
       setSubmissions(submissionsResponse.submissions);
+      setSubmissionsCursor(submissionsResponse.next_cursor);
+
+      // Submissions are paginated; the total of the user's own comes from the stats endpoint
+      const statsResponse = await apiService.getStatsOverview();
+      setSubmissionCount(statsResponse.totals.submissions);
       
     } catch (error) {
       console.error('Error loading data:', error);
@@ -76,6 +84,42 @@ const TeamPortal = () => {
     }
   };
 
+  // Submissions are shown with their items, which change events do not carry,
+  // so a new submission refetches the first page and the total
+  const refreshSubmissions = async () => {
+    try {
+      const submissionsResponse = await apiService.getSubmissions({ include: 'items' });
+      setSubmissions(submissionsResponse.submissions);
+      setSubmissionsCursor(submissionsResponse.next_cursor);
+      const statsResponse = await apiService.getStatsOverview();
+      setSubmissionCount(statsResponse.totals.submissions);
+    } catch (error) {
+      console.error('Error refreshing submissions:', error);
+    }
+  };
+
+  useInfluencersRealtime((event) => {
+    if (event.eventType === 'RESYNC') {
+      loadInitialData();
+      return;
+    }
+    setInfluencers(previous => applyChanges(previous, event.changes));
+  });
+
+  useSubmissionsRealtime(() => {
+    refreshSubmissions();
+  });
+
+  const loadMoreSubmissions = async () => {
+    try {
+      const response = await apiService.getSubmissions({ include: 'items', cursor: submissionsCursor });
+      setSubmissions(previous => [...previous, ...response.submissions]);
+      setSubmissionsCursor(response.next_cursor);
+    } catch (error) {
+      console.error('Error loading submissions:', error);
+    }
+  };
+
   const handleAddInfluencer = async () => {
     if (!selectedClient) {
       alert('Please select a client first');
@@ -223,7 +267,7 @@ const TeamPortal = () => {
     
     return {
       totalInfluencers: myInfluencers.length,
-      totalSubmissions: getMySubmissions().length,
+      totalSubmissions: submissionCount,
       addedToday: myInfluencers.filter(inf => inf.date_added === today).length,
       avgFollowers: myInfluencers.length > 0 ? Math.round(myInfluencers.reduce((sum, inf) => sum + (inf.instagram_followers || 0), 0) / myInfluencers.length) : 0
     };
@@ -566,7 +610,7 @@ Jane Smith, jane@example.com, @janesmith, 15000, @janesmith_tt, 8000, 2000, 4.2,
                 
                 <div className="grid gap-4">
                   {getMySubmissions().map(submission => {
-                    const submissionInfluencers = influencers.filter(inf => inf.submission_id === submission.id);
+                    const submissionInfluencers = submission.items.map(item => item.influencer);
                     return (
                       <Card key={submission.id}>
                         <CardContent className="p-6">
@@ -613,6 +657,12 @@ Jane Smith, jane@example.com, @janesmith, 15000, @janesmith_tt, 8000, 2000, 4.2,
                       </Card>
                     );
                   })}
+
+                  {submissionsCursor && (
+                    <div className="text-center">
+                      <Button variant="outline" onClick={loadMoreSubmissions}>Load more submissions</Button>
+                    </div>
+                  )}
                   
                   {getMySubmissions().length === 0 && (
                     <div className="text-center py-12">
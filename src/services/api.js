@@ -135,9 +135,55 @@ class ApiService {
     return this.handleResponse(response);
   }
 
+  // Batch method
+  // requests: { key: '/api/path?query' }; resolves to { key: responseBody }
+  async batch(requests) {
+    const response = await fetch(`${API_BASE_URL}/api/batch`, {
+      method: 'POST',
+      headers: this.getHeaders(),
+      body: JSON.stringify({
+        requests: Object.entries(requests).map(([id, path]) => ({ id, path }))
+      }),
+    });
+    
+    const data = await this.handleResponse(response);
+    const results = {};
+    data.responses.forEach(({ id, status, body }) => {
+      if (status >= 400) {
+        throw new Error((body && body.error) || `HTTP error! status: ${status}`);
+      }
+      results[id] = body;
+    });
+    return results;
+  }
+
+  // Helper method to build a query string from a params object
+  buildQuery(params = {}) {
+    const query = new URLSearchParams();
+    Object.entries(params).forEach(([key, value]) => {
+      if (value !== undefined && value !== null && value !== '') {
+        query.append(key, value);
+      }
+    });
+    const queryString = query.toString();
+    return queryString ? `?${queryString}` : '';
+  }
+
   // Influencer methods
-  async getInfluencers() {
-    const response = await fetch(`${API_BASE_URL}/api/influencers`, {
+  // params: fields, client_id, submitted, submission_id, added_from, added_to,
+  // min/max_instagram_followers, min/max_tiktok_followers, limit, cursor
+  async getInfluencers(params = {}) {
+    const response = await fetch(`${API_BASE_URL}/api/influencers${this.buildQuery(params)}`, {
+      method: 'GET',
+      headers: this.getHeaders(),
+    });
+    
+    return this.handleResponse(response);
+  }
+
+  // params: limit, client_id; results include matches under other clients without contact details
+  async searchInfluencers(query, params = {}) {
+    const response = await fetch(`${API_BASE_URL}/api/influencers/search${this.buildQuery({ q: query, ...params })}`, {
       method: 'GET',
       headers: this.getHeaders(),
     });
@@ -145,6 +191,16 @@ class ApiService {
     return this.handleResponse(response);
   }
 
+  // Daily follower/views/engagement snapshots for growth charts; params: days (default 90)
+  async getInfluencerMetrics(influencerId, params = {}) {
+    const response = await fetch(`${API_BASE_URL}/api/influencers/${influencerId}/metrics${this.buildQuery(params)}`, {
+      method: 'GET',
+      headers: this.getHeaders(),
+    });
+
+    return this.handleResponse(response);
+  }
+
   async createInfluencer(influencerData) {
     const response = await fetch(`${API_BASE_URL}/api/influencers`, {
       method: 'POST',
@@ -165,6 +221,27 @@ class ApiService {
     return this.handleResponse(response);
   }
 
+  // Either { ids: [...], changes: {...} } or { updates: { [id]: changes } }; returns per-ID results
+  async updateInfluencers(payload) {
+    const response = await fetch(`${API_BASE_URL}/api/influencers`, {
+      method: 'PATCH',
+      headers: this.getHeaders(),
+      body: JSON.stringify(payload),
+    });
+
+    return this.handleResponse(response);
+  }
+
+  async deleteInfluencers(influencerIds) {
+    const response = await fetch(`${API_BASE_URL}/api/influencers`, {
+      method: 'DELETE',
+      headers: this.getHeaders(),
+      body: JSON.stringify({ ids: influencerIds }),
+    });
+
+    return this.handleResponse(response);
+  }
+
   async deleteInfluencer(influencerId) {
     const response = await fetch(`${API_BASE_URL}/api/influencers/${influencerId}`, {
       method: 'DELETE',
@@ -174,9 +251,21 @@ class ApiService {
     return this.handleResponse(response);
   }
 
+  // A client's best influencers, ranked on the server; params: metric
+  // (followers, instagram_followers, tiktok_followers, views, engagement), k (default 10)
+  async getTopInfluencers(clientId, params = {}) {
+    const response = await fetch(`${API_BASE_URL}/api/clients/${clientId}/top${this.buildQuery(params)}`, {
+      method: 'GET',
+      headers: this.getHeaders(),
+    });
+
+    return this.handleResponse(response);
+  }
+
   // Submission methods
-  async getSubmissions() {
-    const response = await fetch(`${API_BASE_URL}/api/submissions`, {
+  // params: include ('items' adds each submission's influencers and paginates), limit, cursor
+  async getSubmissions(params = {}) {
+    const response = await fetch(`${API_BASE_URL}/api/submissions${this.buildQuery(params)}`, {
       method: 'GET',
       headers: this.getHeaders(),
     });
@@ -184,34 +273,74 @@ class ApiService {
     return this.handleResponse(response);
   }
 
-  async createSubmission(submissionData) {
+  // One submission with its items and their influencers
+  async getSubmission(submissionId) {
+    const response = await fetch(`${API_BASE_URL}/api/submissions/${submissionId}`, {
+      method: 'GET',
+      headers: this.getHeaders(),
+    });
+
+    return this.handleResponse(response);
+  }
+
+  // Pass the same idempotencyKey when retrying so the submission is only created once
+  async createSubmission(submissionData, idempotencyKey = null) {
+    const headers = this.getHeaders();
+    if (idempotencyKey) {
+      headers['Idempotency-Key'] = idempotencyKey;
+    }
+    
     const response = await fetch(`${API_BASE_URL}/api/submissions`, {
       method: 'POST',
-      headers: this.getHeaders(),
+      headers,
       body: JSON.stringify(submissionData),
     });
     
     return this.handleResponse(response);
   }
 
+  // Stats methods
+  // params: client_id, days
+  async getStats(params = {}) {
+    const response = await fetch(`${API_BASE_URL}/api/stats${this.buildQuery(params)}`, {
+      method: 'GET',
+      headers: this.getHeaders(),
+    });
+    
+    return this.handleResponse(response);
+  }
+
+  // Totals only (influencers, submissions, ...); params: client_id
+  async getStatsOverview(params = {}) {
+    const response = await fetch(`${API_BASE_URL}/api/stats/overview${this.buildQuery(params)}`, {
+      method: 'GET',
+      headers: this.getHeaders(),
+    });
+
+    return this.handleResponse(response);
+  }
+
   // Bulk operations
   async bulkCreateInfluencers(influencersData) {
-    const results = [];
-    const errors = [];
-    
-    for (let i = 0; i < influencersData.length; i++) {
-      try {
-        const result = await this.createInfluencer(influencersData[i]);
-        results.push(result);
-      } catch (error) {
-        errors.push({
-          index: i,
-          data: influencersData[i],
-          error: error.message
-        });
-      }
+    const response = await fetch(`${API_BASE_URL}/api/influencers/bulk`, {
+      method: 'POST',
+      headers: this.getHeaders(),
+      body: JSON.stringify(influencersData),
+    });
+    
+    const data = await response.json();
+    
+    if (!response.ok && !data.errors) {
+      throw new Error(data.error || `HTTP error! status: ${response.status}`);
     }
     
+    const errors = (data.errors || []).map(error => ({
+      index: error.index,
+      data: influencersData[error.index],
+      error: error.error
+    }));
+    const results = (data.influencers || []).map(influencer => ({ influencer }));
+    
     return { results, errors };
   }
 }